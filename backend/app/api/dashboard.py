@@ -1,45 +1,67 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Integer, String, and_, case, cast, func, null, select, true, union_all
 from datetime import datetime, timezone, timedelta
 from zoneinfo import ZoneInfo
 
-from app.db.session import get_db
-from app.db.models import Hospital, Forecast, ForecastError
+from app.db.async_session import get_async_db
+from app.db.models import (
+    ForecastErrorHourlyRollup,
+    ForecastHourlyRollup,
+    Hospital,
+    LatestForecast,
+)
+from app.ml.horizons import FORECAST_HORIZONS
 from app.ml.risk import pressure_to_risk
+from app.services.forecast_rollups import RISK_COUNT_COLUMNS, hour_bucket
+from app.services.response_cache import (
+    cache_generation,
+    cache_response,
+    cached_json_response,
+    get_cached_response,
+)
 
 TIMEZONE = ZoneInfo("America/Montreal")
 
+# generated_at of a map without forecasts
+NO_FORECASTS_GENERATED_AT = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
 
 @router.get("/congestion/map")
-def get_congestion_map(horizon: int = 1, db: Session = Depends(get_db)):
+async def get_congestion_map(
+    request: Request,
+    horizon: int = 1,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Latest forecast per hospital as a GeoJSON FeatureCollection.
+    Served from the response cache until the next forecasting run;
+    ``generated_at`` is when its most recent forecast was saved.
     """
-    latest = (
-        db.query(
-            Forecast.hospital_id,
-            func.max(Forecast.forecast_time).label("latest_time"),
-        )
-        .filter(Forecast.horizon_hours == horizon)
-        .group_by(Forecast.hospital_id)
-        .subquery()
-    )
+    # Only horizons the forecasting job produces, which also bounds the cache keys
+    if horizon not in FORECAST_HORIZONS:
+        raise HTTPException(status_code=422, detail=f"horizon must be one of {list(FORECAST_HORIZONS)}")
+
+    cache_key = ("dashboard/congestion/map", horizon)
+    cached = get_cached_response(cache_key)
+    if cached is not None:
+        return cached_json_response(request, cached)
+    generation = cache_generation()
 
     rows = (
-        db.query(Hospital, Forecast)
-        .join(latest, Hospital.id == latest.c.hospital_id)
-        .join(
-            Forecast,
-            (Forecast.hospital_id == latest.c.hospital_id)
-            & (Forecast.forecast_time == latest.c.latest_time),
+        await db.execute(
+            select(Hospital, LatestForecast)
+            .join(LatestForecast, Hospital.id == LatestForecast.hospital_id)
+            .where(
+                LatestForecast.horizon_hours == horizon,
+                Hospital.is_active == True,
+            )
+            .order_by(LatestForecast.hospital_id)
         )
-        .filter(Hospital.is_active == True)
-        .all()
-    )
+    ).all()
 
     features = [
         {
@@ -60,167 +82,156 @@ def get_congestion_map(horizon: int = 1, db: Session = Depends(get_db)):
         for h, f in rows
     ]
 
-    return {
+    # When the forecasts were written rather than the clock, so rebuilding the
+    # entry over unchanged data keeps the same body and ETag
+    generated_at = max(
+        (_as_utc(f.updated_at) for _, f in rows if f.updated_at is not None),
+        default=NO_FORECASTS_GENERATED_AT,
+    )
+    payload = {
         "type": "FeatureCollection",
         "features": features,
-        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "generated_at": generated_at.isoformat(),
     }
+    return cached_json_response(request, cache_response(cache_key, payload, generation))
+
+
+
+def _rollup_query(rollup, sum_column, count_column, horizon_hours, hospital_id, since, with_names):
+    """
+    Per-hour rows (hourly series and risk-level totals) UNION ALL per-hospital rows
+    from one rollup table, both read from its (horizon_hours, hour_bucket) index.
+    The optional hospital filter only applies to the hourly series.
+    """
+    in_window = and_(rollup.horizon_hours == horizon_hours, rollup.hour_bucket >= since)
+    in_series = (rollup.hospital_id == hospital_id) if hospital_id else true()
+
+    by_hour = (
+        select(
+            rollup.hour_bucket.label("hour"),
+            cast(null(), Integer).label("hospital_id"),
+            cast(null(), String).label("name"),
+            func.sum(case((in_series, sum_column), else_=0)).label("value_sum"),
+            func.sum(case((in_series, count_column), else_=0)).label("value_count"),
+            func.sum(rollup.low_count).label("low_count"),
+            func.sum(rollup.medium_count).label("medium_count"),
+            func.sum(rollup.high_count).label("high_count"),
+        )
+        .where(in_window)
+        .group_by(rollup.hour_bucket)
+    )
+
+    by_hospital = select(
+        cast(null(), rollup.hour_bucket.type).label("hour"),
+        rollup.hospital_id,
+        (Hospital.name if with_names else cast(null(), String)).label("name"),
+        func.sum(sum_column).label("value_sum"),
+        func.sum(count_column).label("value_count"),
+        func.sum(rollup.low_count).label("low_count"),
+        func.sum(rollup.medium_count).label("medium_count"),
+        func.sum(rollup.high_count).label("high_count"),
+    )
+    if with_names:
+        by_hospital = (
+            by_hospital
+            .join(Hospital, Hospital.id == rollup.hospital_id)
+            .where(Hospital.is_active == True)
+            .group_by(rollup.hospital_id, Hospital.name)
+        )
+    else:
+        by_hospital = by_hospital.group_by(rollup.hospital_id)
+
+    return union_all(by_hour, by_hospital.where(in_window))
+
 
+def _as_utc(dt: datetime) -> datetime:
+    # SQLite hands back naive datetimes; buckets are always UTC
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
 
 @router.get("/stats")
-def get_dashboard_stats(
+async def get_dashboard_stats(
     horizon_hours: int = Query(default=1, ge=1),
     hospital_id: int | None = Query(default=None),
-    db: Session = Depends(get_db),
+    window_hours: int = Query(default=24, ge=1, le=24 * 30),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Aggregated chart data for the analytics dashboard.
+    Aggregated chart data for the analytics dashboard, read from the hourly rollups.
     Returns:
-      - global_series:    hourly predicted vs observed pressure (last 24h)
+      - global_series:    hourly predicted vs observed pressure (last window_hours)
       - risk_comparison:  predicted vs observed counts per risk level
       - hospital_stats:   per-hospital mean predicted/observed and risk level
     """
     now = datetime.now(timezone.utc)
-    since = now - timedelta(hours=24)
-
-    # forecasts_24h
-    q = (
-        db.query(
-            func.date_trunc("hour", func.timezone("UTC", Forecast.forecast_time)).label("hour"),
-            func.avg(Forecast.predicted_pressure).label("avg_predicted"),
-        )
-        .filter(
-            Forecast.horizon_hours == horizon_hours,
-            Forecast.forecast_time >= since,
-        )
-    )
-    if hospital_id:
-        q = q.filter(Forecast.hospital_id == hospital_id)
-    forecasts_24h = q.group_by("hour").order_by("hour").all()
-
-    # errors_24h
-    eq = (
-        db.query(
-            func.date_trunc("hour", func.timezone("UTC", ForecastError.forecast_time)).label("hour"),
-            func.avg(ForecastError.observed_pressure).label("avg_observed"),
-        )
-        .filter(
-            ForecastError.horizon_hours == horizon_hours,
-            ForecastError.evaluated_at >= since,
-        )
-    )
-    if hospital_id:
-        eq = eq.filter(ForecastError.hospital_id == hospital_id)
-    errors_24h = eq.group_by("hour").order_by("hour").all()
-
-    observed_by_hour = {
-        row.hour: row.avg_observed for row in errors_24h
-    }
+    # First whole hour in the window; forecasts are issued on the hour
+    since = hour_bucket(now - timedelta(hours=window_hours) + timedelta(hours=1) - timedelta(microseconds=1))
+    label_format = "%H:%M" if window_hours <= 24 else "%m-%d %H:%M"
+
+    forecast_rows = (
+        await db.execute(_rollup_query(
+            ForecastHourlyRollup,
+            ForecastHourlyRollup.predicted_sum,
+            ForecastHourlyRollup.forecast_count,
+            horizon_hours, hospital_id, since, with_names=True,
+        ))
+    ).all()
+
+    error_rows = (
+        await db.execute(_rollup_query(
+            ForecastErrorHourlyRollup,
+            ForecastErrorHourlyRollup.observed_sum,
+            ForecastErrorHourlyRollup.error_count,
+            horizon_hours, hospital_id, since, with_names=False,
+        ))
+    ).all()
+
+    def split(rows):
+        by_hour, risk_counts, by_hospital = {}, dict.fromkeys(RISK_COUNT_COLUMNS, 0), {}
+        for row in rows:
+            if row.hour is not None:
+                if row.value_count:
+                    by_hour[_as_utc(row.hour)] = row.value_sum / row.value_count
+                for risk, column in RISK_COUNT_COLUMNS.items():
+                    risk_counts[risk] += getattr(row, column) or 0
+            elif row.value_count:
+                by_hospital[row.hospital_id] = (row.name, row.value_sum / row.value_count)
+        return by_hour, risk_counts, by_hospital
+
+    predicted_by_hour, predicted_risk, predicted_by_hospital = split(forecast_rows)
+    observed_by_hour, observed_risk, observed_by_hospital = split(error_rows)
 
     global_series = [
         {
-            "label": row.hour.astimezone(TIMEZONE).strftime("%H:%M"),
-            "predicted": round(row.avg_predicted, 4),
-            "observed": round(observed_by_hour[row.hour], 4)
-            if row.hour in observed_by_hour else None,
+            "label": hour.astimezone(TIMEZONE).strftime(label_format),
+            "predicted": round(predicted, 4),
+            "observed": round(observed_by_hour[hour], 4)
+            if hour in observed_by_hour else None,
         }
-        for row in forecasts_24h
+        for hour, predicted in sorted(predicted_by_hour.items())
     ]
 
-    predicted_risk_counts = (
-        db.query(
-            Forecast.risk_level,
-            func.count(Forecast.id).label("count"),
-        )
-        .filter(
-            Forecast.horizon_hours == horizon_hours,
-            Forecast.forecast_time >= since,
-        )
-        .group_by(Forecast.risk_level)
-        .all()
-    )
-
-    observed_risk_counts = (
-        db.query(
-            case(
-                (ForecastError.observed_pressure < 0.4, "LOW"),
-                (ForecastError.observed_pressure < 0.7, "MEDIUM"),
-                else_="HIGH",
-            ).label("risk_level"),
-            func.count(ForecastError.id).label("count"),
-        )
-        .filter(
-            ForecastError.horizon_hours == horizon_hours,
-            ForecastError.evaluated_at >= since, 
-        )
-        .group_by("risk_level")
-        .all()
-    )
-
-    observed_risk_map = {row.risk_level: row.count for row in observed_risk_counts}
-
     risk_comparison = [
         {
-            "risk": row.risk_level,
-            "predicted": row.count,
-            "observed": observed_risk_map.get(row.risk_level, 0),
+            "risk": risk_level,
+            "predicted": count,
+            "observed": observed_risk[risk_level],
         }
-        for row in predicted_risk_counts
+        for risk_level, count in predicted_risk.items()
+        if count
     ]
 
-    mean_predicted = (
-        db.query(
-            Forecast.hospital_id,
-            func.avg(Forecast.predicted_pressure).label("mean_predicted"),
-        )
-        .filter(
-        Forecast.horizon_hours == horizon_hours,
-        Forecast.forecast_time >= since,    
-        )
-        .group_by(Forecast.hospital_id)
-        .subquery()
-    )
-
-    mean_observed = (
-        db.query(
-            ForecastError.hospital_id,
-            func.avg(ForecastError.observed_pressure).label("mean_observed"),
-        )
-        .filter(
-        ForecastError.horizon_hours == horizon_hours,
-        ForecastError.evaluated_at >= since,  
-        )
-        .group_by(ForecastError.hospital_id)
-        .subquery()
-    )
-
-    rows = (
-        db.query(
-            Hospital.id,
-            Hospital.name,
-            mean_predicted.c.mean_predicted,
-            mean_observed.c.mean_observed,
-        )
-        .join(mean_predicted, Hospital.id == mean_predicted.c.hospital_id)
-        .outerjoin(mean_observed, Hospital.id == mean_observed.c.hospital_id)
-        .filter(Hospital.is_active == True)
-        .order_by(mean_predicted.c.mean_predicted.desc())
-        .all()
-    )
-
-    seen = set()
     hospital_stats = []
-    for row in rows:
-        if row.id in seen:
-            continue
-        seen.add(row.id)
+    for hid, (name, mean_predicted) in sorted(
+        predicted_by_hospital.items(), key=lambda item: item[1][1], reverse=True
+    ):
+        mean_observed = observed_by_hospital.get(hid, (None, None))[1]
         hospital_stats.append({
-            "hospital_id": row.id,
-            "name": row.name,
-            "mean_predicted": round(row.mean_predicted, 4),
-            "mean_observed": round(row.mean_observed, 4) if row.mean_observed else None,
-            "risk_level": pressure_to_risk(row.mean_predicted),
+            "hospital_id": hid,
+            "name": name,
+            "mean_predicted": round(mean_predicted, 4),
+            "mean_observed": round(mean_observed, 4) if mean_observed else None,
+            "risk_level": pressure_to_risk(mean_predicted),
         })
 
     return {
@@ -228,4 +239,4 @@ def get_dashboard_stats(
         "risk_comparison": risk_comparison,
         "hospital_stats": hospital_stats,
         "generated_at": now.isoformat(),
-    }
\ No newline at end of file
+    }
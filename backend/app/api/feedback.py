@@ -1,22 +1,24 @@
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.async_session import get_async_db
 from app.db.models import Feedback
 from app.schemas.feedback import FeedbackCreate, FeedbackRead
 
 router = APIRouter(prefix="/feedback", tags=["feedback"])
 
 @router.post("", response_model=FeedbackRead, status_code=201)
-def submit_feedback(payload: FeedbackCreate, request: Request, db: Session = Depends(get_db)):
+async def submit_feedback(payload: FeedbackCreate, request: Request, db: AsyncSession = Depends(get_async_db)):
     entry = Feedback(
         **payload.model_dump(),
         user_agent=request.headers.get("user-agent")
     )
     db.add(entry)
-    db.commit()
-    db.refresh(entry)
+    await db.commit()
+    await db.refresh(entry)
     return entry
 
 @router.get("", response_model=list[FeedbackRead])
-def get_feedback(db: Session = Depends(get_db)):
-    return db.query(Feedback).order_by(Feedback.created_at.desc()).all()
\ No newline at end of file
+async def get_feedback(db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Feedback).order_by(Feedback.created_at.desc()))
+    return result.scalars().all()
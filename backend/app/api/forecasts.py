@@ -1,40 +1,49 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 
-from app.db.session import get_db
-from app.db.models import Forecast, Hospital
+from app.db.async_session import get_async_db
+from app.db.models import LatestForecast, Hospital
+from app.ml.horizons import FORECAST_HORIZONS
 from app.ml.risk import pressure_to_risk
+from app.services.response_cache import (
+    cache_generation,
+    cache_response,
+    cached_json_response,
+    get_cached_response,
+)
 
 router = APIRouter(prefix="/forecasts", tags=["Forecasts"])
 
 
 @router.get("/latest")
-def get_latest_forecasts(horizon: int = 1, db: Session = Depends(get_db)):
+async def get_latest_forecasts(
+    request: Request,
+    horizon: int = 1,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Return latest forecast per hospital.
+    Served from the response cache until the next forecasting run.
     """
+    # Only horizons the forecasting job produces, which also bounds the cache keys
+    if horizon not in FORECAST_HORIZONS:
+        raise HTTPException(status_code=422, detail=f"horizon must be one of {list(FORECAST_HORIZONS)}")
 
-    subquery = (
-        db.query(
-            Forecast.hospital_id,
-            func.max(Forecast.forecast_time).label("latest_time")
-        )
-        .filter(Forecast.horizon_hours == horizon)
-        .group_by(Forecast.hospital_id)
-        .subquery()
-    )
+    cache_key = ("forecasts/latest", horizon)
+    cached = get_cached_response(cache_key)
+    if cached is not None:
+        return cached_json_response(request, cached)
+    generation = cache_generation()
 
     results = (
-        db.query(Forecast, Hospital)
-        .join(
-            subquery,
-            (Forecast.hospital_id == subquery.c.hospital_id) &
-            (Forecast.forecast_time == subquery.c.latest_time)
+        await db.execute(
+            select(LatestForecast, Hospital)
+            .join(Hospital, Hospital.id == LatestForecast.hospital_id)
+            .where(LatestForecast.horizon_hours == horizon)
+            .order_by(LatestForecast.hospital_id)
         )
-        .join(Hospital, Hospital.id == Forecast.hospital_id)
-        .all()
-    )
+    ).all()
 
     response = []
 
@@ -47,4 +56,4 @@ def get_latest_forecasts(horizon: int = 1, db: Session = Depends(get_db)):
             "forecast_time": forecast.forecast_time
         })
 
-    return response
+    return cached_json_response(request, cache_response(cache_key, response, generation))
@@ -1,22 +1,42 @@
 """
 Geocoding endpoints — proxy for Nominatim forward and reverse geocoding.
 Frontend calls these instead of hitting Nominatim directly.
+Results are cached in-process and in the database, see app/services/geocode_cache.py.
 """
-from fastapi import APIRouter, Query, HTTPException
-from app.services.geocoding import forward_geocode, reverse_geocode
+from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.async_session import get_async_db
+from app.services.geocode_cache import cached_forward_geocode, cached_reverse_geocode, geocode_cache_stats
+from app.services.geocoding import GeocodingUnavailable
+from app.services.local_geocoder import get_local_geocoder
 
 router = APIRouter(prefix="/geocode", tags=["geocoding"])
 
 
+def geocoding_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Geocoding is busy. Please try again in a few seconds.",
+        headers={"Retry-After": "5"},
+    )
+
+
 @router.get("/forward")
-async def geocode_forward(q: str = Query(..., description="Address string to geocode")):
+async def geocode_forward(
+    q: str = Query(..., description="Address string to geocode"),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Convert an address string to coordinates.
 
     Returns:
         { lat, lng, display_name }
     """
-    result = await forward_geocode(q)
+    try:
+        result = await cached_forward_geocode(db, q)
+    except GeocodingUnavailable:
+        raise geocoding_busy()
     if result is None:
         raise HTTPException(
             status_code=404,
@@ -25,10 +45,26 @@ async def geocode_forward(q: str = Query(..., description="Address string to geo
     return result
 
 
+@router.get("/suggest")
+async def geocode_suggest(
+    q: str = Query(..., min_length=1, description="Start of a postal code or place name"),
+    limit: int = Query(default=5, ge=1, le=20),
+):
+    """
+    Prefix completions from the offline index. Never calls Nominatim.
+
+    Returns:
+        { results: [{ lat, lng, display_name }] } — empty when no index is configured.
+    """
+    local = get_local_geocoder()
+    return {"results": local.complete(q, limit) if local is not None else []}
+
+
 @router.get("/reverse")
 async def geocode_reverse(
     lat: float = Query(..., description="Latitude"),
     lng: float = Query(..., description="Longitude"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Convert coordinates to a human-readable address.
@@ -36,10 +72,25 @@ async def geocode_reverse(
     Returns:
         { address }
     """
-    address = await reverse_geocode(lat, lng)
+    try:
+        address = await cached_reverse_geocode(db, lat, lng)
+    except GeocodingUnavailable:
+        raise geocoding_busy()
     if address is None:
         raise HTTPException(
             status_code=404,
             detail="Could not resolve address for the given coordinates.",
         )
-    return {"address": address}
\ No newline at end of file
+    return {"address": address}
+
+
+@router.get("/cache/stats")
+async def geocode_cache_statistics():
+    """
+    Hit/miss counters of the geocoding cache since process start.
+
+    Returns:
+        { forward: {memory_hits, store_hits, misses, hit_rate}, reverse: {...},
+          memory_entries, memory_max_entries }
+    """
+    return geocode_cache_stats()
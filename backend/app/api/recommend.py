@@ -3,12 +3,13 @@ Recommendation endpoint for ER facilities.
 """
 from fastapi import APIRouter, Depends, Query
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.db.models import Hospital, Forecast
+from app.db.async_session import get_async_db
+from app.db.models import LatestForecast
 from app.utils.time import get_current_time
-from app.services.routing import haversine_distance
+from app.services.hospital_index import get_hospital_index
 
 router = APIRouter(prefix="/recommend", tags=["recommendations"])
 
@@ -19,7 +20,7 @@ async def get_recommendations(
     longitude: float = Query(..., description="User's longitude"),
     max_distance: Optional[float] = Query(10.0, description="Maximum distance in km"),
     limit: int = Query(5, description="Maximum number of recommendations to return"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Recommend nearby ER facilities based on predicted congestion and distance.
@@ -54,32 +55,15 @@ async def get_recommendations(
 
     now = get_current_time()
 
-    hospitals = (
-        db.query(Hospital)
-        .filter(
-            Hospital.latitude != 0,
-            Hospital.longitude != 0,
-            Hospital.is_active == True,
-        )
-        .all()
-    )
+    index = await get_hospital_index(db)
+    in_range = index.within(latitude, longitude, max_distance)
+
+    forecasts = await get_nearest_forecasts(db, [h.id for h, _ in in_range], now)
 
     candidates = []
 
-    for h in hospitals:
-        distance = haversine_distance(latitude, longitude, h.latitude, h.longitude)
-        if distance > max_distance:
-            continue
-
-        forecast = (
-            db.query(Forecast)
-            .filter(
-                Forecast.hospital_id == h.id,
-                Forecast.forecast_time >= now,
-            )
-            .order_by(Forecast.forecast_time.asc())  # nearest future forecast
-            .first()
-        )
+    for h, distance in in_range:
+        forecast = forecasts.get(h.id)
 
         predicted_pressure = forecast.predicted_pressure if forecast else None
 
@@ -114,3 +98,35 @@ async def get_recommendations(
         "results": results,
         "user_location": {"latitude": latitude, "longitude": longitude},
     }
+
+
+async def get_nearest_forecasts(db: AsyncSession, hospital_ids: list[int], now) -> dict:
+    """
+    Fetch the nearest future forecast for each hospital in a single query.
+
+    Args:
+        db: Database session.
+        hospital_ids: Candidate hospital ids.
+        now: Reference time; only forecasts at or after it are considered.
+
+    Returns:
+        dict: {hospital_id: LatestForecast} for hospitals that have a future forecast.
+    """
+    if not hospital_ids:
+        return {}
+
+    result = await db.execute(
+        select(LatestForecast)
+        .where(
+            LatestForecast.hospital_id.in_(hospital_ids),
+            LatestForecast.forecast_time >= now,
+        )
+        .order_by(LatestForecast.hospital_id, LatestForecast.horizon_hours)
+    )
+
+    nearest = {}
+    for f in result.scalars():
+        current = nearest.get(f.hospital_id)
+        if current is None or f.forecast_time < current.forecast_time:
+            nearest[f.hospital_id] = f
+    return nearest
@@ -12,6 +12,55 @@ class Settings(BaseSettings):
     APP_ENV: str = "local"
     database_url: str
 
+    # Max age of the in-memory hospital spatial index before it is rebuilt
+    hospital_index_ttl_seconds: int = 3600
+
+    # Cached forecast responses: server-side lifetime and client max-age
+    response_cache_ttl_seconds: int = 300
+    response_cache_max_age_seconds: int = 60
+
+    # Shared Nominatim HTTP client: timeouts and connection pool
+    geocoding_timeout_seconds: float = 8.0
+    geocoding_connect_timeout_seconds: float = 3.0
+    geocoding_max_connections: int = 10
+    geocoding_max_keepalive_connections: int = 5
+    geocoding_keepalive_expiry_seconds: float = 30.0
+
+    # Nominatim allows about one request per second; calls beyond the bucket queue
+    # for up to geocoding_queue_timeout_seconds before the API answers 503
+    geocoding_rate_per_second: float = 1.0
+    geocoding_burst: int = 1
+    geocoding_queue_timeout_seconds: float = 10.0
+
+    # Geocoding result cache: in-process LRU size, lifetime of both tiers, and the
+    # number of decimal places reverse lookups are rounded to (4 ≈ 11 m)
+    geocode_cache_max_entries: int = 10000
+    geocode_cache_ttl_seconds: int = 7 * 24 * 3600
+    geocode_reverse_precision: int = 4
+
+    # Directory of the prebuilt offline geocoder index (python -m app.services.local_geocoder)
+    local_geocoder_path: Optional[str] = None
+
+    # Last downloaded source files and their validators. Must persist between runs
+    # (e.g. a mounted volume for container jobs) for unchanged sources to be skipped
+    ingestion_cache_dir: str = ".cache/ingestion"
+    ingestion_fetch_timeout_seconds: float = 60.0
+
+    # Processes fitting forecasting models (1 fits in the job process) and the
+    # longest a single fit may take on the pool before it is abandoned
+    forecast_fit_workers: int = 1
+    forecast_fit_timeout_seconds: float = 300.0
+
+    # Fitted model parameters reused by later forecasting runs. Like the ingestion
+    # cache, the directory must persist between container jobs to be useful;
+    # models are refitted once older than model_max_age_hours or on error drift
+    model_store_dir: Optional[str] = ".cache/models"
+    model_max_age_hours: int = 24
+
+    # In-process model cache bounds; entries also expire after model_max_age_hours
+    model_cache_max_entries: int = 1000
+    model_cache_max_bytes: int = 16 * 1024 * 1024
+
     class Config:
         env_file = ".env"
         
@@ -0,0 +1,53 @@
+"""
+Async database session management for the API routers.
+
+The scheduled jobs keep using the synchronous engine in ``app.db.session``.
+"""
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+
+
+def to_async_url(database_url: str) -> URL:
+    """
+    Map a synchronous database URL onto its async driver.
+
+    ``postgresql://`` / ``postgresql+psycopg2://`` use asyncpg and ``sqlite://`` uses
+    aiosqlite. asyncpg does not understand libpq's ``sslmode`` so it is passed as ``ssl``.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+
+    if backend == "postgresql":
+        query = dict(url.query)
+        sslmode = query.pop("sslmode", None)
+        if sslmode:
+            query["ssl"] = sslmode
+        return url.set(drivername="postgresql+asyncpg", query=query)
+
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+
+    return url
+
+
+# Create async database engine
+async_engine = create_async_engine(
+    to_async_url(settings.database_url),
+    pool_pre_ping=True,
+)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    """
+    Dependency function to get an async database session.
+
+    Yields:
+        AsyncSession: Database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
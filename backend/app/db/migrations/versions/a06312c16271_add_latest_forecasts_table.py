@@ -0,0 +1,48 @@
+"""add latest_forecasts table
+
+Revision ID: a06312c16271
+Revises: da6333d7de5d
+Create Date: 2026-10-18 09:12:44.215630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a06312c16271'
+down_revision: Union[str, Sequence[str], None] = 'da6333d7de5d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('latest_forecasts',
+    sa.Column('hospital_id', sa.Integer(), nullable=False),
+    sa.Column('horizon_hours', sa.Integer(), nullable=False),
+    sa.Column('predicted_pressure', sa.Float(), nullable=False),
+    sa.Column('risk_level', sa.String(), nullable=False),
+    sa.Column('forecast_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('hospital_id', 'horizon_hours')
+    )
+
+    # Backfill from existing forecast history
+    op.execute(
+        """
+        INSERT INTO latest_forecasts (hospital_id, horizon_hours, predicted_pressure, risk_level, forecast_time)
+        SELECT DISTINCT ON (hospital_id, horizon_hours)
+            hospital_id, horizon_hours, predicted_pressure, risk_level, forecast_time
+        FROM forecasts
+        WHERE hospital_id IS NOT NULL
+        ORDER BY hospital_id, horizon_hours, forecast_time DESC
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('latest_forecasts')
@@ -0,0 +1,91 @@
+"""add hourly rollup tables
+
+Revision ID: b40bf492f389
+Revises: a06312c16271
+Create Date: 2026-10-18 10:03:27.551904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b40bf492f389'
+down_revision: Union[str, Sequence[str], None] = 'a06312c16271'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('forecast_hourly_rollups',
+    sa.Column('hour_bucket', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('hospital_id', sa.Integer(), nullable=False),
+    sa.Column('horizon_hours', sa.Integer(), nullable=False),
+    sa.Column('predicted_sum', sa.Float(), nullable=False),
+    sa.Column('forecast_count', sa.Integer(), nullable=False),
+    sa.Column('low_count', sa.Integer(), nullable=False),
+    sa.Column('medium_count', sa.Integer(), nullable=False),
+    sa.Column('high_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('hour_bucket', 'hospital_id', 'horizon_hours')
+    )
+    op.create_index('ix_forecast_hourly_rollups_horizon_hour', 'forecast_hourly_rollups', ['horizon_hours', 'hour_bucket'], unique=False)
+
+    op.create_table('forecast_error_hourly_rollups',
+    sa.Column('hour_bucket', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('hospital_id', sa.Integer(), nullable=False),
+    sa.Column('horizon_hours', sa.Integer(), nullable=False),
+    sa.Column('observed_sum', sa.Float(), nullable=False),
+    sa.Column('absolute_error_sum', sa.Float(), nullable=False),
+    sa.Column('squared_error_sum', sa.Float(), nullable=False),
+    sa.Column('error_count', sa.Integer(), nullable=False),
+    sa.Column('low_count', sa.Integer(), nullable=False),
+    sa.Column('medium_count', sa.Integer(), nullable=False),
+    sa.Column('high_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('hour_bucket', 'hospital_id', 'horizon_hours')
+    )
+    op.create_index('ix_forecast_error_hourly_rollups_horizon_hour', 'forecast_error_hourly_rollups', ['horizon_hours', 'hour_bucket'], unique=False)
+
+    # Backfill from existing history
+    op.execute(
+        """
+        INSERT INTO forecast_hourly_rollups
+            (hour_bucket, hospital_id, horizon_hours, predicted_sum, forecast_count,
+             low_count, medium_count, high_count)
+        SELECT date_trunc('hour', forecast_time AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+               hospital_id, horizon_hours,
+               sum(predicted_pressure), count(*),
+               count(*) FILTER (WHERE risk_level = 'LOW'),
+               count(*) FILTER (WHERE risk_level = 'MEDIUM'),
+               count(*) FILTER (WHERE risk_level = 'HIGH')
+        FROM forecasts
+        WHERE hospital_id IS NOT NULL
+        GROUP BY 1, 2, 3
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO forecast_error_hourly_rollups
+            (hour_bucket, hospital_id, horizon_hours, observed_sum, absolute_error_sum,
+             squared_error_sum, error_count, low_count, medium_count, high_count)
+        SELECT date_trunc('hour', forecast_time AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+               hospital_id, horizon_hours,
+               sum(observed_pressure), sum(absolute_error), sum(squared_error), count(*),
+               count(*) FILTER (WHERE observed_pressure < 0.4),
+               count(*) FILTER (WHERE observed_pressure >= 0.4 AND observed_pressure < 0.7),
+               count(*) FILTER (WHERE observed_pressure >= 0.7)
+        FROM forecast_errors
+        WHERE hospital_id IS NOT NULL
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_forecast_error_hourly_rollups_horizon_hour', table_name='forecast_error_hourly_rollups')
+    op.drop_table('forecast_error_hourly_rollups')
+    op.drop_index('ix_forecast_hourly_rollups_horizon_hour', table_name='forecast_hourly_rollups')
+    op.drop_table('forecast_hourly_rollups')
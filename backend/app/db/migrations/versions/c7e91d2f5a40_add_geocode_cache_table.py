@@ -0,0 +1,34 @@
+"""add geocode_cache table
+
+Revision ID: c7e91d2f5a40
+Revises: b40bf492f389
+Create Date: 2026-10-18 11:24:05.318822
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e91d2f5a40'
+down_revision: Union[str, Sequence[str], None] = 'b40bf492f389'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('geocode_cache',
+    sa.Column('kind', sa.String(length=8), nullable=False),
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=True),
+    sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('kind', 'key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('geocode_cache')
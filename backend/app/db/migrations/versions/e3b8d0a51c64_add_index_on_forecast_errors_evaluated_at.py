@@ -0,0 +1,28 @@
+"""add index on forecast_errors.evaluated_at
+
+Revision ID: e3b8d0a51c64
+Revises: c7e91d2f5a40
+Create Date: 2026-10-18 15:02:47.613209
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b8d0a51c64'
+down_revision: Union[str, Sequence[str], None] = 'c7e91d2f5a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_forecast_errors_evaluated_at'), 'forecast_errors', ['evaluated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_forecast_errors_evaluated_at'), table_name='forecast_errors')
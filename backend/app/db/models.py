@@ -2,7 +2,7 @@
 Database models for the ER Recommender System.
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, UniqueConstraint, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, UniqueConstraint, Text, Index
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -89,6 +89,21 @@ class Forecast(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+class LatestForecast(Base):
+    """Most recent forecast per hospital and horizon, maintained by save_forecasts."""
+
+    __tablename__ = "latest_forecasts"
+
+    hospital_id = Column(Integer, primary_key=True)
+    horizon_hours = Column(Integer, primary_key=True)
+
+    predicted_pressure = Column(Float, nullable=False)
+    risk_level = Column(String, nullable=False)
+
+    forecast_time = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class ForecastError(Base):
     __tablename__ = "forecast_errors"
 
@@ -105,7 +120,64 @@ class ForecastError(Base):
     horizon_hours = Column(Integer, nullable=False)
     forecast_time = Column(DateTime(timezone=True), nullable=False)
 
-    evaluated_at = Column(DateTime(timezone=True), server_default=func.now())
+    evaluated_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+class ForecastHourlyRollup(Base):
+    """Hourly forecast aggregates per hospital and horizon, maintained by save_forecasts."""
+
+    __tablename__ = "forecast_hourly_rollups"
+
+    __table_args__ = (
+        Index("ix_forecast_hourly_rollups_horizon_hour", "horizon_hours", "hour_bucket"),
+    )
+
+    hour_bucket = Column(DateTime(timezone=True), primary_key=True)  # forecast_time truncated to the UTC hour
+    hospital_id = Column(Integer, primary_key=True)
+    horizon_hours = Column(Integer, primary_key=True)
+
+    predicted_sum = Column(Float, nullable=False, default=0.0)
+    forecast_count = Column(Integer, nullable=False, default=0)
+
+    low_count = Column(Integer, nullable=False, default=0)
+    medium_count = Column(Integer, nullable=False, default=0)
+    high_count = Column(Integer, nullable=False, default=0)
+
+
+class ForecastErrorHourlyRollup(Base):
+    """Hourly forecast error aggregates per hospital and horizon, maintained by evaluate_forecasts."""
+
+    __tablename__ = "forecast_error_hourly_rollups"
+
+    __table_args__ = (
+        Index("ix_forecast_error_hourly_rollups_horizon_hour", "horizon_hours", "hour_bucket"),
+    )
+
+    hour_bucket = Column(DateTime(timezone=True), primary_key=True)  # forecast_time truncated to the UTC hour
+    hospital_id = Column(Integer, primary_key=True)
+    horizon_hours = Column(Integer, primary_key=True)
+
+    observed_sum = Column(Float, nullable=False, default=0.0)
+    absolute_error_sum = Column(Float, nullable=False, default=0.0)
+    squared_error_sum = Column(Float, nullable=False, default=0.0)
+    error_count = Column(Integer, nullable=False, default=0)
+
+    # Risk level of the observed pressure
+    low_count = Column(Integer, nullable=False, default=0)
+    medium_count = Column(Integer, nullable=False, default=0)
+    high_count = Column(Integer, nullable=False, default=0)
+
+
+class GeocodeCacheEntry(Base):
+    """Persisted geocoding result, the second tier behind the in-process cache."""
+
+    __tablename__ = "geocode_cache"
+
+    kind = Column(String(8), primary_key=True)  # "forward" / "reverse"
+    key = Column(String, primary_key=True)      # normalized query or quantized "lat,lng"
+
+    payload = Column(Text, nullable=True)       # JSON result; null when nothing was found
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+
 
 class Feedback(Base):
     __tablename__ = "feedback"
@@ -1,20 +1,148 @@
-from time import time
+"""
+Shared download layer for ingestion sources.
 
+Each source URL keeps its last payload and validators (ETag, Last-Modified,
+SHA-256) under ``ingestion_cache_dir``. Downloads are conditional, so an unchanged
+source costs a 304 instead of a full transfer, and a 200 with identical content is
+recognized by its hash. The cache is only updated when the caller commits the
+download after processing it, so a failed run is retried in full next time.
+"""
+import hashlib
+import io
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import httpx
 import pandas as pd
+
+from app.core.config import settings
 from app.core.logging import logger
 
 DATA_URL = "https://www.msss.gouv.qc.ca/professionnels/statistiques/documents/urgences/Releve_horaire_urgences_7jours_nbpers.csv"
 
-def fetch_dataset(retries: int = 3, delay: int = 10) -> pd.DataFrame:
-    for attempt in range(retries):
-        try:
-            df = pd.read_csv(DATA_URL, encoding="latin1")
-            logger.info("Dataset fetched successfully.")
-            return df
-        except Exception as e:
-            logger.warning(f"Attempt {attempt + 1} failed: {e}")
-            if attempt < retries - 1:
-                logger.info(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-
-    raise RuntimeError(f"Failed to fetch dataset after {retries} attempts.")
+
+@dataclass
+class Download:
+    """A fetched payload; ``changed`` is False when it matches the last committed one."""
+
+    url: str
+    content: bytes
+    changed: bool
+    sha256: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    cache_dir: Optional[Path] = None
+
+    def read_csv(self, **kwargs) -> pd.DataFrame:
+        return pd.read_csv(io.BytesIO(self.content), **kwargs)
+
+    def commit(self) -> None:
+        """Store this payload and its validators as the last successfully processed version."""
+        if self.cache_dir is None:
+            return
+        body_path, meta_path = _cache_paths(self.cache_dir, self.url)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(body_path, self.content)
+        _write_atomic(meta_path, json.dumps({
+            "url": self.url,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "sha256": self.sha256,
+        }).encode("utf-8"))
+
+
+def _cache_paths(cache_dir: Path, url: str):
+    name = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"{name}.body", cache_dir / f"{name}.meta.json"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _load_cached(cache_dir: Path, url: str):
+    body_path, meta_path = _cache_paths(cache_dir, url)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        body = body_path.read_bytes()
+    except (OSError, ValueError):
+        return None, None
+    if hashlib.sha256(body).hexdigest() != meta.get("sha256"):
+        return None, None  # partial or corrupted cache entry
+    return meta, body
+
+
+def _is_retryable(response: httpx.Response) -> bool:
+    return response.status_code == 429 or response.status_code >= 500
+
+
+def download(
+    url: str,
+    retries: int = 3,
+    delay: float = 10,
+    cache_dir: Optional[os.PathLike] = None,
+) -> Download:
+    """
+    Fetch ``url`` conditionally against the last committed download.
+
+    Transport errors, 429 and 5xx responses are retried up to ``retries`` attempts in
+    total, sleeping ``delay``, ``2 * delay``, ``4 * delay``... between them.
+
+    Raises:
+        RuntimeError: if every attempt failed.
+    """
+    cache_dir = Path(cache_dir if cache_dir is not None else settings.ingestion_cache_dir)
+    meta, cached_body = _load_cached(cache_dir, url)
+
+    headers = {}
+    if meta is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    last_error = None
+    with httpx.Client(timeout=settings.ingestion_fetch_timeout_seconds, follow_redirects=True) as client:
+        for attempt in range(retries):
+            try:
+                response = client.get(url, headers=headers)
+                if _is_retryable(response):
+                    raise httpx.HTTPStatusError(
+                        f"{response.status_code} from {url}", request=response.request, response=response
+                    )
+                if response.status_code == 304 and cached_body is not None:
+                    logger.info(f"{url} not modified since last download.")
+                    return Download(url, cached_body, False, meta["sha256"], meta.get("etag"),
+                                    meta.get("last_modified"), cache_dir)
+                response.raise_for_status()
+                break
+            except httpx.HTTPError as e:
+                # Other 4xx responses will not get better by retrying
+                if isinstance(e, httpx.HTTPStatusError) and not _is_retryable(e.response):
+                    raise
+                last_error = e
+                logger.warning(f"Attempt {attempt + 1} failed: {e}")
+                if attempt < retries - 1:
+                    wait = delay * 2 ** attempt
+                    logger.info(f"Retrying in {wait} seconds...")
+                    time.sleep(wait)
+        else:
+            raise RuntimeError(f"Failed to fetch {url} after {retries} attempts.") from last_error
+
+    content = response.content
+    sha256 = hashlib.sha256(content).hexdigest()
+    changed = meta is None or sha256 != meta.get("sha256")
+    logger.info(f"{url} fetched ({len(content)} bytes, {'changed' if changed else 'unchanged'}).")
+    return Download(url, content, changed, sha256, response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"), cache_dir)
+
+
+def fetch_dataset(retries: int = 3, delay: int = 10) -> Download:
+    """Download the MSSS 7-day hourly ER file."""
+    return download(DATA_URL, retries=retries, delay=delay)
@@ -1,54 +1,109 @@
-from sqlalchemy.orm import Session
 import pandas as pd
+from sqlalchemy import case, exists, update
+from sqlalchemy.orm import Session
 
 from app.db.session import SessionLocal
 from app.db.models import Hospital
 from app.core.logging import logger
+from app.ingestion.fetcher import download
+from app.services.hospital_index import refresh_hospital_index
+from app.services.response_cache import invalidate_response_cache
 
 DATASET_URL = "https://www.donneesquebec.ca/recherche/dataset/51998b55-7d4c-4381-8c20-0ac1cd9c1b87/resource/2aa06e66-c1d0-4e2f-bf3c-c2e413c3f84d/download/installationscsv.csv"
-
-
-
-
-def populate_hospital_coords():
-    db: Session = SessionLocal()
-
-    df = pd.read_csv(DATASET_URL)
-
-    updated = 0
-    skipped = 0
-
-    for _, row in df.iterrows():
-        permit_id = str(row.get("INSTAL_COD")).strip()
-
-        if not permit_id:
-            continue
-
-        hospital = (
-            db.query(Hospital)
-            .filter(Hospital.permit_id == permit_id)
-            .first()
+COLUMNS = ["INSTAL_COD", "LATITUDE", "LONGITUDE"]
+
+
+def load_hospital_coords(db) -> pd.DataFrame:
+    """permit_id, id and current coordinates of every hospital."""
+    rows = db.query(Hospital.permit_id, Hospital.id, Hospital.latitude, Hospital.longitude).all()
+    return pd.DataFrame(rows, columns=["permit_id", "id", "latitude", "longitude"])
+
+
+def has_missing_coords(db) -> bool:
+    """True if a hospital still has the 0, 0 placeholder set by upsert_hospitals."""
+    return db.query(
+        exists().where(Hospital.latitude == 0.0, Hospital.longitude == 0.0)
+    ).scalar()
+
+
+def coordinate_updates(df: pd.DataFrame, hospitals: pd.DataFrame):
+    """
+    Join installation coordinates to known hospitals by permit.
+
+    Returns:
+        (updates, counts): ``updates`` holds id, latitude and longitude of hospitals
+        whose coordinates changed; ``counts`` has matched, unmatched and invalid row counts.
+    """
+    coords = pd.DataFrame({
+        "permit_id": df["INSTAL_COD"].astype(str).str.strip(),
+        "latitude": pd.to_numeric(df["LATITUDE"], errors="coerce"),
+        "longitude": pd.to_numeric(df["LONGITUDE"], errors="coerce"),
+    })
+    coords = coords[coords["permit_id"] != ""]
+
+    matched = coords.merge(hospitals, on="permit_id", suffixes=("", "_stored"))
+    invalid = matched[["latitude", "longitude"]].isna().any(axis=1)
+    for permit_id in matched.loc[invalid, "permit_id"]:
+        logger.warning(f"Invalid coordinates for permit_id={permit_id}")
+
+    # Later rows win, as they did when rows were applied one by one
+    valid = matched[~invalid].drop_duplicates("permit_id", keep="last")
+    changed = (valid["latitude"] != valid["latitude_stored"]) | (valid["longitude"] != valid["longitude_stored"])
+    counts = {
+        "matched": len(valid),
+        "unmatched": len(coords) - len(matched),
+        "invalid": int(invalid.sum()),
+    }
+    return valid.loc[changed, ["id", "latitude", "longitude"]], counts
+
+
+def apply_coordinate_updates(db, updates: pd.DataFrame) -> int:
+    """Write all coordinate changes with a single ``UPDATE ... SET ... = CASE id ...``."""
+    if updates.empty:
+        return 0
+    ids = [int(i) for i in updates["id"]]
+    latitudes = dict(zip(ids, updates["latitude"].astype(float)))
+    longitudes = dict(zip(ids, updates["longitude"].astype(float)))
+    stmt = (
+        update(Hospital)
+        .where(Hospital.id.in_(ids))
+        .values(
+            latitude=case(latitudes, value=Hospital.id),
+            longitude=case(longitudes, value=Hospital.id),
         )
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).rowcount
 
-        if not hospital:
-            skipped += 1
-            continue
 
-        try:
-            hospital.latitude = float(row["LATITUDE"])
-            hospital.longitude = float(row["LONGITUDE"])
-            db.add(hospital)
-            updated += 1
-        except (TypeError, ValueError):
-            logger.warning(
-                f"Invalid coordinates for permit_id={permit_id}"
-            )
+def populate_hospital_coords():
+    dataset = download(DATASET_URL)
 
-    db.commit()
-    db.close()
+    db: Session = SessionLocal()
+    try:
+        # Hospitals created by ingestion since the last run still need coordinates,
+        # which an unchanged source (served from the cached payload) can provide
+        if not dataset.changed and not has_missing_coords(db):
+            logger.info("Hospital coordinates source unchanged and no hospital missing coordinates, skipping")
+            return
+
+        df = dataset.read_csv(usecols=COLUMNS)
+        updates, counts = coordinate_updates(df, load_hospital_coords(db))
+        updated = apply_coordinate_updates(db, updates)
+
+        db.commit()
+        if dataset.changed:
+            dataset.commit()
+        if updated:
+            refresh_hospital_index(db)
+            # The congestion map embeds hospital coordinates
+            invalidate_response_cache()
+    finally:
+        db.close()
 
     logger.info(
-        f"Hospital coordinates updated={updated}, skipped={skipped}"
+        f"Hospital coordinates updated={updated}, unchanged={counts['matched'] - updated}, "
+        f"skipped={counts['unmatched']}, invalid={counts['invalid']}"
     )
 
 if __name__ == "__main__":
@@ -1,25 +1,57 @@
+import pandas as pd
+from sqlalchemy.dialects.postgresql import insert
+
 from app.db.models import Hospital
 
-def get_or_create_hospital(db, row):
-    permit_id = row["No_permis_installation"]
-
-    hospital = db.query(Hospital).filter_by(permit_id=permit_id).first()
-    if hospital:
-        return hospital
-
-    hospital = Hospital(
-        establishment=row["Nom_etablissement"],
-        name=row["Nom_installation"],
-        region=row["Region"],
-        permit_id=permit_id,
-        latitude=0.0,   # temporary
-        longitude=0.0,  # temporary
-        phone=None,
-        is_active=True,
-    )
 
-    db.add(hospital)
-    db.commit()
-    db.refresh(hospital)
+def load_hospital_ids(db) -> dict:
+    """Map every known permit_id to its hospital id."""
+    return dict(db.query(Hospital.permit_id, Hospital.id).all())
+
+
+def upsert_hospitals(db, df: pd.DataFrame, hospital_ids: dict) -> int:
+    """
+    Create hospitals for permits in ``df`` that are missing from ``hospital_ids``.
+
+    All unseen permits go into one ``INSERT ... ON CONFLICT (permit_id) DO NOTHING
+    RETURNING``, and ``hospital_ids`` is updated in place. Nothing is committed, so the
+    new hospitals share the caller's transaction with the snapshots that reference them.
+
+    Returns:
+        number of hospitals created.
+    """
+    unseen = df[~df["No_permis_installation"].isin(hospital_ids.keys())]
+    unseen = unseen.drop_duplicates("No_permis_installation")
+    if unseen.empty:
+        return 0
+    unseen = unseen.astype(object).where(unseen.notna(), None)
+
+    rows = [
+        {
+            "establishment": row["Nom_etablissement"],
+            "name": row["Nom_installation"],
+            "region": row["Region"],
+            "permit_id": row["No_permis_installation"],
+            "latitude": 0.0,   # temporary, filled in by populate_hospital_coords
+            "longitude": 0.0,  # temporary
+            "phone": None,
+            "is_active": True,
+        }
+        for row in unseen.to_dict("records")
+    ]
+    stmt = (
+        insert(Hospital)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["permit_id"])
+        .returning(Hospital.id, Hospital.permit_id)
+    )
+    created = db.execute(stmt).all()
+    hospital_ids.update({permit_id: id_ for id_, permit_id in created})
 
-    return hospital
+    # Permits another writer created since load_hospital_ids are not returned
+    missing = [r["permit_id"] for r in rows if r["permit_id"] not in hospital_ids]
+    if missing:
+        hospital_ids.update(
+            db.query(Hospital.permit_id, Hospital.id).filter(Hospital.permit_id.in_(missing)).all()
+        )
+    return len(created)
@@ -1,40 +1,51 @@
+import pandas as pd
+
 from app.db.session import SessionLocal
 from app.ingestion.fetcher import fetch_dataset
 from app.ingestion.parser import clean_dataframe
-from app.ingestion.hospital_loader import get_or_create_hospital
-from app.ingestion.snapshot_loader import insert_snapshot
+from app.ingestion.hospital_loader import load_hospital_ids, upsert_hospitals
+from app.ingestion.snapshot_loader import filter_new_snapshots, insert_snapshots, load_snapshot_watermarks
 from app.core.logging import logger
-from app.db.models import Hospital
-
+from app.services.hospital_index import refresh_hospital_index
 
-def load_hospital_map(db):
-    hospitals = db.query(Hospital).all()
-    return {h.permit_id: h for h in hospitals}
 
 def run_ingestion():
     logger.info("INGESTION STARTED")
     db = SessionLocal()
     try:
-        df = fetch_dataset()
-        df = clean_dataframe(df)
-
-        hospital_map = load_hospital_map(db)
-        count = 0
-
-        for _, row in df.iterrows():
-            permit_id = row["No_permis_installation"]
-
-            hospital = hospital_map.get(permit_id)
-
-            if not hospital:
-                hospital = get_or_create_hospital(db, row)
-                hospital_map[permit_id] = hospital
-
-            insert_snapshot(db, hospital.id, row)
-            count += 1
+        dataset = fetch_dataset()
+        if not dataset.changed:
+            logger.info("INGESTION SKIPPED: source file unchanged since the last successful run")
+            return None
+        df = clean_dataframe(dataset.read_csv(encoding="latin1"))
+
+        # New hospitals and their snapshots are written in the same transaction
+        hospital_ids = load_hospital_ids(db)
+        new_hospitals = upsert_hospitals(db, df, hospital_ids)
+        df["hospital_id"] = df["No_permis_installation"].map(hospital_ids)
+
+        # The file is a rolling 7-day window: only hours past each hospital's latest
+        # stored snapshot are new, so the rest never reaches the database
+        file_start = df["snapshot_time"].min()
+        watermarks = load_snapshot_watermarks(
+            db, since=None if pd.isna(file_start) else file_start.to_pydatetime()
+        )
+        new_rows = filter_new_snapshots(df, watermarks)
+        result = insert_snapshots(db, new_rows)
+        result.filtered = len(df) - len(new_rows)
 
         db.commit()
-        logger.info(f"INGESTION COMPLETED: {count} snapshots inserted")
+        dataset.commit()
+        logger.info(
+            f"INGESTION COMPLETED: {new_hospitals} hospitals created, "
+            f"{result.inserted} snapshots inserted from {len(new_rows)} new rows; "
+            f"{result.filtered} of {len(df)} rows ({result.filtered / max(len(df), 1):.0%}) "
+            f"already ingested and not sent, {result.skipped} skipped on conflict, {result.invalid} invalid"
+        )
+
+        if new_hospitals:
+            refresh_hospital_index(db)
+        return result
     except Exception:
         db.rollback()
         logger.exception("INGESTION FAILED, transaction rolled back")
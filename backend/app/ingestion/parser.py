@@ -1,9 +1,58 @@
+import numpy as np
 import pandas as pd
 import pytz
 from datetime import datetime, timezone
 
 MONTREAL_TZ = pytz.timezone("America/Montreal")
 
+INTEGER_COLUMNS = [
+    "Nombre_de_civieres_fonctionnelles",
+    "Nombre_de_civieres_occupees",
+    "Nombre_total_de_patients_presents_a_lurgence",
+    "Nombre_total_de_patients_en_attente_de_PEC",
+    "Nombre_de_patients_sur_civiere_plus_de_24_heures",
+    "Nombre_de_patients_sur_civiere_plus_de_48_heures",
+]
+FLOAT_COLUMNS = ["DMS_sur_civiere", "DMS_ambulatoire"]
+MISSING_SENTINEL = "pas d'information"
+
+
+def _parse_float(value) -> float:
+    text = str(value).strip().lower()
+    if MISSING_SENTINEL in text:
+        return np.nan
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+def coerce_numeric(series: pd.Series, integer: bool = False) -> pd.Series:
+    """
+    Vectorized equivalent of ``to_float`` / ``to_int`` for a whole column.
+
+    Values are stripped and lowercased, cells containing "pas d'information" become
+    missing, and the rest is parsed as floats. Integer columns are truncated toward
+    zero like ``int(float(value))`` and returned as nullable ``Int64``; values that do
+    not fit in 64 bits become missing. Float columns use NaN for missing values.
+
+    The column is factorized first and only its distinct values are parsed, then
+    broadcast back by code. Hourly counts repeat heavily, so this touches a few hundred
+    values instead of every cell, and parsing with ``float()`` keeps exact parity with
+    the scalar helpers (``pd.to_numeric`` rounds some long decimals differently).
+    """
+    codes, uniques = pd.factorize(series)
+    # The trailing NaN is what code -1 (missing) picks
+    parsed = np.array([_parse_float(u) for u in uniques] + [np.nan], dtype="float64")
+
+    if not integer:
+        return pd.Series(parsed[codes], index=series.index)
+    valid = np.isfinite(parsed) & (np.abs(parsed) < 2**63)
+    truncated = np.zeros(len(parsed), dtype="int64")
+    truncated[valid] = parsed[valid]  # the cast truncates toward zero
+    return pd.Series(pd.arrays.IntegerArray(truncated[codes], ~valid[codes]), index=series.index)
+
+
 def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     df.columns = (
@@ -36,6 +85,11 @@ def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         .dt.tz_convert("UTC")
     )
 
+    for column in INTEGER_COLUMNS:
+        df[column] = coerce_numeric(df[column], integer=True)
+    for column in FLOAT_COLUMNS:
+        df[column] = coerce_numeric(df[column])
+
     # print(df.columns.tolist())
 
     return df
@@ -1,33 +1,110 @@
-from sqlalchemy.exc import IntegrityError
-from app.db.models import ERSnapshot
+from dataclasses import dataclass
+
+import pandas as pd
+from sqlalchemy import func
 from sqlalchemy.dialects.postgresql import insert
-from app.ingestion.utils import to_int, to_float
+
+from app.db.models import ERSnapshot
 from app.core.logging import logger
 
+# ERSnapshot column -> cleaned CSV column, already typed by clean_dataframe
+SNAPSHOT_COLUMNS = {
+    "functional_stretchers": "Nombre_de_civieres_fonctionnelles",
+    "occupied_stretchers": "Nombre_de_civieres_occupees",
+    "patients_total": "Nombre_total_de_patients_presents_a_lurgence",
+    "patients_waiting_mc": "Nombre_total_de_patients_en_attente_de_PEC",
+    "patients_over_24h": "Nombre_de_patients_sur_civiere_plus_de_24_heures",
+    "patients_over_48h": "Nombre_de_patients_sur_civiere_plus_de_48_heures",
+    "avg_stay_stretcher": "DMS_sur_civiere",
+    "avg_stay_ambulatory": "DMS_ambulatoire",
+}
+REQUIRED_COLUMNS = [
+    "hospital_id", "snapshot_time",
+    "functional_stretchers", "occupied_stretchers", "patients_total",
+    "patients_waiting_mc", "patients_over_24h", "patients_over_48h",
+]
 
-def insert_snapshot(db, hospital_id, row):
-    
-    stmt = (
-        insert(ERSnapshot)
-        .values(
-            hospital_id=hospital_id,
-            functional_stretchers=to_int(row["Nombre_de_civieres_fonctionnelles"]),
-            occupied_stretchers=to_int(row["Nombre_de_civieres_occupees"]),
-            patients_total=to_int(row["Nombre_total_de_patients_presents_a_lurgence"]),
-            patients_waiting_mc=to_int(row["Nombre_total_de_patients_en_attente_de_PEC"]),
-            patients_over_24h=to_int(row["Nombre_de_patients_sur_civiere_plus_de_24_heures"]),
-            patients_over_48h=to_int(row["Nombre_de_patients_sur_civiere_plus_de_48_heures"]),
-            avg_stay_stretcher=to_float(row["DMS_sur_civiere"]),
-            avg_stay_ambulatory=to_float(row["DMS_ambulatoire"]),
-            snapshot_time=row["snapshot_time"],
-            updated_at=row["updated_at"],
-        )
-        .on_conflict_do_nothing()
+# Rows per VALUES list; 10 parameters each stays well under PostgreSQL's 65535 limit
+BATCH_SIZE = 1000
+
+
+@dataclass
+class SnapshotInsertResult:
+    inserted: int = 0
+    skipped: int = 0   # already stored, or repeated within the file
+    invalid: int = 0   # a required count or timestamp was missing
+    filtered: int = 0  # older than the hospital's watermark, never sent to the database
+
+
+def load_snapshot_watermarks(db, since=None) -> dict:
+    """
+    Latest stored ``snapshot_time`` per hospital, in one grouped query.
+
+    Only snapshots at or after ``since`` are considered: a hospital whose latest
+    snapshot is older has nothing in the file to skip, so the scan can stop at the
+    start of the file's window.
+    """
+    query = db.query(ERSnapshot.hospital_id, func.max(ERSnapshot.snapshot_time))
+    if since is not None:
+        query = query.filter(ERSnapshot.snapshot_time >= since)
+    return dict(query.group_by(ERSnapshot.hospital_id).all())
+
+
+def filter_new_snapshots(df: pd.DataFrame, watermarks: dict) -> pd.DataFrame:
+    """Rows newer than their hospital's watermark; hospitals without one keep every row."""
+    if not watermarks:
+        return df
+    latest = pd.Series(watermarks, dtype=object)
+    # SQLite returns naive datetimes; snapshot times are stored in UTC
+    latest = pd.to_datetime(latest, utc=True)
+    watermark = df["hospital_id"].map(latest)
+    return df[watermark.isna() | (df["snapshot_time"] > watermark)]
+
+
+def snapshot_records(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert cleaned CSV rows (with a ``hospital_id`` column) into ERSnapshot columns.
+
+    Missing values become None.
+    """
+    records = pd.DataFrame(
+        {column: df[source] for column, source in SNAPSHOT_COLUMNS.items()}, index=df.index
     )
+    records.insert(0, "hospital_id", df["hospital_id"])
+    # Plain datetimes: drivers adapt pandas Timestamps far more slowly
+    for column in ("snapshot_time", "updated_at"):
+        records[column] = pd.Series([t.to_pydatetime() for t in df[column]], index=df.index, dtype=object)
+    # object dtype keeps Python ints/floats (which DB drivers can adapt) and None for NA
+    return records.astype(object).where(records.notna(), None)
+
 
-    # Let the caller manage transaction boundaries; duplicates are skipped by ON CONFLICT DO NOTHING.
-    try:
-        db.execute(stmt)
-    except Exception as e:
-        logger.warning(f"Skipping hospital : {hospital_id} snapshot due to error: {e}")
+def insert_snapshots(db, df: pd.DataFrame, batch_size: int = BATCH_SIZE) -> SnapshotInsertResult:
+    """
+    Bulk-insert snapshots with multi-row ``INSERT ... ON CONFLICT DO NOTHING RETURNING``.
+
+    The statement is compiled once and executed with the row parameters, which
+    SQLAlchemy sends as ``batch_size``-row VALUES lists. Rows missing a required value
+    are dropped beforehand instead of failing the batch. The caller manages the transaction.
+    """
+    records = snapshot_records(df)
+    result = SnapshotInsertResult()
+
+    valid = records[REQUIRED_COLUMNS].notna().all(axis=1)
+    result.invalid = int((~valid).sum())
+    if result.invalid:
+        logger.warning(f"Skipping {result.invalid} snapshots with missing required values")
+    records = records[valid]
+
+    unique = records.drop_duplicates(["hospital_id", "snapshot_time"])
+    result.skipped = len(records) - len(unique)
+
+    rows = unique.to_dict("records")
+    if rows:
+        stmt = insert(ERSnapshot).on_conflict_do_nothing().returning(ERSnapshot.id)
+        inserted = db.connection().execute(
+            stmt, rows, execution_options={"insertmanyvalues_page_size": batch_size}
+        )
+        result.inserted = len(inserted.all())
+        result.skipped += len(rows) - result.inserted
 
+    return result
@@ -10,6 +10,8 @@ from contextlib import asynccontextmanager
 from app.api import health, recommend, hospitals, forecasts, feedback, dashboard, geocode
 from app.core import config, logging, security
 from app.core.logging import logger
+from app.db.async_session import async_engine
+from app.services import geocoding
 
 logging.setup_logging()
 
@@ -22,11 +24,14 @@ async def lifespan(app: FastAPI):
         scheduler = s.start()
     else:
         logger.info("Production environment - skipping APScheduler startup (jobs handled by Azure Container App Job)")
-    
+
+    geocoding.open_client()
     yield
+    await geocoding.close_client()
     if scheduler:
         scheduler.shutdown()
         logger.info("APScheduler shutdown")
+    await async_engine.dispose()
 
 app = FastAPI(
     title="ER Recommender System API",
@@ -1,62 +1,90 @@
+from typing import List, Sequence, Union
+
 import pandas as pd
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.db.models import ERSnapshot
 from app.ml.features.feature_builder import build_features
 from app.utils.time import delta_hours, get_current_time
 
+# Columns of the snapshot frame and their in-memory dtypes. Counts are NOT NULL in the
+# schema; int32 halves their footprint without the silent wrap-around int16 would risk.
+SNAPSHOT_DTYPES = {
+    "hospital_id": "int32",
+    "functional_stretchers": "int32",
+    "occupied_stretchers": "int32",
+    "patients_total": "int32",
+    "patients_waiting_mc": "int32",
+    "patients_over_24h": "int32",
+    "patients_over_48h": "int32",
+}
+
+# Rows fetched per round trip from the server-side cursor
+STREAM_CHUNK_SIZE = 20000
+
+
+def _snapshot_frame(rows) -> pd.DataFrame:
+    df = pd.DataFrame.from_records(rows, columns=[*SNAPSHOT_DTYPES, "snapshot_time"])
+    df = df.astype(SNAPSHOT_DTYPES)
+    # Ensure datetime type
+    df["snapshot_time"] = pd.to_datetime(df["snapshot_time"], utc=True)
+    return df
+
+
 def load_snapshots_df(db: Session, lookback_hours:int = 72) -> pd.DataFrame:
     """
-    Load ER snapshots from the last 3 days from database into a pandas DataFrame.
+    Load ER snapshots from the last ``lookback_hours`` into a pandas DataFrame.
+
+    Only the feature columns are selected, streamed from a server-side cursor in
+    chunks of STREAM_CHUNK_SIZE rows and stored with the SNAPSHOT_DTYPES, so the
+    window is never held as ORM objects or as one driver-side result set.
     """
 
     cutoff = get_current_time() - delta_hours(lookback_hours)
-    
-    snapshots = (
-        db.query(ERSnapshot)
-        .filter(ERSnapshot.snapshot_time >= cutoff)
+
+    stmt = (
+        select(*(getattr(ERSnapshot, c) for c in SNAPSHOT_DTYPES), ERSnapshot.snapshot_time)
+        .where(ERSnapshot.snapshot_time >= cutoff)
         .order_by(ERSnapshot.hospital_id, ERSnapshot.snapshot_time)
-        .all()
     )
+    result = db.execute(stmt, execution_options={"stream_results": True, "yield_per": STREAM_CHUNK_SIZE})
+    chunks = [_snapshot_frame(rows) for rows in result.partitions()]
 
-    data = [
-        {
-            "hospital_id": s.hospital_id,
-            "functional_stretchers": s.functional_stretchers,
-            "occupied_stretchers": s.occupied_stretchers,
-            "patients_total": s.patients_total,
-            "patients_waiting_mc": s.patients_waiting_mc,
-            "patients_over_24h": s.patients_over_24h,
-            "patients_over_48h": s.patients_over_48h,
-            "snapshot_time": s.snapshot_time,
-        }
-        for s in snapshots
-    ]
-
-    df = pd.DataFrame(data)
+    if not chunks:
+        return _snapshot_frame([])
+    return pd.concat(chunks, ignore_index=True)
 
-    # Ensure datetime type
-    df["snapshot_time"] = pd.to_datetime(df["snapshot_time"], utc=True)
+def _horizons(horizon_hours: Union[int, Sequence[int]]) -> List[int]:
+    if isinstance(horizon_hours, int):
+        return [horizon_hours]
+    return sorted(set(horizon_hours))
 
-    return df
 
-def add_forecast_targets(df: pd.DataFrame, horizon_hours: int = 1) -> pd.DataFrame:
+def target_column(horizon_hours: int) -> str:
+    return f"target_pressure_t+{horizon_hours}h"
+
+
+def add_forecast_targets(df: pd.DataFrame, horizon_hours: Union[int, Sequence[int]] = 1) -> pd.DataFrame:
     """
-    Create future pressure targets for forecasting.
+    Create future pressure targets for forecasting, one column per horizon.
     """
 
     df = df.sort_values(["hospital_id", "snapshot_time"])
 
-    df[f"target_pressure_t+{horizon_hours}h"] = (
-        df.groupby("hospital_id")["pressure_score"].shift(-horizon_hours)
-    )
+    pressure = df.groupby("hospital_id")["pressure_score"]
+    for h in _horizons(horizon_hours):
+        df[target_column(h)] = pressure.shift(-h)
 
     return df
 
 
-def build_ml_dataset(db: Session, horizon_hours: int = 1) -> pd.DataFrame:
+def build_ml_dataset(db: Session, horizon_hours: Union[int, Sequence[int]] = 1) -> pd.DataFrame:
     """
     Full pipeline: DB → Features → Targets
+
+    Rows are kept up to each hospital's latest snapshot; their target columns are
+    NaN where the future is not observed yet, so one dataset serves every horizon.
     """
 
 
@@ -72,7 +100,8 @@ def build_ml_dataset(db: Session, horizon_hours: int = 1) -> pd.DataFrame:
     df = add_forecast_targets(df, horizon_hours=horizon_hours)
 
     
-    df = df.dropna()
+    targets = [target_column(h) for h in _horizons(horizon_hours)]
+    df = df.dropna(subset=[c for c in df.columns if c not in targets])
 
 
     df = df.merge(
@@ -81,4 +110,3 @@ def build_ml_dataset(db: Session, horizon_hours: int = 1) -> pd.DataFrame:
     )
 
     return df
-
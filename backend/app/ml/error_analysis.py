@@ -1,7 +1,71 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.db.models import ForecastError
 from app.utils.time import get_current_time, delta_hours
 
+MIN_ERRORS_FOR_BIAS = 3
+MIN_ERRORS_FOR_RETRAIN = 5
+
+
+@dataclass(frozen=True)
+class ErrorStats:
+    """Recent forecast errors of one hospital and horizon."""
+
+    count: int
+    mae: float
+    bias: float  # mean signed error; positive = model over-predicts
+
+
+def get_error_stats(
+    db: Session,
+    lookback_hours: int = 24,
+    hospital_id: Optional[int] = None,
+    horizon_hours: Optional[int] = None,
+) -> Dict[Tuple[int, int], ErrorStats]:
+    """
+    Count, MAE and bias of recent errors for every (hospital_id, horizon_hours),
+    computed in one grouped query. Pairs without recent errors are absent.
+    """
+    cutoff = get_current_time() - delta_hours(lookback_hours)
+    query = (
+        db.query(
+            ForecastError.hospital_id,
+            ForecastError.horizon_hours,
+            func.count(),
+            func.avg(ForecastError.absolute_error),
+            func.avg(ForecastError.predicted_pressure - ForecastError.observed_pressure),
+        )
+        .filter(ForecastError.evaluated_at >= cutoff)
+        .group_by(ForecastError.hospital_id, ForecastError.horizon_hours)
+    )
+    if hospital_id is not None:
+        query = query.filter(ForecastError.hospital_id == hospital_id)
+    if horizon_hours is not None:
+        query = query.filter(ForecastError.horizon_hours == horizon_hours)
+
+    return {
+        (h, horizon): ErrorStats(count=count, mae=float(mae), bias=float(bias))
+        for h, horizon, count, mae, bias in query.all()
+    }
+
+
+def recent_bias(stats: Optional[ErrorStats]) -> float:
+    """Bias to subtract from a forecast, or 0 without enough recent errors."""
+    if stats is None or stats.count < MIN_ERRORS_FOR_BIAS:  # not enough signal
+        return 0.0
+    return stats.bias
+
+
+def needs_retrain(stats: Optional[ErrorStats], mae_threshold: float = 0.15) -> bool:
+    """True if recent MAE exceeds threshold."""
+    if stats is None or stats.count < MIN_ERRORS_FOR_RETRAIN:
+        return False  # not enough data to judge
+    return stats.mae > mae_threshold
+
+
 def get_recent_bias(
     db: Session,
     hospital_id: int,
@@ -9,19 +73,8 @@ def get_recent_bias(
     lookback_hours: int = 24,
 ) -> float:
     """Mean signed error over recent window. Positive = model over-predicts."""
-    cutoff = get_current_time() - delta_hours(lookback_hours)
-    errors = (
-        db.query(ForecastError)
-        .filter(
-            ForecastError.hospital_id == hospital_id,
-            ForecastError.horizon_hours == horizon_hours,
-            ForecastError.evaluated_at >= cutoff,
-        )
-        .all()
-    )
-    if len(errors) < 3:  # not enough signal
-        return 0.0
-    return sum(e.predicted_pressure - e.observed_pressure for e in errors) / len(errors)
+    stats = get_error_stats(db, lookback_hours, hospital_id, horizon_hours)
+    return recent_bias(stats.get((hospital_id, horizon_hours)))
 
 
 def should_retrain(
@@ -32,17 +85,5 @@ def should_retrain(
     lookback_hours: int = 24,
 ) -> bool:
     """Returns True if recent MAE exceeds threshold."""
-    cutoff = get_current_time() - delta_hours(lookback_hours)
-    errors = (
-        db.query(ForecastError)
-        .filter(
-            ForecastError.hospital_id == hospital_id,
-            ForecastError.horizon_hours == horizon_hours,
-            ForecastError.evaluated_at >= cutoff,
-        )
-        .all()
-    )
-    if len(errors) < 5:
-        return False  # not enough data to judge
-    mae = sum(e.absolute_error for e in errors) / len(errors)
-    return mae > mae_threshold
\ No newline at end of file
+    stats = get_error_stats(db, lookback_hours, hospital_id, horizon_hours)
+    return needs_retrain(stats.get((hospital_id, horizon_hours)), mae_threshold)
@@ -1,9 +1,39 @@
+import numpy as np
+from sqlalchemy import tuple_
+
 from app.db.session import SessionLocal
 from datetime import datetime
 from app.core.logging import logger
 
 from app.db.models import Forecast, ERSnapshot, ForecastError
-from app.ml.features.pressure import compute_pressure_score
+from app.ml.features.pressure import PRESSURE_COLUMNS, compute_pressure_scores
+from app.services.forecast_rollups import add_error_rollups
+
+# (hospital_id, snapshot_time) pairs per snapshot lookup query
+LOOKUP_BATCH_SIZE = 500
+
+
+def load_observed_pressures(db, forecasts) -> dict:
+    """
+    Observed pressure at each forecast's target time.
+
+    Returns:
+        {(hospital_id, snapshot_time): pressure} for the forecasts that have a snapshot.
+    """
+    keys = list({(f.hospital_id, f.forecast_time) for f in forecasts})
+    columns = [getattr(ERSnapshot, c) for c in PRESSURE_COLUMNS]
+    rows = []
+    for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+        rows += db.query(ERSnapshot.hospital_id, ERSnapshot.snapshot_time, *columns).filter(
+            tuple_(ERSnapshot.hospital_id, ERSnapshot.snapshot_time).in_(keys[start:start + LOOKUP_BATCH_SIZE])
+        ).all()
+
+    if not rows:
+        return {}
+    snapshots = {c: [r[i + 2] for r in rows] for i, c in enumerate(PRESSURE_COLUMNS)}
+    pressures = compute_pressure_scores(snapshots)
+    # Snapshots with missing counts have no pressure; treat them like data gaps
+    return {(r[0], r[1]): float(p) for r, p in zip(rows, pressures) if not np.isnan(p)}
 
 
 def evaluate_forecasts():
@@ -28,21 +58,18 @@ def evaluate_forecasts():
         ).all()
 
         # print(f"Found {len(forecasts)} forecasts to evaluate")
+        error_records = []
+
+        observed = load_observed_pressures(db, forecasts) if forecasts else {}
 
         for f in forecasts:
 
-            # Get real snapshot at forecast time
-            snapshot = db.query(ERSnapshot).filter(
-                ERSnapshot.hospital_id == f.hospital_id,
-                ERSnapshot.snapshot_time == f.forecast_time
-            ).first()
+            # Real pressure at forecast time
+            observed_pressure = observed.get((f.hospital_id, f.forecast_time))
 
-            if not snapshot:
+            if observed_pressure is None:
                 continue  # Missing snapshot (data gap)
 
-            # Compute real pressure
-            observed_pressure = compute_pressure_score(snapshot)
-
             error = observed_pressure - f.predicted_pressure
 
             # Save error record
@@ -58,10 +85,12 @@ def evaluate_forecasts():
             )
 
             db.add(error_record)
+            error_records.append(error_record)
 
             # Mark forecast as evaluated
             f.evaluated = True
 
+        add_error_rollups(db, error_records)
         db.commit()
     except Exception as e:
         db.rollback()
@@ -1,4 +1,4 @@
-from app.ml.features.pressure import compute_pressure_score
+from app.ml.features.pressure import compute_pressure_scores
 import pandas as pd
 
 def build_features(df: pd.DataFrame) -> pd.DataFrame:
@@ -8,7 +8,7 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
 
     df = df.sort_values(["hospital_id", "snapshot_time"]).copy()
 
-    df["pressure_score"] = df.apply(compute_pressure_score, axis=1)
+    df["pressure_score"] = compute_pressure_scores(df)
 
     df["hour"] = df["snapshot_time"].dt.hour
     df["day_of_week"] = df["snapshot_time"].dt.dayofweek
@@ -1,3 +1,15 @@
+import numpy as np
+import pandas as pd
+
+PRESSURE_COLUMNS = (
+    "functional_stretchers",
+    "occupied_stretchers",
+    "patients_total",
+    "patients_waiting_mc",
+    "patients_over_24h",
+)
+
+
 def compute_pressure_score(snapshot):
     """
     Compute hospital pressure level from one ER snapshot.
@@ -19,3 +31,51 @@ def compute_pressure_score(snapshot):
     )
 
     return round(pressure, 3)
+
+
+def _as_float(values) -> np.ndarray:
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype="float64", na_value=np.nan)
+    return np.asarray(values, dtype="float64")
+
+
+def _round3(values: np.ndarray) -> np.ndarray:
+    """
+    Element-wise ``round(x, 3)``.
+
+    np.round scales by 1000 first, which can push a value lying just off a
+    rounding midpoint onto the other side of it. Python rounds the exact binary
+    value, so values whose scaled fraction is within a hair of .5 go through it.
+    """
+    rounded = np.round(values, 3)
+    scaled = values * 1000.0
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        rounded[near_half] = [round(float(v), 3) for v in values[near_half]]
+    return rounded
+
+
+def compute_pressure_scores(snapshots) -> np.ndarray:
+    """
+    Column-wise compute_pressure_score.
+
+    Args:
+        snapshots: DataFrame (or mapping of columns) with the PRESSURE_COLUMNS.
+
+    Returns:
+        float64 array equal, element for element, to compute_pressure_score on
+        each row; rows with a missing input give NaN.
+    """
+    functional, occupied, total, waiting, over_24h = (
+        _as_float(snapshots[column]) for column in PRESSURE_COLUMNS
+    )
+
+    # Safety guards (np.maximum keeps NaN, as max() does with a NaN first argument)
+    total = np.maximum(total, 1)
+    stretchers = np.maximum(functional, 1)
+
+    # Same operations in the same order as the scalar version, so results are bit-identical
+    pressure = 0.5 * (occupied / stretchers) + 0.3 * (waiting / total)
+    pressure = pressure + 0.2 * (over_24h / total)
+
+    return _round3(pressure)
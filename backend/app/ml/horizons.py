@@ -0,0 +1,2 @@
+# Hours ahead forecast by each forecasting run, and the only horizons the API serves
+FORECAST_HORIZONS = (1, 2, 4)
@@ -0,0 +1,131 @@
+"""
+Bounded in-process cache of fitted model artifacts.
+
+When the scheduler runs inside the API process the cache lives as long as the
+server, so it is capped by entry count and by an approximate memory budget, and
+entries expire after ``model_max_age_hours`` like the artifacts on disk.
+"""
+import dataclasses
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+
+def approximate_size(obj, _seen=None) -> int:
+    """Rough deep size in bytes of plain containers, dataclasses and numpy arrays."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (0 if obj.base is not None else obj.nbytes)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approximate_size(k, _seen) + approximate_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item, _seen) for item in obj)
+    elif dataclasses.is_dataclass(obj):
+        size += approximate_size(vars(obj), _seen)
+    return size
+
+
+class ModelCache:
+    """
+    Thread-safe LRU map with a per-entry TTL and a total size budget.
+
+    Entries are evicted least recently used first once either ``max_entries`` or
+    ``max_bytes`` is exceeded; a value larger than the whole budget is not stored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        sizeof: Callable[[object], int] = approximate_size,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof
+        self._entries: OrderedDict = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.counters = Counter()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key) -> Optional[object]:
+        """Return the value for ``key``, or None if absent or expired."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and time.monotonic() >= item[2]:
+                self._remove(key)
+                self.counters["expired"] += 1
+                item = None
+            if item is None:
+                self.counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return item[0]
+
+    def put(self, key, value) -> None:
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                self.counters["rejected"] += 1
+                return
+            self._entries[key] = (value, size, time.monotonic() + self.ttl_seconds)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.counters["evictions"] += 1
+
+    def invalidate(self, key) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.counters["hits"],
+                "misses": self.counters["misses"],
+                "evictions": self.counters["evictions"],
+                "expired": self.counters["expired"],
+                "rejected": self.counters["rejected"],
+            }
+
+
+def create_model_cache() -> ModelCache:
+    """A cache sized from settings."""
+    return ModelCache(
+        max_entries=settings.model_cache_max_entries,
+        max_bytes=settings.model_cache_max_bytes,
+        ttl_seconds=settings.model_max_age_hours * 3600,
+    )
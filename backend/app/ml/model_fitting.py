@@ -0,0 +1,147 @@
+"""
+ARIMA fitting, in-process or fanned out over a pool of worker processes.
+
+Each hospital's model is independent, so the forecasting job can fit them on
+separate cores. Workers are spawned (not forked, which would copy the database
+engine and scheduler threads) with BLAS limited to one thread each, so N workers
+use N cores instead of N times the BLAS thread count.
+"""
+import multiprocessing
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA
+
+from app.core.config import settings
+from app.core.logging import logger
+
+ARIMA_ORDER = (2, 1, 2)
+
+# Thread pools read these when BLAS is loaded, i.e. when a spawned worker imports numpy
+BLAS_THREAD_VARIABLES = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+@dataclass
+class FitOutcome:
+    """A fitted model, or the reason there is none, and how long fitting took."""
+
+    result: Any
+    seconds: float
+    error: Optional[str] = None
+
+
+def fit_arima(series: pd.Series, order=ARIMA_ORDER) -> FitOutcome:
+    """Fit one model. Runs in worker processes, so it reports failures instead of raising."""
+    start = time.perf_counter()
+    try:
+        result = ARIMA(series, order=order).fit()
+    except Exception as e:
+        return FitOutcome(None, time.perf_counter() - start, str(e))
+    return FitOutcome(result, time.perf_counter() - start)
+
+
+@contextmanager
+def _single_threaded_blas():
+    """Set the BLAS thread variables to 1 for processes started inside the block."""
+    saved = {name: os.environ.get(name) for name in BLAS_THREAD_VARIABLES}
+    os.environ.update({name: "1" for name in BLAS_THREAD_VARIABLES})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+class ModelFitter:
+    """
+    Fits batches of ARIMA models.
+
+    With ``workers`` > 1 the models are fitted on a pool of spawned processes that
+    is started on first use and kept until ``close()``, so one job run pays the
+    worker start-up once. A fit that exceeds ``timeout`` seconds is reported as
+    failed and its worker is terminated on close. With one worker, models are fitted
+    in-process and the timeout does not apply.
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None):
+        self.workers = settings.forecast_fit_workers if workers is None else workers
+        self.timeout = settings.forecast_fit_timeout_seconds if timeout is None else timeout
+        self._pool = None
+        self._stuck = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _get_pool(self):
+        if self._pool is None:
+            context = multiprocessing.get_context("spawn")
+            # multiprocessing.Pool starts every worker here, while the variables are set
+            with _single_threaded_blas():
+                self._pool = context.Pool(self.workers)
+        return self._pool
+
+    def fit(self, series: Dict[Hashable, pd.Series], order=ARIMA_ORDER) -> Dict[Hashable, FitOutcome]:
+        """
+        Fit one model per series.
+
+        Returns:
+            {key: FitOutcome} in the order of ``series``, whatever the execution mode.
+        """
+        if not series:
+            return {}
+        start = time.perf_counter()
+        if self.workers > 1 and len(series) > 1:
+            outcomes = self._fit_parallel(series, order)
+        else:
+            outcomes = {key: fit_arima(s, order) for key, s in series.items()}
+
+        wall = time.perf_counter() - start
+        fit_time = sum(o.seconds for o in outcomes.values())
+        logger.info(
+            f"Fitted {len(outcomes)} models in {wall:.2f}s with {max(self.workers, 1)} worker(s); "
+            f"total fit time {fit_time:.2f}s, speedup {fit_time / wall if wall else 1.0:.1f}x"
+        )
+        return outcomes
+
+    def _fit_parallel(self, series, order) -> Dict[Hashable, FitOutcome]:
+        pool = self._get_pool()
+        pending = {key: pool.apply_async(fit_arima, (s, order)) for key, s in series.items()}
+        outcomes = {}
+        # Tasks start in submission order, so by the time a result is awaited its
+        # task is running and the wait is bounded by roughly one fit
+        for key, task in pending.items():
+            try:
+                outcomes[key] = task.get(timeout=self.timeout)
+            except multiprocessing.TimeoutError:
+                self._stuck = True
+                outcomes[key] = FitOutcome(None, self.timeout, f"timed out after {self.timeout:.0f}s")
+            except Exception as e:
+                outcomes[key] = FitOutcome(None, 0.0, str(e))
+        return outcomes
+
+    def close(self) -> None:
+        if self._pool is None:
+            return
+        if self._stuck:
+            self._pool.terminate()
+        else:
+            self._pool.close()
+        self._pool.join()
+        self._pool = None
+        self._stuck = False
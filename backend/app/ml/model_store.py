@@ -0,0 +1,130 @@
+"""
+On-disk store of fitted forecasting model parameters.
+
+The forecasting job runs as a fresh process every hour, so an in-memory cache
+starts empty each time. Fitted parameters are written here instead, one JSON
+artifact per hospital under a directory named after the model spec, and a later
+run re-applies them to the current series with ``filter()``, which costs a
+Kalman pass rather than a likelihood optimisation.
+
+An artifact is reused only while it is younger than ``model_max_age_hours`` and
+its training data watermark is not past the data now available; drift detected
+from forecast errors forces a refit regardless.
+"""
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.ml.model_fitting import ARIMA_ORDER
+from app.utils.time import get_current_time
+
+# Bump the version when fitting changes in a way that invalidates stored parameters
+MODEL_SPEC = f"arima-{'-'.join(map(str, ARIMA_ORDER))}-v1"
+
+
+def _utc(timestamp) -> datetime:
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return timestamp.to_pydatetime()
+
+
+@dataclass
+class ModelArtifact:
+    """Parameters of one fitted model and what it was trained on."""
+
+    spec: str
+    params: List[float]
+    param_names: List[str]
+    watermark: datetime  # latest snapshot_time in the training series
+    fitted_at: datetime
+    nobs: int
+
+    @classmethod
+    def from_result(cls, result, watermark: datetime) -> "ModelArtifact":
+        return cls(
+            spec=MODEL_SPEC,
+            params=[float(p) for p in result.params],
+            param_names=list(result.model.param_names),
+            watermark=_utc(watermark),
+            fitted_at=get_current_time(),
+            nobs=int(result.nobs),
+        )
+
+    def is_fresh(self, watermark: datetime, max_age: timedelta) -> bool:
+        """True if the artifact can serve data ending at ``watermark``."""
+        return (
+            self.spec == MODEL_SPEC
+            and self.watermark <= _utc(watermark)
+            and get_current_time() - self.fitted_at <= max_age
+        )
+
+    def apply(self, series: pd.Series):
+        """Results for ``series`` under the stored parameters, without refitting."""
+        model = ARIMA(series, order=ARIMA_ORDER)
+        if list(model.param_names) != self.param_names:
+            raise ValueError(f"Stored parameters {self.param_names} do not match {model.param_names}")
+        return model.filter(self.params)
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["watermark"] = self.watermark.isoformat()
+        data["fitted_at"] = self.fitted_at.isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, text: str) -> "ModelArtifact":
+        data = json.loads(text)
+        data["watermark"] = datetime.fromisoformat(data["watermark"])
+        data["fitted_at"] = datetime.fromisoformat(data["fitted_at"])
+        return cls(**data)
+
+
+class ModelStore:
+    """Model artifacts under ``root/<MODEL_SPEC>/hospital_<id>.json``."""
+
+    def __init__(self, root, max_age: Optional[timedelta] = None):
+        self.root = Path(root) / MODEL_SPEC
+        self.max_age = max_age if max_age is not None else timedelta(hours=settings.model_max_age_hours)
+
+    def _path(self, hospital_id: int) -> Path:
+        return self.root / f"hospital_{hospital_id}.json"
+
+    def load(self, hospital_id: int, watermark: datetime) -> Optional[ModelArtifact]:
+        """The stored artifact for a hospital if it can serve data ending at ``watermark``."""
+        try:
+            artifact = ModelArtifact.from_json(self._path(hospital_id).read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable model artifact for hospital {hospital_id}: {e}")
+            return None
+        return artifact if artifact.is_fresh(watermark, self.max_age) else None
+
+    def save(self, hospital_id: int, artifact: ModelArtifact) -> None:
+        """Write an artifact atomically, replacing the previous one."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(artifact.to_json())
+            os.replace(tmp, self._path(hospital_id))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def get_model_store() -> Optional[ModelStore]:
+    """The configured store, or None when ``model_store_dir`` is unset."""
+    if not settings.model_store_dir:
+        return None
+    return ModelStore(settings.model_store_dir)
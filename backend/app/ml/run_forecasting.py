@@ -1,20 +1,29 @@
+import time
+
+from app.core.logging import logger
 from app.db.session import SessionLocal
-from app.services.forecast_service import train_and_forecast
+from app.ml.model_fitting import ModelFitter
+from app.ml.model_store import get_model_store
+from app.services.forecast_service import FORECAST_HORIZONS, train_and_forecast_multi
 from app.services.forecast_storage import save_forecasts
+from app.services.response_cache import invalidate_response_cache
 
 
 def run_forecasting():
+    start = time.perf_counter()
     db = SessionLocal()
 
-    horizon_hours = [1,2,4]
+    with ModelFitter() as fitter:
+        predictions = train_and_forecast_multi(db, FORECAST_HORIZONS, fitter=fitter, store=get_model_store())
 
-    for h in horizon_hours: 
-        predictions = train_and_forecast(db, h)
-        if predictions:
-            save_forecasts(db, predictions,h)
+    for h, horizon_predictions in predictions.items():
+        if horizon_predictions:
+            save_forecasts(db, horizon_predictions, h)
 
 
     db.close()
+    invalidate_response_cache()
+    logger.info(f"Forecasting job finished in {time.perf_counter() - start:.2f}s")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+"""
+Incremental maintenance of the hourly forecast and forecast-error rollup tables
+read by the analytics dashboard.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import ForecastErrorHourlyRollup, ForecastHourlyRollup
+from app.ml.risk import pressure_to_risk
+
+RISK_COUNT_COLUMNS = {
+    "LOW": "low_count",
+    "MEDIUM": "medium_count",
+    "HIGH": "high_count",
+}
+
+
+def hour_bucket(dt: datetime) -> datetime:
+    """Truncate a datetime to the start of its UTC hour."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _upsert_increments(db: Session, model, increments: dict, sum_columns: list):
+    """Add each row's values onto the existing rollup row, creating it if needed."""
+    if not increments:
+        return
+
+    table = model.__table__
+    stmt = insert(model).values(list(increments.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.hour_bucket, table.c.hospital_id, table.c.horizon_hours],
+        set_={c: table.c[c] + stmt.excluded[c] for c in sum_columns},
+    )
+    db.execute(stmt)
+
+
+def add_forecast_rollups(db: Session, forecasts: list):
+    """
+    Add newly inserted forecasts to forecast_hourly_rollups.
+
+    Args:
+        forecasts: dicts with hospital_id, horizon_hours, forecast_time,
+            predicted_pressure and risk_level. Only pass forecasts that were
+            actually inserted, otherwise they are counted twice.
+    """
+    sum_columns = ["predicted_sum", "forecast_count", *RISK_COUNT_COLUMNS.values()]
+    increments = {}
+
+    for f in forecasts:
+        key = (hour_bucket(f["forecast_time"]), f["hospital_id"], f["horizon_hours"])
+        row = increments.setdefault(key, {
+            "hour_bucket": key[0],
+            "hospital_id": key[1],
+            "horizon_hours": key[2],
+            **{c: 0 for c in sum_columns},
+        })
+        row["predicted_sum"] += f["predicted_pressure"]
+        row["forecast_count"] += 1
+        risk_column = RISK_COUNT_COLUMNS.get(f["risk_level"])
+        if risk_column:
+            row[risk_column] += 1
+
+    _upsert_increments(db, ForecastHourlyRollup, increments, sum_columns)
+
+
+def add_error_rollups(db: Session, errors: list):
+    """
+    Add newly evaluated ForecastError records to forecast_error_hourly_rollups.
+    """
+    sum_columns = [
+        "observed_sum", "absolute_error_sum", "squared_error_sum", "error_count",
+        *RISK_COUNT_COLUMNS.values(),
+    ]
+    increments = {}
+
+    for e in errors:
+        key = (hour_bucket(e.forecast_time), e.hospital_id, e.horizon_hours)
+        row = increments.setdefault(key, {
+            "hour_bucket": key[0],
+            "hospital_id": key[1],
+            "horizon_hours": key[2],
+            **{c: 0 for c in sum_columns},
+        })
+        row["observed_sum"] += e.observed_pressure
+        row["absolute_error_sum"] += e.absolute_error
+        row["squared_error_sum"] += e.squared_error
+        row["error_count"] += 1
+        row[RISK_COUNT_COLUMNS[pressure_to_risk(e.observed_pressure)]] += 1
+
+    _upsert_increments(db, ForecastErrorHourlyRollup, increments, sum_columns)
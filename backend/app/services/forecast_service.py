@@ -1,23 +1,68 @@
+import time
+
 import pandas as pd
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.utils.time import get_current_time
-from statsmodels.tsa.arima.model import ARIMA
 from datetime import timedelta, timezone
+from typing import Dict, List, Optional, Sequence
 
 from app.ml.datasets.snapshot_dataset import build_ml_dataset
 from app.ml.risk import pressure_to_risk
 from app.core.logging import logger
-from app.ml.error_analysis import get_recent_bias, should_retrain
+from app.ml.horizons import FORECAST_HORIZONS
+from app.ml.error_analysis import get_error_stats, needs_retrain, recent_bias
+from app.ml.model_cache import create_model_cache
+from app.ml.model_fitting import ModelFitter
+from app.ml.model_store import ModelArtifact, ModelStore
+
+# Module-level cache: {hospital_id: ModelArtifact}. One fit serves every horizon.
+_model_cache = create_model_cache()
+
+
+def _cached_artifact(hospital_id: int, watermark, store: Optional[ModelStore]) -> Optional[ModelArtifact]:
+    """A reusable artifact from memory, else from the store (loaded lazily, per hospital)."""
+    artifact = _model_cache.get(hospital_id)
+    max_age = store.max_age if store is not None else timedelta(hours=settings.model_max_age_hours)
+    if artifact is not None:
+        if artifact.is_fresh(watermark, max_age):
+            return artifact
+        _model_cache.invalidate(hospital_id)
+    if store is not None:
+        artifact = store.load(hospital_id, watermark)
+        if artifact is not None:
+            _model_cache.put(hospital_id, artifact)
+            return artifact
+    return None
+
+def train_and_forecast_multi(
+    db: Session,
+    horizons: Sequence[int] = FORECAST_HORIZONS,
+    fitter: Optional[ModelFitter] = None,
+    store: Optional[ModelStore] = None,
+) -> Dict[int, List[dict]]:
+    """
+    Forecast every horizon from one dataset build and one model per hospital.
 
-# Module-level cache: {(hospital_id, horizon_hours): model_fit}
-_model_cache: dict = {}
+    Each model forecasts ``max(horizons)`` steps once; horizon h takes step h.
+    Hospitals with a fresh artifact in memory or in ``store`` reuse its parameters
+    on the current series; the others are fitted and their artifacts saved.
 
-def train_and_forecast(db: Session, horizon_hours: int = 1):
-    df = build_ml_dataset(db, horizon_hours=horizon_hours)
-    predictions = []
+    Returns:
+        {horizon_hours: [prediction, ...]} with an entry for every horizon.
+    """
+    horizons = sorted(set(horizons))
+    df = build_ml_dataset(db, horizon_hours=horizons)
+    predictions = {h: [] for h in horizons}
+    error_stats = get_error_stats(db)
 
+    start = time.perf_counter()
+    hospitals = []
+    to_fit = {}
+    artifacts = {}
+    watermarks = {}
     for hospital_id in df["hospital_id"].unique():
-        hospital_id = int(hospital_id)  
+        hospital_id = int(hospital_id)
         hospital_df = (
             df[df["hospital_id"] == hospital_id]
             .sort_values("snapshot_time")
@@ -26,29 +71,42 @@ def train_and_forecast(db: Session, horizon_hours: int = 1):
         if len(hospital_df) < 10:
             continue
 
-        cache_key = (hospital_id, horizon_hours)
-        
-        # Retrain if: no cached model OR error threshold exceeded
-        if cache_key not in _model_cache or should_retrain(db, hospital_id, horizon_hours):
-            try:
-                model = ARIMA(hospital_df["pressure_score"], order=(2, 1, 2))
-                _model_cache[cache_key] = model.fit()
-                logger.info(f"Retrained model for hospital {hospital_id}")
-            except Exception as e:
-                logger.warning(f"Training failed for hospital {hospital_id}: {e}")
-                continue
+        hospitals.append((hospital_id, hospital_df))
 
-        model_fit = _model_cache[cache_key]
+        # Retrain if: no fresh model OR error threshold exceeded for any horizon
+        drift = any(needs_retrain(error_stats.get((hospital_id, h))) for h in horizons)
+        watermarks[hospital_id] = hospital_df["snapshot_time"].iloc[-1]
+        artifact = None if drift else _cached_artifact(hospital_id, watermarks[hospital_id], store)
+        if artifact is None:
+            to_fit[hospital_id] = hospital_df["pressure_score"]
+        else:
+            artifacts[hospital_id] = artifact
 
-        try:
-            forecast_series = model_fit.forecast(steps=horizon_hours)
-            forecast_value = float(forecast_series.iloc[-1])
+    if fitter is None:
+        with ModelFitter() as fitter:
+            outcomes = fitter.fit(to_fit)
+    else:
+        outcomes = fitter.fit(to_fit)
+
+    for hospital_id, outcome in outcomes.items():
+        if outcome.result is None:
+            logger.warning(f"Training failed for hospital {hospital_id}: {outcome.error}")
+            continue
+        logger.info(f"Retrained model for hospital {hospital_id} in {outcome.seconds:.2f}s")
+        artifact = ModelArtifact.from_result(outcome.result, watermarks[hospital_id])
+        _model_cache.put(hospital_id, artifact)
+        if store is not None:
+            try:
+                store.save(hospital_id, artifact)
+            except OSError as e:
+                logger.warning(f"Could not store model for hospital {hospital_id}: {e}")
 
-            # Apply bias correction from recent errors
-            bias = get_recent_bias(db, hospital_id, horizon_hours)
-            forecast_value -= bias
+    for hospital_id, hospital_df in hospitals:
+        outcome = outcomes.get(hospital_id)
+        if outcome is not None and outcome.result is None:
+            continue
 
-            risk_level = pressure_to_risk(forecast_value)
+        try:
             last_time = hospital_df["true_latest_snapshot_time"].iloc[-1]
 
             now = get_current_time()
@@ -62,15 +120,37 @@ def train_and_forecast(db: Session, horizon_hours: int = 1):
                 )
                 continue
 
-            predictions.append({
-                "hospital_id": hospital_id,
-                "predicted_pressure": forecast_value,
-                "forecast_time": last_time + timedelta(hours=horizon_hours),
-                "horizon_hours": horizon_hours,
-                "risk_level": risk_level,
-            })
+            if outcome is not None:
+                model_fit = outcome.result
+            else:
+                model_fit = artifacts[hospital_id].apply(hospital_df["pressure_score"])
+            forecast_series = model_fit.forecast(steps=horizons[-1])
+
+            for horizon_hours in horizons:
+                forecast_value = float(forecast_series.iloc[horizon_hours - 1])
+
+                # Apply bias correction from recent errors
+                bias = recent_bias(error_stats.get((hospital_id, horizon_hours)))
+                forecast_value -= bias
+
+                predictions[horizon_hours].append({
+                    "hospital_id": hospital_id,
+                    "predicted_pressure": forecast_value,
+                    "forecast_time": last_time + timedelta(hours=horizon_hours),
+                    "horizon_hours": horizon_hours,
+                    "risk_level": pressure_to_risk(forecast_value),
+                })
 
         except Exception as e:
             logger.warning(f"Inference failed for hospital {hospital_id}: {e}")
 
+    logger.info(
+        f"Forecast {len(hospitals)} hospitals in {time.perf_counter() - start:.2f}s: "
+        f"{len(artifacts)} reused stored models, {len(to_fit)} fitted; model cache {_model_cache.stats()}"
+    )
     return predictions
+
+
+def train_and_forecast(db: Session, horizon_hours: int = 1, fitter: Optional[ModelFitter] = None):
+    """Forecasts for a single horizon. See train_and_forecast_multi."""
+    return train_and_forecast_multi(db, [horizon_hours], fitter=fitter)[horizon_hours]
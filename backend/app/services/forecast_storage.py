@@ -1,6 +1,8 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
-from app.db.models import Forecast
+from app.db.models import Forecast, LatestForecast
+from app.services.forecast_rollups import add_forecast_rollups
 from datetime import datetime
 import pandas as pd
 from app.utils.time import get_current_time, delta_hours
@@ -12,12 +14,14 @@ from datetime import timezone
 def save_forecasts(db: Session, predictions: list, horizon_hours: int = 1):
     """
     Save ML forecast results into the database.
-    Skips forecasts that already exist (same hospital, time, horizon).
+    Skips forecasts that already exist (same hospital, time, horizon) and
+    refreshes the latest_forecasts and hourly rollup tables read by the API.
     """
     now = get_current_time()
     max_reasonable_future = now + delta_hours(horizon_hours + 2)
 
-
+    latest = {}
+    inserted = []
 
     for p in predictions:
 
@@ -34,22 +38,55 @@ def save_forecasts(db: Session, predictions: list, horizon_hours: int = 1):
             )
             continue
 
+        row = {
+            "hospital_id": int(to_python(p["hospital_id"])),
+            "predicted_pressure": to_python(p["predicted_pressure"]),
+            "forecast_time": forecast_time,
+            "horizon_hours": int(to_python(p["horizon_hours"])),
+            "risk_level": to_python(p["risk_level"]),
+        }
+
         stmt = (
             insert(Forecast)
-            .values(
-                hospital_id=int(to_python(p["hospital_id"])),
-                predicted_pressure=to_python(p["predicted_pressure"]),
-                forecast_time=forecast_time,
-                horizon_hours=int(to_python(p["horizon_hours"])),
-                risk_level=to_python(p["risk_level"]),
+            .values(**row)
+            .on_conflict_do_nothing(
+                index_elements=["hospital_id", "forecast_time", "horizon_hours"]
             )
-            .on_conflict_do_nothing(constraint="uq_forecast_unique")
+            .returning(Forecast.id)
         )
-        db.execute(stmt)
+        if db.execute(stmt).first() is not None:
+            inserted.append(row)
+
+        key = (row["hospital_id"], row["horizon_hours"])
+        if key not in latest or latest[key]["forecast_time"] < forecast_time:
+            latest[key] = row
+
+    if latest:
+        upsert_latest_forecasts(db, list(latest.values()))
+    add_forecast_rollups(db, inserted)
 
     db.commit()
 
 
+def upsert_latest_forecasts(db: Session, rows: list):
+    """
+    Upsert one row per (hospital_id, horizon_hours) into latest_forecasts.
+    An existing row is only replaced by a forecast that is at least as recent.
+    """
+    stmt = insert(LatestForecast).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LatestForecast.hospital_id, LatestForecast.horizon_hours],
+        set_={
+            "predicted_pressure": stmt.excluded.predicted_pressure,
+            "risk_level": stmt.excluded.risk_level,
+            "forecast_time": stmt.excluded.forecast_time,
+            "updated_at": func.now(),
+        },
+        where=LatestForecast.forecast_time <= stmt.excluded.forecast_time,
+    )
+    db.execute(stmt)
+
+
 def to_python(value):
     """Convert numpy / pandas types to native Python types."""
     if value is None:
@@ -0,0 +1,188 @@
+"""
+Two-tier cache for geocoding results.
+
+Forward queries are normalized and reverse coordinates are rounded to
+``geocode_reverse_precision`` decimal places, so repeated addresses and nearby GPS
+fixes share one entry. Lookups check an in-process LRU first, then the
+``geocode_cache`` table (so hits survive restarts), and only then call Nominatim.
+Forward lookups try the offline index in app/services/local_geocoder.py before all of these.
+"""
+import json
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.models import GeocodeCacheEntry
+from app.services.geocoding import forward_geocode, reverse_geocode
+from app.services.local_geocoder import get_local_geocoder
+
+FORWARD = "forward"
+REVERSE = "reverse"
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe LRU map whose entries expire at a given wall-clock time."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the value for ``key``, or ``_MISSING`` if absent or expired."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return _MISSING
+            value, expires_at = item
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_memory = LRUCache(settings.geocode_cache_max_entries)
+_counters = {FORWARD: Counter(), REVERSE: Counter()}
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share a key."""
+    return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+
+
+def quantize_coordinates(lat: float, lng: float) -> Tuple[float, float]:
+    """Round coordinates to ``geocode_reverse_precision`` decimal places."""
+    precision = settings.geocode_reverse_precision
+    # Adding 0.0 turns -0.0 into 0.0 so both round to the same key
+    return round(lat, precision) + 0.0, round(lng, precision) + 0.0
+
+
+def _reverse_key(lat: float, lng: float) -> str:
+    precision = settings.geocode_reverse_precision
+    return f"{lat:.{precision}f},{lng:.{precision}f}"
+
+
+async def _load(db: AsyncSession, kind: str, key: str):
+    row = await db.get(GeocodeCacheEntry, (kind, key))
+    if row is None:
+        return _MISSING, None
+    fetched_at = row.fetched_at
+    if fetched_at.tzinfo is None:  # SQLite returns naive datetimes
+        fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+    expires_at = fetched_at.timestamp() + settings.geocode_cache_ttl_seconds
+    if time.time() >= expires_at:
+        return _MISSING, None
+    value = json.loads(row.payload) if row.payload is not None else None
+    return value, expires_at
+
+
+async def _store(db: AsyncSession, kind: str, key: str, value) -> None:
+    payload = json.dumps(value, ensure_ascii=False) if value is not None else None
+    stmt = insert(GeocodeCacheEntry).values(
+        kind=kind, key=key, payload=payload, fetched_at=datetime.now(timezone.utc),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["kind", "key"],
+        set_={"payload": stmt.excluded.payload, "fetched_at": stmt.excluded.fetched_at},
+    )
+    try:
+        await db.execute(stmt)
+        await db.commit()
+    except SQLAlchemyError as e:
+        # The result is still cached in memory; losing the persisted copy is not fatal
+        await db.rollback()
+        logger.warning(f"Could not persist geocode cache entry {kind}:{key}: {e}")
+
+
+async def _cached(db: AsyncSession, kind: str, key: str, fetch: Callable[[], Awaitable]):
+    counters = _counters[kind]
+
+    value = _memory.get((kind, key))
+    if value is not _MISSING:
+        counters["memory_hits"] += 1
+        return value
+
+    value, expires_at = await _load(db, kind, key)
+    if value is not _MISSING:
+        counters["store_hits"] += 1
+        _memory.put((kind, key), value, expires_at)
+        return value
+
+    counters["misses"] += 1
+    value = await fetch()
+    _memory.put((kind, key), value, time.time() + settings.geocode_cache_ttl_seconds)
+    await _store(db, kind, key, value)
+    return value
+
+
+async def cached_forward_geocode(db: AsyncSession, query: str) -> Optional[dict]:
+    """
+    Resolve ``query`` from the offline index, or ``forward_geocode`` through both
+    cache tiers on a local miss. "Not found" results are cached too.
+    """
+    local = get_local_geocoder()
+    if local is not None:
+        result = local.forward(query)
+        if result is not None:
+            _counters[FORWARD]["local_hits"] += 1
+            return result
+
+    query = normalize_query(query)
+    return await _cached(db, FORWARD, query, lambda: forward_geocode(query))
+
+
+async def cached_reverse_geocode(db: AsyncSession, lat: float, lng: float) -> Optional[str]:
+    """``reverse_geocode`` of the quantized coordinates through both cache tiers."""
+    lat, lng = quantize_coordinates(lat, lng)
+    return await _cached(db, REVERSE, _reverse_key(lat, lng), lambda: reverse_geocode(lat, lng))
+
+
+def geocode_cache_stats() -> dict:
+    """Hit/miss counters per lookup kind, for tuning cache size and precision."""
+    stats = {}
+    for kind, counters in _counters.items():
+        hits = counters["local_hits"] + counters["memory_hits"] + counters["store_hits"]
+        total = hits + counters["misses"]
+        stats[kind] = {
+            "local_hits": counters["local_hits"],
+            "memory_hits": counters["memory_hits"],
+            "store_hits": counters["store_hits"],
+            "misses": counters["misses"],
+            "hit_rate": round(hits / total, 4) if total else None,
+        }
+    stats["memory_entries"] = len(_memory)
+    stats["memory_max_entries"] = _memory.max_entries
+    return stats
+
+
+def clear_geocode_cache() -> None:
+    """Empty the in-process tier and reset the counters. The persisted tier is kept."""
+    _memory.clear()
+    for counters in _counters.values():
+        counters.clear()
@@ -1,9 +1,23 @@
 """
 Geocoding service — wraps Nominatim forward and reverse geocoding.
 Isolates the third-party dependency so swapping providers only requires changes here.
+
+All lookups go through one long-lived ``httpx.AsyncClient`` so connections to
+Nominatim are kept alive and reused instead of paying a TCP/TLS handshake per call.
+The client is opened and closed by the application lifespan.
+
+Nominatim allows about one request per second. Concurrent identical lookups share a
+single in-flight request, and every upstream call waits for a token from
+``scheduler``, which queues callers by priority instead of letting them be throttled.
 """
+import asyncio
+import heapq
+import itertools
+import time
 import httpx
-from typing import Optional
+from typing import Awaitable, Callable, Hashable, Optional
+
+from app.core.config import settings
 
 NOMINATIM_BASE = "https://nominatim.openstreetmap.org"
 HEADERS = {
@@ -11,32 +25,188 @@ HEADERS = {
     "Accept-Language": "en",
 }
 
+# Lower values are served first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+class GeocodingUnavailable(Exception):
+    """No upstream slot became available before the queue timeout."""
 
-async def forward_geocode(query: str) -> Optional[dict]:
+
+class UpstreamScheduler:
+    """
+    Async token bucket that hands out upstream slots in priority order.
+
+    Tokens refill at ``rate`` per second up to ``burst``. Callers that find the bucket
+    empty wait in a priority queue (FIFO within a priority) and give up after their
+    timeout without consuming a token.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: list = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _dispatch(self) -> None:
+        self._timer = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():  # timed out or cancelled while queued
+                continue
+            self._tokens -= 1
+            waiter.set_result(None)
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        if self._waiters:
+            delay = (1 - self._tokens) / self.rate
+            self._timer_loop = asyncio.get_running_loop()
+            self._timer = self._timer_loop.call_later(delay, self._dispatch)
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None) -> None:
+        """
+        Wait for an upstream slot.
+
+        Raises:
+            GeocodingUnavailable: if no slot was granted within ``timeout`` seconds.
+        """
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        # A timer left behind by a closed event loop (e.g. between test runs) never fires
+        if self._timer is None or self._timer_loop is not loop:
+            self._dispatch()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            raise GeocodingUnavailable("Timed out waiting for a geocoding slot") from None
+
+    def pause(self, seconds: float) -> None:
+        """Withhold tokens for ``seconds``, e.g. after upstream answered 429."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+scheduler = UpstreamScheduler(settings.geocoding_rate_per_second, settings.geocoding_burst)
+_inflight: dict = {}
+
+
+def create_client(base_url: str = NOMINATIM_BASE, **kwargs) -> httpx.AsyncClient:
+    """Build a pooled client configured from settings. Extra kwargs go to ``httpx.AsyncClient``."""
+    kwargs.setdefault("timeout", httpx.Timeout(
+        settings.geocoding_timeout_seconds,
+        connect=settings.geocoding_connect_timeout_seconds,
+    ))
+    kwargs.setdefault("limits", httpx.Limits(
+        max_connections=settings.geocoding_max_connections,
+        max_keepalive_connections=settings.geocoding_max_keepalive_connections,
+        keepalive_expiry=settings.geocoding_keepalive_expiry_seconds,
+    ))
+    return httpx.AsyncClient(base_url=base_url, headers=HEADERS, **kwargs)
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it if the lifespan has not opened one."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_client()
+    return _client
+
+
+def open_client(client: Optional[httpx.AsyncClient] = None) -> httpx.AsyncClient:
+    """Install ``client`` (or a new default one) as the shared client."""
+    global _client
+    _client = client or create_client()
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client and release its pooled connections."""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+
+
+def _retry_after(response: httpx.Response) -> float:
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):  # missing, or an HTTP date
+        return 1.0 / scheduler.rate
+
+
+async def _get(path: str, params: dict, priority: int):
+    """GET ``path`` once a slot is free, re-queuing when upstream answers 429."""
+    deadline = time.monotonic() + settings.geocoding_queue_timeout_seconds
+    while True:
+        await scheduler.acquire(priority, timeout=max(0.0, deadline - time.monotonic()))
+        response = await get_client().get(path, params=params)
+        if response.status_code != 429:
+            response.raise_for_status()
+            return response.json()
+        scheduler.pause(_retry_after(response))
+
+
+async def _single_flight(key: Hashable, fetch: Callable[[], Awaitable]):
+    """Run ``fetch`` once for concurrent callers with the same ``key`` and share its result."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+
+        def done(t):
+            if _inflight.get(key) is t:
+                del _inflight[key]
+            if not t.cancelled():
+                t.exception()  # retrieved by the callers; avoids warnings if they all left
+
+        task.add_done_callback(done)
+    # One caller disconnecting must not cancel the request the others are waiting on
+    return await asyncio.shield(task)
+
+
+async def forward_geocode(query: str, priority: int = PRIORITY_NORMAL) -> Optional[dict]:
     """
     Convert an address string to coordinates.
 
     Args:
         query: Human-readable address string.
+        priority: Queue priority of the upstream call.
 
     Returns:
         dict with keys: lat (float), lng (float), display_name (str)
         or None if no result was found.
+
+    Raises:
+        GeocodingUnavailable: if the upstream queue timed out.
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{NOMINATIM_BASE}/search",
-            params={
-                "q": query,
-                "format": "json",
-                "limit": 1,
-                "countrycodes": "ca",  
-            },
-            headers=HEADERS,
-            timeout=8.0,
-        )
-        response.raise_for_status()
-        data = response.json()
+    params = {
+        "q": query,
+        "format": "json",
+        "limit": 1,
+        "countrycodes": "ca",
+    }
+    data = await _single_flight(
+        ("/search", query), lambda: _get("/search", params, priority)
+    )
 
     if not data:
         return None
@@ -48,29 +218,31 @@ async def forward_geocode(query: str) -> Optional[dict]:
     }
 
 
-async def reverse_geocode(lat: float, lng: float) -> Optional[str]:
+async def reverse_geocode(lat: float, lng: float, priority: int = PRIORITY_HIGH) -> Optional[str]:
     """
     Convert coordinates to a human-readable address.
 
+    Reverse lookups default to high priority: they are one-off "use my location"
+    requests, while forward lookups fire as the user types and are often superseded.
+
     Args:
         lat: Latitude.
         lng: Longitude.
+        priority: Queue priority of the upstream call.
 
     Returns:
         display_name string, or None if reverse geocoding failed.
+
+    Raises:
+        GeocodingUnavailable: if the upstream queue timed out.
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{NOMINATIM_BASE}/reverse",
-            params={
-                "lat": lat,
-                "lon": lng,
-                "format": "json",
-            },
-            headers=HEADERS,
-            timeout=8.0,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-    return data.get("display_name")
\ No newline at end of file
+    params = {
+        "lat": lat,
+        "lon": lng,
+        "format": "json",
+    }
+    data = await _single_flight(
+        ("/reverse", lat, lng), lambda: _get("/reverse", params, priority)
+    )
+
+    return data.get("display_name")
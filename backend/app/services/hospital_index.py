@@ -0,0 +1,151 @@
+"""
+In-memory spatial index of active hospitals.
+
+Hospital coordinates are projected onto the unit sphere and stored in a KD-tree,
+so radius and k-nearest queries run in sub-linear time without touching the
+hospitals table on the request path.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.models import Hospital
+from app.services.routing import EARTH_RADIUS_KM, CoordinateSet
+
+
+@dataclass(frozen=True)
+class IndexedHospital:
+    """Hospital fields needed to answer recommendation queries."""
+
+    id: int
+    name: str
+    latitude: float
+    longitude: float
+
+
+def _to_unit_vectors(lats, lons) -> np.ndarray:
+    """Convert latitudes/longitudes in degrees to 3D unit vectors."""
+    phi = np.radians(np.asarray(lats, dtype=float))
+    lam = np.radians(np.asarray(lons, dtype=float))
+    cos_phi = np.cos(phi)
+    return np.column_stack((cos_phi * np.cos(lam), cos_phi * np.sin(lam), np.sin(phi)))
+
+
+def _km_to_chord(distance_km: float) -> float:
+    """Straight-line distance on the unit sphere for a great-circle distance."""
+    angle = min(distance_km / EARTH_RADIUS_KM, np.pi)
+    return 2.0 * np.sin(angle / 2.0)
+
+
+class HospitalIndex:
+    """KD-tree over hospital unit vectors answering radius and k-nearest queries."""
+
+    def __init__(self, hospitals: List[IndexedHospital]):
+        self.hospitals = hospitals
+        self.built_at = time.monotonic()
+        self.coordinates = CoordinateSet(
+            [h.latitude for h in hospitals],
+            [h.longitude for h in hospitals],
+        )
+        self._tree = (
+            cKDTree(_to_unit_vectors(self.coordinates.latitudes, self.coordinates.longitudes))
+            if hospitals else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.hospitals)
+
+    def _with_distances(self, lat: float, lon: float, positions) -> List[Tuple[IndexedHospital, float]]:
+        positions = np.asarray(positions, dtype=int)
+        distances = self.coordinates.distances_from(lat, lon, indices=positions)
+        order = np.argsort(distances, kind="stable")
+        return [(self.hospitals[positions[i]], float(distances[i])) for i in order]
+
+    def within(self, lat: float, lon: float, radius_km: float) -> List[Tuple[IndexedHospital, float]]:
+        """
+        Hospitals within ``radius_km`` of a point.
+
+        Returns:
+            list of (IndexedHospital, distance_km) sorted by distance.
+        """
+        if self._tree is None or radius_km < 0:
+            return []
+        point = _to_unit_vectors([lat], [lon])[0]
+        positions = self._tree.query_ball_point(point, _km_to_chord(radius_km))
+        matches = self._with_distances(lat, lon, positions)
+        # The chord radius is exact in theory; filter on haversine to stay consistent with it
+        return [(h, d) for h, d in matches if d <= radius_km]
+
+    def nearest(self, lat: float, lon: float, k: int) -> List[Tuple[IndexedHospital, float]]:
+        """
+        The ``k`` hospitals closest to a point.
+
+        Returns:
+            list of (IndexedHospital, distance_km) sorted by distance.
+        """
+        if self._tree is None or k <= 0:
+            return []
+        k = min(k, len(self.hospitals))
+        point = _to_unit_vectors([lat], [lon])[0]
+        _, positions = self._tree.query(point, k=k)
+        return self._with_distances(lat, lon, np.atleast_1d(positions))
+
+
+_index: Optional[HospitalIndex] = None
+_lock = threading.Lock()
+
+
+def build_hospital_index(db: Session) -> HospitalIndex:
+    """Load active hospitals with known coordinates and index them."""
+    rows = (
+        db.query(Hospital.id, Hospital.name, Hospital.latitude, Hospital.longitude)
+        .filter(
+            Hospital.latitude != 0,
+            Hospital.longitude != 0,
+            Hospital.is_active == True,
+        )
+        .order_by(Hospital.id)
+        .all()
+    )
+    return HospitalIndex([
+        IndexedHospital(id=r.id, name=r.name, latitude=r.latitude, longitude=r.longitude)
+        for r in rows
+    ])
+
+
+def refresh_hospital_index(db: Session) -> HospitalIndex:
+    """Rebuild the process-level index. Called after hospital data changes."""
+    global _index
+    index = build_hospital_index(db)
+    with _lock:
+        _index = index
+    logger.info(f"Hospital spatial index rebuilt with {len(index)} hospitals")
+    return index
+
+
+async def get_hospital_index(db: AsyncSession) -> HospitalIndex:
+    """
+    Return the process-level index, building it on first use.
+
+    The index is also rebuilt once it is older than ``hospital_index_ttl_seconds`` so
+    an API process picks up changes made by jobs running in another process.
+    """
+    index = _index
+    if index is None or time.monotonic() - index.built_at > settings.hospital_index_ttl_seconds:
+        index = await db.run_sync(refresh_hospital_index)
+    return index
+
+
+def invalidate_hospital_index() -> None:
+    """Drop the process-level index so the next lookup rebuilds it."""
+    global _index
+    with _lock:
+        _index = None
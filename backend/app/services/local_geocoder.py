@@ -0,0 +1,219 @@
+"""
+Offline geocoder for Quebec postal codes and place names.
+
+The index is built once from a CSV of postal-code (FSA/LDU) centroids and place
+names into a directory of ``.npy`` arrays: sorted normalized keys, coordinates, and
+UTF-8 display names with their offsets. At runtime the arrays are memory-mapped, and
+exact and prefix lookups are binary searches over the sorted keys, so forward
+geocoding of known addresses never leaves the process.
+
+Build an index with:
+
+    python -m app.services.local_geocoder build quebec_places.csv data/local_geocoder
+
+The CSV needs ``name``, ``latitude`` and ``longitude`` columns and may add a
+``display_name`` column; ``name`` is used when it is missing.
+"""
+import argparse
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.core.logging import logger
+
+KEYS_FILE = "keys.npy"
+COORDS_FILE = "coords.npy"
+NAMES_FILE = "names.npy"
+NAME_OFFSETS_FILE = "name_offsets.npy"
+
+# An FSA ("h3z"), optionally followed by part or all of an LDU ("h3z 2", "h3z2y7")
+POSTAL_CODE = re.compile(r"^[a-z]\d[a-z](?: ?\d(?:[a-z]\d?)?)?$")
+
+
+def normalize_key(text: str) -> str:
+    """
+    Lookup key for a place name or postal code.
+
+    Accents, case and punctuation are dropped ("Saint-Jérôme" -> "saint jerome") and
+    postal codes lose their inner space ("H3Z 2Y7" -> "h3z2y7").
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = " ".join(re.sub(r"[\W_]+", " ", text).split())
+    if POSTAL_CODE.match(text):
+        text = text.replace(" ", "")
+    return text
+
+
+def _format_postal_code(key: str) -> str:
+    key = key.upper()
+    return f"{key[:3]} {key[3:]}" if len(key) > 3 else key
+
+
+def build_index(csv_path: Union[str, Path], directory: Union[str, Path]) -> int:
+    """
+    Build the memory-mappable index from a CSV.
+
+    Rows without valid coordinates are dropped; when several rows normalize to the
+    same key the first one wins.
+
+    Returns:
+        number of indexed entries.
+    """
+    df = pd.read_csv(csv_path, dtype={"name": str, "display_name": str})
+    if "display_name" not in df.columns:
+        df["display_name"] = df["name"]
+    df["display_name"] = df["display_name"].fillna(df["name"])
+
+    df["latitude"] = pd.to_numeric(df["latitude"], errors="coerce")
+    df["longitude"] = pd.to_numeric(df["longitude"], errors="coerce")
+    df = df.dropna(subset=["name", "latitude", "longitude"])
+
+    df["key"] = df["name"].map(normalize_key)
+    df = df[df["key"] != ""]
+    duplicates = int(df["key"].duplicated().sum())
+    df = df.drop_duplicates("key").sort_values("key", kind="stable")
+
+    names = [n.encode("utf-8") for n in df["display_name"]]
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    np.cumsum([len(n) for n in names], out=offsets[1:])
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / KEYS_FILE, np.array([k.encode("utf-8") for k in df["key"]], dtype=bytes))
+    np.save(directory / COORDS_FILE, df[["latitude", "longitude"]].to_numpy(dtype=np.float64))
+    np.save(directory / NAMES_FILE, np.frombuffer(b"".join(names), dtype=np.uint8))
+    np.save(directory / NAME_OFFSETS_FILE, offsets)
+
+    logger.info(f"Local geocoder index built with {len(df)} entries ({duplicates} duplicate keys dropped)")
+    return len(df)
+
+
+class LocalGeocoder:
+    """Exact and prefix lookups over a memory-mapped index built by ``build_index``."""
+
+    def __init__(self, directory: Union[str, Path]):
+        directory = Path(directory)
+        self.keys = np.load(directory / KEYS_FILE, mmap_mode="r")
+        self.coords = np.load(directory / COORDS_FILE, mmap_mode="r")
+        self.names = np.load(directory / NAMES_FILE, mmap_mode="r")
+        self.name_offsets = np.load(directory / NAME_OFFSETS_FILE, mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _entry(self, i: int) -> dict:
+        start, end = self.name_offsets[i], self.name_offsets[i + 1]
+        return {
+            "lat": float(self.coords[i, 0]),
+            "lng": float(self.coords[i, 1]),
+            "display_name": bytes(self.names[start:end]).decode("utf-8"),
+        }
+
+    def _searchable(self, key: bytes) -> bool:
+        # A key wider than the array's itemsize can match nothing, and searching for it
+        # would make numpy copy the whole array to a wider dtype
+        return 0 < len(key) <= self.keys.dtype.itemsize
+
+    def _prefix_range(self, key: bytes):
+        if not self._searchable(key):
+            return 0, 0
+        lo = int(np.searchsorted(self.keys, key, side="left"))
+        # UTF-8 never contains 0xff, so bumping the last byte gives a bound just past
+        # every continuation of the prefix without widening it
+        hi = int(np.searchsorted(self.keys, key[:-1] + bytes([key[-1] + 1]), side="left"))
+        return lo, hi
+
+    def lookup(self, query: str) -> Optional[dict]:
+        """Exact match of the normalized query, or None."""
+        key = normalize_key(query).encode("utf-8")
+        if not self._searchable(key):
+            return None
+        i = int(np.searchsorted(self.keys, key))
+        if i < len(self.keys) and self.keys[i] == key:
+            return self._entry(i)
+        return None
+
+    def complete(self, query: str, limit: int = 10) -> List[dict]:
+        """Entries whose key starts with the normalized query, in key order."""
+        lo, hi = self._prefix_range(normalize_key(query).encode("utf-8"))
+        return [self._entry(i) for i in range(lo, min(hi, lo + limit))]
+
+    def forward(self, query: str) -> Optional[dict]:
+        """
+        Resolve a forward geocoding query locally.
+
+        Exact matches are returned as-is. A partial postal code ("H3Z 2") resolves to
+        the centroid of the postal codes it prefixes. Anything else is a miss.
+        """
+        result = self.lookup(query)
+        if result is not None:
+            return result
+
+        key = normalize_key(query)
+        if not POSTAL_CODE.match(key):
+            return None
+        lo, hi = self._prefix_range(key.encode("utf-8"))
+        if lo == hi:
+            return None
+        lat, lng = np.asarray(self.coords[lo:hi]).mean(axis=0)
+        return {"lat": float(lat), "lng": float(lng), "display_name": _format_postal_code(key)}
+
+
+_local: Optional[LocalGeocoder] = None
+_loaded = False
+_lock = threading.Lock()
+
+
+def open_local_geocoder(directory: Union[str, Path]) -> LocalGeocoder:
+    """Load the index in ``directory`` and use it for subsequent lookups."""
+    global _local, _loaded
+    geocoder = LocalGeocoder(directory)
+    with _lock:
+        _local, _loaded = geocoder, True
+    logger.info(f"Local geocoder loaded with {len(geocoder)} entries from {directory}")
+    return geocoder
+
+
+def get_local_geocoder() -> Optional[LocalGeocoder]:
+    """
+    Return the process-level geocoder, loading ``local_geocoder_path`` on first use.
+
+    Returns None when no index is configured or it cannot be loaded; callers then
+    fall back to Nominatim.
+    """
+    global _loaded
+    if _loaded or not settings.local_geocoder_path:
+        return _local
+    try:
+        return open_local_geocoder(settings.local_geocoder_path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Local geocoder unavailable at {settings.local_geocoder_path}: {e}")
+        with _lock:
+            _loaded = True
+        return None
+
+
+def close_local_geocoder() -> None:
+    """Forget the loaded index; the next lookup reloads it from settings."""
+    global _local, _loaded
+    with _lock:
+        _local, _loaded = None, False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline geocoder index tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build an index from a CSV")
+    build.add_argument("csv_path")
+    build.add_argument("directory")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_index(args.csv_path, args.directory)
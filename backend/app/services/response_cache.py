@@ -0,0 +1,107 @@
+"""
+In-process cache of pre-serialized API responses.
+
+Entries are keyed by endpoint and horizon and dropped when the forecasting job
+completes. Each entry carries a strong ETag so polling clients revalidating with
+``If-None-Match`` get a 304 without any database access.
+
+Each invalidation bumps a generation counter. A response built from a read that
+started before the latest invalidation is returned but not stored, so a request
+racing the forecasting job cannot put superseded data back in the cache.
+"""
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A serialized JSON body and its strong ETag."""
+
+    body: bytes
+    etag: str
+    created_at: float
+
+
+_cache: dict = {}
+_generation = 0
+_lock = threading.Lock()
+
+
+def cache_generation() -> int:
+    """Current generation; read it before querying the data a response is built from."""
+    return _generation
+
+
+def get_cached_response(key: Hashable) -> Optional[CachedResponse]:
+    """
+    Return the cached response for ``key``.
+
+    Entries older than ``response_cache_ttl_seconds`` are treated as missing, so an
+    API process still refreshes when the forecasting job runs in another process.
+    """
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() - entry.created_at > settings.response_cache_ttl_seconds:
+        with _lock:
+            if _cache.get(key) is entry:
+                del _cache[key]
+        return None
+    return entry
+
+
+def cache_response(key: Hashable, payload, generation: int) -> CachedResponse:
+    """
+    Serialize ``payload`` once and store it under ``key``.
+
+    The entry is not stored if the cache was invalidated since ``generation`` was
+    read with cache_generation().
+    """
+    body = json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    entry = CachedResponse(
+        body=body,
+        etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+        created_at=time.monotonic(),
+    )
+    with _lock:
+        if generation == _generation:
+            _cache[key] = entry
+    return entry
+
+
+def invalidate_response_cache() -> None:
+    """Drop every cached response. Called when new forecasts are saved."""
+    global _generation
+    with _lock:
+        _generation += 1
+        _cache.clear()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # If-None-Match uses the weak comparison function
+    return "*" in candidates or etag in (c.removeprefix("W/") for c in candidates)
+
+
+def cached_json_response(request: Request, entry: CachedResponse) -> Response:
+    """Return ``entry`` as a JSON response, or a 304 if the client already has it."""
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={settings.response_cache_max_age_seconds}, must-revalidate",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -2,8 +2,11 @@
 Routing service for calculating distances and travel times.
 """
 import math
-from typing import Dict, List, Tuple
-from app.core.logging import logger
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
 
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -11,7 +14,7 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Calculate the great circle distance in kilometers between two points 
     on the Earth specified in decimal degrees using the Haversine formula.
     """
-    R = 6371.0  # Earth radius in kilometers
+    R = EARTH_RADIUS_KM  # Earth radius in kilometers
 
     phi1 = math.radians(lat1)
     phi2 = math.radians(lat2)
@@ -22,3 +25,67 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))  
     distance = R * c
     return distance
+
+
+class CoordinateSet:
+    """
+    A fixed set of points (typically hospitals) with radians and cosines
+    precomputed, so repeated batch distance queries only pay for the origin side.
+    """
+
+    def __init__(self, latitudes: Sequence[float], longitudes: Sequence[float]):
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self._phi = np.radians(self.latitudes)
+        self._lam = np.radians(self.longitudes)
+        self._cos_phi = np.cos(self._phi)
+
+    def __len__(self) -> int:
+        return len(self.latitudes)
+
+    def distances_from(
+        self,
+        lat: Union[float, Sequence[float]],
+        lon: Union[float, Sequence[float]],
+        indices: Optional[Sequence[int]] = None,
+    ) -> np.ndarray:
+        """
+        Haversine distances in kilometers from one or many origins to the set.
+
+        Args:
+            lat: Origin latitude, or an array of M origin latitudes.
+            lon: Origin longitude, or an array of M origin longitudes.
+            indices: Optional positions restricting the computation to a subset.
+
+        Returns:
+            np.ndarray: shape (N,) for a single origin, (M, N) for M origins.
+        """
+        phi, lam, cos_phi = self._phi, self._lam, self._cos_phi
+        if indices is not None:
+            indices = np.asarray(indices, dtype=int)
+            phi, lam, cos_phi = phi[indices], lam[indices], cos_phi[indices]
+
+        origin_phi = np.radians(np.asarray(lat, dtype=float))
+        origin_lam = np.radians(np.asarray(lon, dtype=float))
+        if origin_phi.ndim:
+            origin_phi = origin_phi[:, np.newaxis]
+            origin_lam = origin_lam[:, np.newaxis]
+
+        a = (
+            np.sin((phi - origin_phi) / 2) ** 2
+            + np.cos(origin_phi) * cos_phi * np.sin((lam - origin_lam) / 2) ** 2
+        )
+        return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def haversine_distances(
+    lat: Union[float, Sequence[float]],
+    lon: Union[float, Sequence[float]],
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+) -> np.ndarray:
+    """
+    Vectorized Haversine distances in kilometers from one or many origins to an
+    array of destinations. Prefer a cached CoordinateSet for repeated queries.
+    """
+    return CoordinateSet(latitudes, longitudes).distances_from(lat, lon)
@@ -0,0 +1,5 @@
+"""
+Micro-benchmarks for performance-sensitive code paths.
+
+Run from the backend directory, e.g. ``python -m benchmarks.bench_haversine``.
+"""
@@ -0,0 +1,110 @@
+"""
+Event-loop latency while API requests run database queries in parallel.
+
+Compares an ``async def`` route that runs its query through the synchronous
+session (the old router pattern) with one using the async session. A probe
+coroutine measures how late the loop wakes it up while the requests are in flight.
+
+    python -m benchmarks.bench_event_loop
+"""
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.async_session import to_async_url
+
+CONCURRENCY = 20
+PROBE_INTERVAL = 0.005
+# A CPU-bound query that takes tens of milliseconds on SQLite
+SLOW_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 200000) "
+    "SELECT count(*) FROM c"
+)
+
+
+def build_app(database_url: str) -> FastAPI:
+    # Pools sized for the burst so neither variant waits on a connection checkout
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False},
+        pool_size=CONCURRENCY + 1,
+    )
+    SessionLocal = sessionmaker(bind=engine)
+    async_engine = create_async_engine(to_async_url(database_url), pool_size=CONCURRENCY + 1)
+    AsyncSessionLocal = async_sessionmaker(async_engine)
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/sync")
+    async def sync_route(db: Session = Depends(get_db)):
+        return {"count": db.execute(SLOW_QUERY).scalar()}
+
+    @app.get("/async")
+    async def async_route(db: AsyncSession = Depends(get_async_db)):
+        return {"count": (await db.execute(SLOW_QUERY)).scalar()}
+
+    return app
+
+
+async def measure(app: FastAPI, path: str) -> dict:
+    lags = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL)
+            lags.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)  # warm up connections
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(client.get(path) for _ in range(CONCURRENCY)))
+        wall = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    lags.sort()
+    return {
+        "wall_s": wall,
+        "p50_ms": statistics.median(lags),
+        "p95_ms": lags[int(len(lags) * 0.95) - 1] if len(lags) > 1 else lags[-1],
+        "max_ms": lags[-1],
+    }
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        print(f"{CONCURRENCY} concurrent requests, event-loop lag of a {PROBE_INTERVAL * 1000:.0f} ms probe")
+        print(f"{'session':>8} {'wall (s)':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9}")
+        for label, path in (("sync", "/sync"), ("async", "/async")):
+            r = await measure(app, path)
+            print(f"{label:>8} {r['wall_s']:>9.2f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['max_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+Per-request latency of a client per lookup (the old pattern) vs. the shared pooled client.
+
+Runs against a local stub HTTP server, so the gap shown is the TCP connect and client
+setup cost alone; against Nominatim every new connection also pays a TLS handshake.
+
+    python -m benchmarks.bench_geocoding_client
+"""
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
+import httpx
+
+from app.services import geocoding
+
+REQUESTS = 500
+BODY = json.dumps([{"lat": "45.5", "lon": "-73.6", "display_name": "Montréal"}]).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # Headers and body are written separately; without this, Nagle's algorithm and
+    # delayed ACKs add ~40 ms to every response on a reused connection
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+async def per_call_client(base_url: str):
+    async with httpx.AsyncClient() as client:
+        response = await client.get(
+            f"{base_url}/search",
+            params={"q": "montreal", "format": "json", "limit": 1, "countrycodes": "ca"},
+            headers=geocoding.HEADERS,
+            timeout=8.0,
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+async def measure(call) -> list:
+    timings = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name: str, timings: list):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95)]
+    print(f"{name:<18} mean {statistics.mean(timings):7.3f} ms   p50 {statistics.median(timings):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+async def run(base_url: str):
+    old = await measure(lambda: per_call_client(base_url))
+
+    # The stub has no rate limit; don't let Nominatim's one request per second pace the run
+    geocoding.scheduler = geocoding.UpstreamScheduler(rate=1e9, burst=1)
+    geocoding.open_client(geocoding.create_client(base_url=base_url))
+    try:
+        shared = await measure(lambda: geocoding.forward_geocode("montreal"))
+    finally:
+        await geocoding.close_client()
+
+    print(f"{REQUESTS} sequential forward lookups against a local stub server")
+    report("client per call", old)
+    report("shared client", shared)
+    print(f"speedup: {statistics.mean(old) / statistics.mean(shared):.1f}x")
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        asyncio.run(run(f"http://127.0.0.1:{server.server_port}"))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Scalar haversine loop vs. the vectorized CoordinateSet for one origin.
+
+    python -m benchmarks.bench_haversine
+"""
+import timeit
+
+import numpy as np
+
+from app.services.routing import CoordinateSet, haversine_distance
+
+SIZES = [100, 1_000, 10_000]
+ORIGIN = (45.5017, -73.5673)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'hospitals':>10} {'scalar (ms)':>12} {'vector (ms)':>12} {'speedup':>8}")
+
+    for n in SIZES:
+        lats = rng.uniform(45.0, 49.0, size=n)
+        lons = rng.uniform(-79.0, -64.0, size=n)
+        points = list(zip(lats.tolist(), lons.tolist()))
+        coords = CoordinateSet(lats, lons)
+
+        def scalar():
+            return [haversine_distance(*ORIGIN, lat, lon) for lat, lon in points]
+
+        def vector():
+            return coords.distances_from(*ORIGIN)
+
+        number = max(1, 20_000 // n)
+        scalar_ms = min(timeit.repeat(scalar, number=number, repeat=5)) / number * 1000
+        vector_ms = min(timeit.repeat(vector, number=number, repeat=5)) / number * 1000
+        print(f"{n:>10} {scalar_ms:>12.3f} {vector_ms:>12.3f} {scalar_ms / vector_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
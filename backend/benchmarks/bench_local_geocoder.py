@@ -0,0 +1,80 @@
+"""
+Build time, load time, size and lookup latency of the offline geocoder.
+
+Uses synthetic Quebec-style postal codes (FSAs starting with G, H or J) so it runs
+without the real dataset.
+
+    python -m benchmarks.bench_local_geocoder [--entries 500000]
+"""
+import argparse
+import os
+import string
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
+import numpy as np
+import pandas as pd
+
+from app.services.local_geocoder import LocalGeocoder, build_index
+
+
+def synthetic_postal_codes(n: int, rng) -> pd.DataFrame:
+    letters = np.array(list(string.ascii_uppercase))
+    digits = np.array(list(string.digits))
+    codes = pd.Series(
+        rng.choice(np.array(["G", "H", "J"]), n)
+        + rng.choice(digits, n) + rng.choice(letters, n) + " "
+        + rng.choice(digits, n) + rng.choice(letters, n) + rng.choice(digits, n)
+    ).drop_duplicates()
+    return pd.DataFrame({
+        "name": codes,
+        "latitude": rng.uniform(45.0, 49.0, len(codes)),
+        "longitude": rng.uniform(-79.0, -64.0, len(codes)),
+    })
+
+
+def per_call_us(fn, queries) -> float:
+    it = iter(queries * 10)
+    number = len(queries) * 10
+    return min(timeit.repeat(lambda: fn(next(it)), number=number // 5, repeat=5)) / (number // 5) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=500_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = synthetic_postal_codes(args.entries, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "places.csv"
+        df.to_csv(csv_path, index=False)
+
+        start = time.perf_counter()
+        n = build_index(csv_path, Path(tmp) / "index")
+        build_s = time.perf_counter() - start
+        size_mb = sum(f.stat().st_size for f in (Path(tmp) / "index").iterdir()) / 1e6
+
+        start = time.perf_counter()
+        geocoder = LocalGeocoder(Path(tmp) / "index")
+        load_ms = (time.perf_counter() - start) * 1000
+
+        hits = df["name"].sample(1000, random_state=0).tolist()
+        prefixes = [h[:5] for h in hits]
+        misses = [f"X{h[1:]}" for h in hits]
+
+        print(f"{n} entries, index {size_mb:.1f} MB, built in {build_s:.2f} s, mapped in {load_ms:.2f} ms")
+        print(f"exact hit        {per_call_us(geocoder.forward, hits):8.1f} µs/lookup")
+        print(f"postal prefix    {per_call_us(geocoder.forward, prefixes):8.1f} µs/lookup")
+        print(f"miss             {per_call_us(geocoder.forward, misses):8.1f} µs/lookup")
+        print(f"complete(5)      {per_call_us(lambda q: geocoder.complete(q, 5), prefixes):8.1f} µs/lookup")
+        del geocoder
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+ARIMA fitting wall time for the forecasting job: in-process vs. a pool of spawned workers.
+
+Fits one model per synthetic hospital series (a week of hourly pressure scores), as
+the forecasting job does once per run. The pool is timed twice: the first batch
+includes worker start-up, the second shows throughput once the workers are warm.
+
+    python -m benchmarks.bench_model_fitting [--hospitals 130] [--workers 4] 2>/dev/null
+
+statsmodels reports convergence warnings on stderr from every process, hence the redirect.
+"""
+import argparse
+import os
+import time
+
+# Settings require a database URL; nothing here connects to it
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
+import numpy as np
+import pandas as pd
+
+from app.ml.model_fitting import ModelFitter
+
+HOURS = 24 * 7
+
+
+def synthetic_series(n_hospitals: int):
+    rng = np.random.default_rng(0)
+    return {
+        hospital_id: pd.Series(np.clip(0.6 + np.cumsum(rng.normal(0, 0.02, HOURS)), 0, 2))
+        for hospital_id in range(1, n_hospitals + 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hospitals", type=int, default=130)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    series = synthetic_series(args.hospitals)
+    print(f"{args.hospitals} series x {HOURS} points, {os.cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    serial = ModelFitter(workers=1).fit(series)
+    serial_wall = time.perf_counter() - start
+    print(f"{'in-process':<22} {serial_wall:>7.2f}s")
+
+    with ModelFitter(workers=args.workers) as fitter:
+        for label in ("pool, first batch", "pool, reused"):
+            start = time.perf_counter()
+            parallel = fitter.fit(series)
+            wall = time.perf_counter() - start
+            print(f"{label:<22} {wall:>7.2f}s  speedup {serial_wall / wall:.1f}x ({args.workers} workers)")
+
+    same = all(np.array_equal(serial[k].result.params, parallel[k].result.params) for k in series)
+    print(f"identical parameters: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Numeric coercion of the eight count/duration columns: per-cell to_int/to_float vs.
+the column-wise coerce_numeric used by clean_dataframe.
+
+    python -m benchmarks.bench_parser [--rows 21840]
+"""
+import argparse
+import os
+import timeit
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
+import numpy as np
+import pandas as pd
+
+from app.ingestion.parser import FLOAT_COLUMNS, INTEGER_COLUMNS, coerce_numeric
+from app.ingestion.utils import to_float, to_int
+
+
+def synthetic_columns(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({c: rng.integers(0, 80, n).astype(str) for c in INTEGER_COLUMNS})
+    for c in FLOAT_COLUMNS:
+        df[c] = np.where(rng.random(n) < 0.2, "Pas d'information", rng.uniform(1, 30, n).round(2).astype(str))
+    return df
+
+
+def per_cell(df):
+    return {
+        c: df[c].map(to_float if c in FLOAT_COLUMNS else to_int)
+        for c in INTEGER_COLUMNS + FLOAT_COLUMNS
+    }
+
+
+def column_wise(df):
+    return {
+        c: coerce_numeric(df[c], integer=c in INTEGER_COLUMNS)
+        for c in INTEGER_COLUMNS + FLOAT_COLUMNS
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=24 * 7 * 130)
+    args = parser.parse_args()
+
+    df = synthetic_columns(args.rows)
+    old_ms = min(timeit.repeat(lambda: per_cell(df), number=1, repeat=5)) * 1000
+    new_ms = min(timeit.repeat(lambda: column_wise(df), number=1, repeat=5)) * 1000
+    print(f"{args.rows} rows x {len(INTEGER_COLUMNS) + len(FLOAT_COLUMNS)} columns")
+    print(f"per-cell helpers   {old_ms:8.1f} ms")
+    print(f"coerce_numeric     {new_ms:8.1f} ms   ({old_ms / new_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
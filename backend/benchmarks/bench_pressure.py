@@ -0,0 +1,46 @@
+"""
+Pressure score over a snapshot frame: df.apply(compute_pressure_score, axis=1), as
+build_features used to do, vs. the column-wise compute_pressure_scores.
+
+    python -m benchmarks.bench_pressure [--rows 1000000]
+"""
+import argparse
+import os
+import timeit
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
+import numpy as np
+import pandas as pd
+
+from app.ml.features.pressure import PRESSURE_COLUMNS, compute_pressure_score, compute_pressure_scores
+
+
+def synthetic_snapshots(n: int) -> pd.DataFrame:
+    """Shaped like load_snapshots_df, whose mixed dtypes make apply() pass Python scalars."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({c: rng.integers(0, 120, n) for c in PRESSURE_COLUMNS})
+    df["hospital_id"] = np.arange(n) % 130
+    df["snapshot_time"] = pd.Timestamp("2026-01-01", tz="UTC") + pd.to_timedelta(np.arange(n) // 130, unit="h")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = synthetic_snapshots(args.rows)
+    start = timeit.default_timer()
+    expected = df.apply(compute_pressure_score, axis=1).to_numpy()
+    old_ms = (timeit.default_timer() - start) * 1000
+    new_ms = min(timeit.repeat(lambda: compute_pressure_scores(df), number=1, repeat=5)) * 1000
+
+    print(f"{args.rows} rows")
+    print(f"df.apply                  {old_ms:9.1f} ms")
+    print(f"compute_pressure_scores   {new_ms:9.1f} ms   ({old_ms / new_ms:.0f}x)")
+    print(f"identical: {np.array_equal(expected, compute_pressure_scores(df))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,20 @@ os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
 os.environ.setdefault("DISABLE_SCHEDULER", "true")
 import pytest
 import uuid
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from datetime import datetime, timezone, timedelta
 
 from app.main import app
 from app.db.base import Base
 from app.db.session import get_db
+from app.db.async_session import get_async_db
+from app.services.response_cache import invalidate_response_cache
+from app.services.geocode_cache import clear_geocode_cache
 
 
 SQLALCHEMY_TEST_URL = "sqlite:///./test.db"
@@ -21,6 +27,29 @@ engine = create_engine(
 )
 TestingSession = sessionmaker(bind=engine, autoflush=False)
 
+# TestClient runs each request on its own event loop, so async connections are not pooled
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///./test.db",
+    poolclass=NullPool,
+)
+TestingAsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+@contextmanager
+def count_statements():
+    """Collect the SQL statements API requests issue through the async engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    bind = async_engine.sync_engine
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_db():
@@ -43,7 +72,15 @@ def db():
 def client(db):
     def override_get_db():
         yield db
+
+    async def override_get_async_db():
+        async with TestingAsyncSession() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    invalidate_response_cache()
+    clear_geocode_cache()
     yield TestClient(app)
     app.dependency_overrides.clear()
 
@@ -67,7 +104,7 @@ def sample_hospital(db):
 
 @pytest.fixture
 def sample_forecast(db, sample_hospital):
-    from app.db.models import Forecast
+    from app.db.models import Forecast, LatestForecast
     now = datetime.now(timezone.utc)
     f = Forecast(
         hospital_id=sample_hospital.id,
@@ -78,6 +115,14 @@ def sample_forecast(db, sample_hospital):
         evaluated=False,
     )
     db.add(f)
+    # Mirror what save_forecasts maintains for the read endpoints
+    db.add(LatestForecast(
+        hospital_id=f.hospital_id,
+        horizon_hours=f.horizon_hours,
+        predicted_pressure=f.predicted_pressure,
+        risk_level=f.risk_level,
+        forecast_time=f.forecast_time,
+    ))
     db.commit()
     db.refresh(f)
     return f
@@ -1,6 +1,7 @@
-import pytest
+from datetime import datetime, timezone, timedelta
 
-pg_only = pytest.mark.skip(reason="date_trunc requires PostgreSQL")
+from app.services.forecast_storage import save_forecasts
+from app.services.response_cache import invalidate_response_cache
 
 def test_congestion_map_returns_geojson(client, sample_forecast):
     res = client.get("/api/dashboard/congestion/map?horizon=1")
@@ -46,7 +47,6 @@ def test_stats_invalid_horizon_rejected(client):
     res = client.get("/api/dashboard/stats?horizon_hours=0")
     assert res.status_code == 422
 
-@pg_only
 def test_stats_returns_expected_keys(client):
     with patch("app.api.dashboard.get_dashboard_stats", return_value=MOCK_STATS):
         res = client.get("/api/dashboard/stats?horizon_hours=1")
@@ -56,8 +56,70 @@ def test_stats_returns_expected_keys(client):
 
 
 
-@pytest.mark.skip(reason="date_trunc requires PostgreSQL, not SQLite")
 def test_stats_with_unknown_hospital_returns_empty_series(client):
     res = client.get("/api/dashboard/stats?horizon_hours=1&hospital_id=999999")
     assert res.status_code == 200
-    assert res.json()["global_series"] == []
\ No newline at end of file
+    assert res.json()["global_series"] == []
+
+def test_congestion_map_returns_304_for_matching_etag(client, sample_forecast):
+    res = client.get("/api/dashboard/congestion/map?horizon=1")
+    etag = res.headers["etag"]
+    again = client.get("/api/dashboard/congestion/map?horizon=1", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+
+
+def test_congestion_map_generated_at_is_when_forecasts_were_saved(client, db, sample_forecast):
+    data = client.get("/api/dashboard/congestion/map?horizon=1").json()
+    generated_at = datetime.fromisoformat(data["generated_at"])
+    assert generated_at <= datetime.now(timezone.utc)
+    assert generated_at < sample_forecast.forecast_time.replace(tzinfo=timezone.utc)
+
+
+def test_congestion_map_etag_survives_cache_rebuild(client, sample_forecast):
+    etag = client.get("/api/dashboard/congestion/map?horizon=1").headers["etag"]
+
+    # TTL expiry or a forecasting run over the same data rebuilds the entry
+    invalidate_response_cache()
+    res = client.get("/api/dashboard/congestion/map?horizon=1", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.headers["etag"] == etag
+
+
+def seed_hourly_forecasts(db, hospital_id, hours, pressure):
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    save_forecasts(db, [
+        {"hospital_id": hospital_id, "predicted_pressure": pressure,
+         "forecast_time": now - timedelta(hours=h), "horizon_hours": 1,
+         "risk_level": "MEDIUM"}
+        for h in range(hours)
+    ], horizon_hours=1)
+
+
+def test_stats_reads_hourly_rollups(client, db, sample_hospital):
+    seed_hourly_forecasts(db, sample_hospital.id, hours=3, pressure=0.5)
+
+    res = client.get(f"/api/dashboard/stats?horizon_hours=1&hospital_id={sample_hospital.id}")
+    assert res.status_code == 200
+    data = res.json()
+    assert len(data["global_series"]) == 3
+    assert all(p["predicted"] == 0.5 for p in data["global_series"])
+    stats = {h["hospital_id"]: h for h in data["hospital_stats"]}
+    assert stats[sample_hospital.id]["mean_predicted"] == 0.5
+    assert stats[sample_hospital.id]["risk_level"] == "MEDIUM"
+
+
+def test_stats_supports_longer_windows(client, db, sample_hospital):
+    seed_hourly_forecasts(db, sample_hospital.id, hours=48, pressure=0.3)
+
+    day = client.get(f"/api/dashboard/stats?horizon_hours=1&hospital_id={sample_hospital.id}").json()
+    week = client.get(
+        f"/api/dashboard/stats?horizon_hours=1&hospital_id={sample_hospital.id}&window_hours=168"
+    ).json()
+    assert len(day["global_series"]) == 24
+    assert len(week["global_series"]) == 48
+
+
+def test_stats_window_is_capped_at_30_days(client):
+    res = client.get("/api/dashboard/stats?window_hours=721")
+    assert res.status_code == 422
@@ -0,0 +1,18 @@
+def test_submit_feedback_persists_entry(client):
+    res = client.post(
+        "/api/feedback",
+        json={"rating": 4, "thumbs": "up", "category": "ui", "message": "Clear map"},
+        headers={"User-Agent": "pytest"},
+    )
+    assert res.status_code == 201
+    data = res.json()
+    assert data["id"] is not None
+    assert data["rating"] == 4
+
+    listed = client.get("/api/feedback").json()
+    assert any(f["id"] == data["id"] for f in listed)
+
+
+def test_submit_feedback_rejects_invalid_rating(client):
+    res = client.post("/api/feedback", json={"rating": 9})
+    assert res.status_code == 422
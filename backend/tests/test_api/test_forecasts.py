@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import event
+
+from app.db.models import LatestForecast
+from app.services.response_cache import invalidate_response_cache
+from tests.conftest import async_engine, count_statements
+
+
+def test_latest_forecasts_includes_sample(client, sample_forecast):
+    res = client.get("/api/forecasts/latest?horizon=1")
+    assert res.status_code == 200
+    rows = {r["hospital_id"]: r for r in res.json()}
+    row = rows[sample_forecast.hospital_id]
+    assert row["predicted_pressure"] == round(sample_forecast.predicted_pressure, 3)
+    assert row["risk_level"] == sample_forecast.risk_level
+
+
+def test_latest_forecasts_filters_by_horizon(client, sample_forecast):
+    res = client.get("/api/forecasts/latest?horizon=4")
+    assert res.status_code == 200
+    assert sample_forecast.hospital_id not in {r["hospital_id"] for r in res.json()}
+
+
+@pytest.mark.parametrize("path", ["/api/forecasts/latest", "/api/dashboard/congestion/map"])
+def test_unknown_horizon_rejected(client, path):
+    # Arbitrary horizons would each leave an entry in the response cache
+    assert client.get(f"{path}?horizon=3").status_code == 422
+    assert client.get(f"{path}?horizon=999").status_code == 422
+
+
+def test_latest_forecasts_sends_strong_etag(client, sample_forecast):
+    first = client.get("/api/forecasts/latest?horizon=1")
+    second = client.get("/api/forecasts/latest?horizon=1")
+    assert first.headers["etag"].startswith('"')
+    assert first.headers["etag"] == second.headers["etag"]
+    assert "max-age" in first.headers["cache-control"]
+
+
+def test_latest_forecasts_revalidation_skips_database(client, sample_forecast):
+    etag = client.get("/api/forecasts/latest?horizon=1").headers["etag"]
+
+    with count_statements() as statements:
+        res = client.get("/api/forecasts/latest?horizon=1", headers={"If-None-Match": etag})
+
+    assert res.status_code == 304
+    assert res.content == b""
+    assert statements == []
+
+
+def test_latest_forecasts_refresh_after_invalidation(client, db, sample_forecast):
+    etag = client.get("/api/forecasts/latest?horizon=1").headers["etag"]
+
+    row = db.get(LatestForecast, (sample_forecast.hospital_id, 1))
+    row.predicted_pressure = 0.25
+    db.commit()
+    assert client.get("/api/forecasts/latest?horizon=1").headers["etag"] == etag
+
+    invalidate_response_cache()
+    res = client.get("/api/forecasts/latest?horizon=1", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["etag"] != etag
+
+
+def test_response_read_before_invalidation_is_not_cached(client, sample_forecast):
+    def forecasting_run_commits(*args):
+        invalidate_response_cache()
+
+    # The forecasting job invalidates while the request is reading the database
+    bind = async_engine.sync_engine
+    event.listen(bind, "before_cursor_execute", forecasting_run_commits)
+    try:
+        assert client.get("/api/forecasts/latest?horizon=1").status_code == 200
+    finally:
+        event.remove(bind, "before_cursor_execute", forecasting_run_commits)
+
+    with count_statements() as statements:
+        client.get("/api/forecasts/latest?horizon=1")
+    assert statements != []
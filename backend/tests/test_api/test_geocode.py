@@ -0,0 +1,123 @@
+import asyncio
+import uuid
+
+import httpx
+import pytest
+
+from app.services import geocoding
+from app.services.geocode_cache import clear_geocode_cache
+from app.services.geocoding import GeocodingUnavailable, UpstreamScheduler
+from app.services.local_geocoder import build_index, close_local_geocoder, open_local_geocoder
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Stub Nominatim behind the shared client, recording every request it receives."""
+    calls = []
+    monkeypatch.setattr(geocoding, "scheduler", UpstreamScheduler(rate=100, burst=10))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.url.path == "/search":
+            if request.url.params["q"].startswith("nowhere"):
+                return httpx.Response(200, json=[])
+            return httpx.Response(200, json=[{"lat": "45.5", "lon": "-73.6", "display_name": "Montréal"}])
+        return httpx.Response(200, json={"display_name": "Rue Sainte-Catherine, Montréal"})
+
+    geocoding.open_client(geocoding.create_client(transport=httpx.MockTransport(handler)))
+    yield calls
+    asyncio.run(geocoding.close_client())
+
+
+def unique_address():
+    return f"{uuid.uuid4().hex[:8]} Rue Sainte-Catherine"
+
+
+def test_forward_repeats_are_served_from_memory(client, upstream):
+    address = unique_address()
+    first = client.get("/api/geocode/forward", params={"q": address})
+    again = client.get("/api/geocode/forward", params={"q": f"  {address.upper()} "})
+
+    assert first.status_code == again.status_code == 200
+    assert again.json() == first.json()
+    assert len(upstream) == 1
+    stats = client.get("/api/geocode/cache/stats").json()["forward"]
+    assert stats == {"local_hits": 0, "memory_hits": 1, "store_hits": 0, "misses": 1, "hit_rate": 0.5}
+
+
+def test_forward_hits_survive_a_restart(client, upstream):
+    address = unique_address()
+    client.get("/api/geocode/forward", params={"q": address})
+    clear_geocode_cache()  # what a process restart loses
+
+    res = client.get("/api/geocode/forward", params={"q": address})
+    assert res.status_code == 200
+    assert res.json()["display_name"] == "Montréal"
+    assert len(upstream) == 1
+    assert client.get("/api/geocode/cache/stats").json()["forward"]["store_hits"] == 1
+
+
+def test_forward_not_found_is_cached(client, upstream):
+    query = f"nowhere {uuid.uuid4().hex[:8]}"
+    assert client.get("/api/geocode/forward", params={"q": query}).status_code == 404
+    assert client.get("/api/geocode/forward", params={"q": query}).status_code == 404
+    assert len(upstream) == 1
+
+
+def test_nearby_reverse_lookups_share_an_entry(client, upstream):
+    lat = 45.0 + uuid.uuid4().int % 10_000 / 1e4
+    first = client.get("/api/geocode/reverse", params={"lat": lat + 0.00001, "lng": -73.56731})
+    second = client.get("/api/geocode/reverse", params={"lat": lat - 0.00001, "lng": -73.56729})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json() == {"address": "Rue Sainte-Catherine, Montréal"}
+    assert len(upstream) == 1
+    # Upstream is asked about the quantized point
+    assert upstream[0].url.params["lon"] == "-73.5673"
+
+
+def test_busy_upstream_returns_503(client, upstream, monkeypatch):
+    async def unavailable(query, priority=geocoding.PRIORITY_NORMAL):
+        raise GeocodingUnavailable("queue timed out")
+
+    monkeypatch.setattr("app.services.geocode_cache.forward_geocode", unavailable)
+    res = client.get("/api/geocode/forward", params={"q": unique_address()})
+    assert res.status_code == 503
+    assert res.headers["Retry-After"] == "5"
+
+
+@pytest.fixture
+def local_index(tmp_path):
+    csv_path = tmp_path / "places.csv"
+    csv_path.write_text(
+        "name,latitude,longitude,display_name\n"
+        "H3Z 2Y7,45.486,-73.58,\"H3Z 2Y7, Montréal, QC\"\n"
+        "H3Z 2Y8,45.488,-73.582,\n",
+        encoding="utf-8",
+    )
+    build_index(csv_path, tmp_path / "index")
+    open_local_geocoder(tmp_path / "index")
+    yield
+    close_local_geocoder()
+
+
+def test_forward_uses_local_index_before_upstream(client, upstream, local_index):
+    res = client.get("/api/geocode/forward", params={"q": "h3z2y7"})
+    assert res.status_code == 200
+    assert res.json() == {"lat": 45.486, "lng": -73.58, "display_name": "H3Z 2Y7, Montréal, QC"}
+    assert upstream == []
+    assert client.get("/api/geocode/cache/stats").json()["forward"]["local_hits"] == 1
+
+    # A local miss still goes upstream
+    client.get("/api/geocode/forward", params={"q": unique_address()})
+    assert len(upstream) == 1
+
+
+def test_suggest_returns_local_prefix_matches(client, local_index):
+    res = client.get("/api/geocode/suggest", params={"q": "H3Z 2", "limit": 1})
+    assert res.status_code == 200
+    assert [r["display_name"] for r in res.json()["results"]] == ["H3Z 2Y7, Montréal, QC"]
+
+
+def test_suggest_without_index_is_empty(client):
+    assert client.get("/api/geocode/suggest", params={"q": "H3Z"}).json() == {"results": []}
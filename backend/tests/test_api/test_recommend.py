@@ -0,0 +1,76 @@
+import uuid
+from datetime import datetime, timezone, timedelta
+
+from app.db.models import Hospital, LatestForecast
+from app.services.hospital_index import refresh_hospital_index
+from tests.conftest import count_statements
+
+# Far away from the other fixtures so only the hospitals seeded here are in range
+ORIGIN_LAT = 48.0
+ORIGIN_LNG = -68.0
+
+
+def seed_hospitals(db, n: int):
+    now = datetime.now(timezone.utc)
+    for i in range(n):
+        h = Hospital(
+            name=f"Hôpital Recommend {i}",
+            region="Bas-Saint-Laurent",
+            permit_id=f"REC-{uuid.uuid4().hex[:8]}",
+            latitude=ORIGIN_LAT + 0.001 * (i + 1),
+            longitude=ORIGIN_LNG,
+            is_active=True,
+        )
+        db.add(h)
+        db.flush()
+        for horizon in (1, 2, 4):
+            db.add(LatestForecast(
+                hospital_id=h.id,
+                horizon_hours=horizon,
+                predicted_pressure=0.3 + 0.1 * horizon,
+                risk_level="LOW",
+                forecast_time=now + timedelta(hours=horizon),
+            ))
+    db.commit()
+    refresh_hospital_index(db)
+
+
+def recommend(client, **params):
+    query = {"latitude": ORIGIN_LAT, "longitude": ORIGIN_LNG, "max_distance": 5, "limit": 50}
+    query.update(params)
+    return client.get("/api/recommend", params=query)
+
+
+def test_recommend_returns_nearest_future_forecast(client, db):
+    seed_hospitals(db, 1)
+    res = recommend(client)
+    assert res.status_code == 200
+    results = res.json()["results"]
+    assert len(results) >= 1
+    # Horizon 1 is the nearest future forecast
+    assert round(results[0]["predicted_pressure"], 3) == 0.4
+
+
+def test_recommend_query_count_is_constant(client, db):
+    seed_hospitals(db, 2)
+    with count_statements() as few:
+        res = recommend(client)
+    assert res.status_code == 200
+    n_few = len(res.json()["results"])
+
+    seed_hospitals(db, 10)
+    with count_statements() as many:
+        res = recommend(client)
+    assert res.status_code == 200
+    assert len(res.json()["results"]) >= n_few + 10
+
+    assert few
+    assert len(many) == len(few)
+
+
+def test_recommend_does_not_scan_hospitals(client, db):
+    seed_hospitals(db, 3)
+    with count_statements() as statements:
+        res = recommend(client)
+    assert res.status_code == 200
+    assert not any("FROM hospitals" in s for s in statements)
@@ -0,0 +1,146 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.ingestion import fetcher
+from app.ingestion.fetcher import download
+
+
+class Source:
+    """What the stand-in server currently publishes, and the requests it received."""
+
+    def __init__(self):
+        self.body = b"a,b\n1,2\n"
+        self.validators = True
+        self.failures = 0
+        self.status = 200
+        self.requests = []
+
+    @property
+    def etag(self):
+        return '"' + hashlib.md5(self.body).hexdigest() + '"'
+
+
+@pytest.fixture
+def source():
+    source = Source()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            source.requests.append(dict(self.headers))
+            if source.failures:
+                source.failures -= 1
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if source.status != 200:
+                self.send_response(source.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if source.validators and self.headers.get("If-None-Match") == source.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            if source.validators:
+                self.send_header("ETag", source.etag)
+                self.send_header("Last-Modified", "Sun, 01 Mar 2026 10:00:00 GMT")
+            self.send_header("Content-Length", str(len(source.body)))
+            self.end_headers()
+            self.wfile.write(source.body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+    source.url = f"http://127.0.0.1:{server.server_port}/data.csv"
+    yield source
+    server.shutdown()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(fetcher.time, "sleep", calls.append)
+    return calls
+
+
+def test_unchanged_source_is_not_downloaded_again(source, tmp_path):
+    first = download(source.url, cache_dir=tmp_path)
+    assert first.changed
+    assert first.read_csv().to_dict("records") == [{"a": 1, "b": 2}]
+    first.commit()
+
+    second = download(source.url, cache_dir=tmp_path)
+    assert source.requests[-1]["If-None-Match"] == source.etag
+    assert source.requests[-1]["If-Modified-Since"] == "Sun, 01 Mar 2026 10:00:00 GMT"
+    assert not second.changed
+    assert second.content == source.body  # served from the disk cache
+
+
+def test_changed_source_is_reported(source, tmp_path):
+    download(source.url, cache_dir=tmp_path).commit()
+    source.body = b"a,b\n3,4\n"
+
+    again = download(source.url, cache_dir=tmp_path)
+    assert again.changed
+    assert again.content == source.body
+
+
+def test_content_hash_detects_unchanged_source_without_validators(source, tmp_path):
+    source.validators = False
+    download(source.url, cache_dir=tmp_path).commit()
+
+    again = download(source.url, cache_dir=tmp_path)
+    assert "If-None-Match" not in source.requests[-1]
+    assert not again.changed
+
+
+def test_uncommitted_download_is_fetched_in_full_next_time(source, tmp_path):
+    download(source.url, cache_dir=tmp_path)  # processing failed, never committed
+
+    again = download(source.url, cache_dir=tmp_path)
+    assert "If-None-Match" not in source.requests[-1]
+    assert again.changed
+
+
+def test_corrupted_cache_is_ignored(source, tmp_path):
+    first = download(source.url, cache_dir=tmp_path)
+    first.commit()
+    body_path = next(tmp_path.glob("*.body"))
+    body_path.write_bytes(b"truncated")
+
+    again = download(source.url, cache_dir=tmp_path)
+    assert "If-None-Match" not in source.requests[-1]
+    assert again.content == source.body
+
+
+def test_server_errors_are_retried_with_exponential_backoff(source, tmp_path, sleeps):
+    source.failures = 2
+
+    result = download(source.url, retries=3, delay=1, cache_dir=tmp_path)
+    assert result.changed
+    assert sleeps == [1, 2]
+    assert len(source.requests) == 3
+
+
+def test_gives_up_after_the_last_attempt(source, tmp_path, sleeps):
+    source.failures = 5
+
+    with pytest.raises(RuntimeError, match="after 3 attempts"):
+        download(source.url, retries=3, delay=1, cache_dir=tmp_path)
+    assert sleeps == [1, 2]
+
+
+def test_client_errors_are_not_retried(source, tmp_path, sleeps):
+    source.status = 404
+
+    with pytest.raises(Exception):
+        download(source.url, cache_dir=tmp_path)
+    assert sleeps == []
+    assert len(source.requests) == 1
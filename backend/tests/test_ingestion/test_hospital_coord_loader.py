@@ -0,0 +1,89 @@
+import hashlib
+import uuid
+
+import pandas as pd
+
+from app.db.models import Hospital
+from app.ingestion import hospital_coord_loader
+from app.ingestion.fetcher import Download
+from app.ingestion.hospital_coord_loader import (
+    apply_coordinate_updates,
+    coordinate_updates,
+    load_hospital_coords,
+)
+from app.services import hospital_index
+
+
+def add_hospitals(db, n):
+    hospitals = [
+        Hospital(name=f"Coords {i}", permit_id=f"CRD-{uuid.uuid4().hex[:8]}", latitude=0.0, longitude=0.0)
+        for i in range(n)
+    ]
+    db.add_all(hospitals)
+    db.flush()
+    return hospitals
+
+
+def installations(rows):
+    return pd.DataFrame(rows, columns=["INSTAL_COD", "LATITUDE", "LONGITUDE"])
+
+
+def test_updates_only_known_permits_with_changed_coordinates(db):
+    a, b, c = add_hospitals(db, 3)
+    c.latitude, c.longitude = 45.5, -73.5
+    db.flush()
+    df = installations([
+        (f" {a.permit_id} ", "45.1", "-73.1"),
+        (b.permit_id, "not a number", "-73.2"),
+        (c.permit_id, "45.5", "-73.5"),
+        ("UNKNOWN", "46.0", "-72.0"),
+    ])
+
+    updates, counts = coordinate_updates(df, load_hospital_coords(db))
+    assert updates["id"].tolist() == [a.id]
+    assert counts == {"matched": 2, "unmatched": 1, "invalid": 1}
+
+    assert apply_coordinate_updates(db, updates) == 1
+    db.expire_all()
+    assert (a.latitude, a.longitude) == (45.1, -73.1)
+    assert (b.latitude, b.longitude) == (0.0, 0.0)
+    assert (c.latitude, c.longitude) == (45.5, -73.5)
+
+
+def test_last_row_wins_for_duplicate_permits(db):
+    (h,) = add_hospitals(db, 1)
+    df = installations([(h.permit_id, "45.0", "-73.0"), (h.permit_id, "46.0", "-72.0")])
+
+    updates, _ = coordinate_updates(df, load_hospital_coords(db))
+    apply_coordinate_updates(db, updates)
+    db.expire_all()
+    assert (h.latitude, h.longitude) == (46.0, -72.0)
+
+
+def test_populate_commits_and_refreshes_index(db, monkeypatch):
+    hospitals = add_hospitals(db, 2)
+    db.commit()
+    df = installations([(h.permit_id, 47.0 + i, -70.0) for i, h in enumerate(hospitals)])
+    content = df.to_csv(index=False).encode()
+    dataset = Download("http://coords.test/installations.csv", content, True, hashlib.sha256(content).hexdigest())
+    monkeypatch.setattr(hospital_coord_loader, "download", lambda url: dataset)
+
+    hospital_coord_loader.populate_hospital_coords()
+
+    db.expire_all()
+    assert [(h.latitude, h.longitude) for h in hospitals] == [(47.0, -70.0), (48.0, -70.0)]
+    indexed = {h.id for h in hospital_index._index.hospitals}
+    assert {h.id for h in hospitals} <= indexed
+
+
+def test_unchanged_source_still_fills_new_hospitals(db, monkeypatch):
+    (h,) = add_hospitals(db, 1)  # as created by ingestion, at 0, 0
+    db.commit()
+    content = installations([(h.permit_id, "46.5", "-71.5")]).to_csv(index=False).encode()
+    dataset = Download("http://coords.test/installations.csv", content, False, hashlib.sha256(content).hexdigest())
+    monkeypatch.setattr(hospital_coord_loader, "download", lambda url: dataset)
+
+    hospital_coord_loader.populate_hospital_coords()
+
+    db.expire_all()
+    assert (h.latitude, h.longitude) == (46.5, -71.5)
@@ -0,0 +1,47 @@
+import uuid
+
+import pandas as pd
+
+from app.db.models import Hospital
+from app.ingestion.hospital_loader import load_hospital_ids, upsert_hospitals
+
+
+def installations(permit_ids, region="Montréal"):
+    return pd.DataFrame({
+        "Nom_etablissement": "CISSS Test",
+        "Nom_installation": [f"Hôpital {p}" for p in permit_ids],
+        "No_permis_installation": permit_ids,
+        "Region": region,
+    })
+
+
+def test_upsert_creates_each_unseen_permit_once(db, sample_hospital):
+    new = [f"UPS-{uuid.uuid4().hex[:8]}" for _ in range(3)]
+    df = installations([sample_hospital.permit_id] + new + new[:1])
+
+    hospital_ids = load_hospital_ids(db)
+    assert upsert_hospitals(db, df, hospital_ids) == 3
+    assert set(new) <= hospital_ids.keys()
+
+    stored = db.query(Hospital).filter(Hospital.permit_id.in_(new)).all()
+    assert {h.permit_id: h.id for h in stored} == {p: hospital_ids[p] for p in new}
+    assert all(h.latitude == 0.0 and h.is_active for h in stored)
+
+    # A second pass has nothing left to create
+    assert upsert_hospitals(db, df, hospital_ids) == 0
+
+
+def test_upsert_resolves_permits_created_by_another_writer(db):
+    permit = f"UPS-{uuid.uuid4().hex[:8]}"
+    stale_ids = load_hospital_ids(db)
+    db.add(Hospital(name="Concurrent", permit_id=permit, latitude=0.0, longitude=0.0))
+    db.flush()
+
+    assert upsert_hospitals(db, installations([permit]), stale_ids) == 0
+    assert stale_ids[permit] == db.query(Hospital.id).filter_by(permit_id=permit).scalar()
+
+
+def test_missing_region_is_stored_as_null(db):
+    permit = f"UPS-{uuid.uuid4().hex[:8]}"
+    upsert_hospitals(db, installations([permit], region=None), load_hospital_ids(db))
+    assert db.query(Hospital).filter_by(permit_id=permit).one().region is None
@@ -0,0 +1,87 @@
+import math
+import random
+
+import numpy as np
+import pandas as pd
+
+from app.ingestion.parser import clean_dataframe, coerce_numeric
+from app.ingestion.utils import to_float, to_int
+
+TRICKY_VALUES = [
+    "12", " 12.7 ", "-3.9", "1e3", "+5", "0", "-0.5", "007",
+    "inf", "-inf", "nan", "NaN", "infinity", "1e400", "1_000", "١٢",
+    "", "  ", "abc", "12,5", "0x10", "Pas d'information", "PAS D'INFORMATION (fermé)",
+    None, np.nan, 7, 7.9, -7.9, 3.0, "9" * 30,
+]
+
+
+def as_missing(value):
+    """Scalar helpers return None or NaN for missing values; the columns use NA/NaN."""
+    return None if value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value)) else value
+
+
+def assert_float_parity(values):
+    coerced = coerce_numeric(pd.Series(values, dtype=object))
+    assert coerced.dtype == "float64"
+    for raw, got in zip(values, coerced):
+        assert as_missing(got) == as_missing(to_float(raw)), raw
+
+
+def assert_int_parity(values):
+    coerced = coerce_numeric(pd.Series(values, dtype=object), integer=True)
+    assert coerced.dtype == "Int64"
+    for raw, got in zip(values, coerced):
+        expected = to_int(raw)
+        if expected is not None and abs(expected) >= 2**63:
+            expected = None  # does not fit the column; the scalar helper returned a bigint
+        assert as_missing(got) == expected, raw
+
+
+def test_float_parity_on_tricky_values():
+    assert_float_parity(TRICKY_VALUES)
+
+
+def test_int_parity_on_tricky_values():
+    assert_int_parity(TRICKY_VALUES)
+
+
+def test_parity_on_random_values():
+    rng = random.Random(0)
+    generators = [
+        lambda: str(rng.randint(-100, 1000)),
+        lambda: f"{rng.uniform(-50, 500):.{rng.randint(0, 4)}f}",
+        lambda: f"  {rng.uniform(0, 99):.2f} ",
+        lambda: rng.choice(["", "Pas d'information", "n/a", "nan", None, "inf"]),
+        lambda: rng.uniform(-10, 10),
+        lambda: rng.randint(0, 60),
+    ]
+    values = [rng.choice(generators)() for _ in range(5000)]
+    assert_float_parity(values)
+    assert_int_parity(values)
+
+
+def test_clean_dataframe_types_numeric_columns():
+    raw = pd.DataFrame({
+        "Nom_etablissement": ["CISSS Test"] * 3,
+        "Nom_installation": ["Hôpital A", "Hôpital B", "Total régional"],
+        "No_permis_installation": [1234, 5678, 0],
+        "Region": ["Montréal"] * 3,
+        "Heure de l'extraction (image)": ["2026-03-01 10:00"] * 3,
+        "Mise à jour": ["2026-03-01 09:45"] * 3,
+        "Nombre de civières fonctionnelles": ["20", "Pas d'information", "99"],
+        "Nombre de civières occupées": ["15", "3", "99"],
+        "Nombre total de patients présents à l'urgence": ["40", "12.0", "99"],
+        "Nombre total de patients en attente de PEC": ["5", "1", "99"],
+        "Nombre de patients sur civière plus de 24 heures": ["2", "0", "99"],
+        "Nombre de patients sur civière plus de 48 heures": ["1", "0", "99"],
+        "DMS sur civière": ["12.5", "", "99"],
+        "DMS ambulatoire": ["Pas d'information", "3.25", "99"],
+    })
+
+    df = clean_dataframe(raw)
+    assert len(df) == 2
+    assert df["Nombre_de_civieres_fonctionnelles"].dtype == "Int64"
+    assert df["Nombre_de_civieres_fonctionnelles"].isna().tolist() == [False, True]
+    assert df["Nombre_total_de_patients_presents_a_lurgence"].tolist() == [40, 12]
+    assert df["DMS_sur_civiere"].dtype == "float64"
+    assert df["DMS_ambulatoire"].tolist()[1] == 3.25
@@ -0,0 +1,77 @@
+import hashlib
+import uuid
+
+import pandas as pd
+import pytest
+
+from app.db.models import ERSnapshot, Hospital
+from app.ingestion import main
+from app.ingestion.fetcher import Download
+
+
+def msss_file(permit_ids, start, hours):
+    """A raw MSSS extract: one row per installation and hour, Montreal local time."""
+    rows = []
+    for hour in pd.date_range(start, periods=hours, freq="h"):
+        for permit_id in permit_ids:
+            rows.append({
+                "Nom_etablissement": "CISSS Test",
+                "Nom_installation": f"Hôpital {permit_id}",
+                "No_permis_installation": permit_id,
+                "Region": "Montréal",
+                "Heure de l'extraction (image)": hour.strftime("%Y-%m-%d %H:%M"),
+                "Mise à jour": hour.strftime("%Y-%m-%d %H:%M"),
+                "Nombre de civières fonctionnelles": "20",
+                "Nombre de civières occupées": "15",
+                "Nombre total de patients présents à l'urgence": "40",
+                "Nombre total de patients en attente de PEC": "5",
+                "Nombre de patients sur civière plus de 24 heures": "2",
+                "Nombre de patients sur civière plus de 48 heures": "1",
+                "DMS sur civière": "12.5",
+                "DMS ambulatoire": "Pas d'information",
+            })
+    return pd.DataFrame(rows)
+
+
+def as_download(df, changed=True):
+    content = df.to_csv(index=False).encode("latin1")
+    return Download("http://msss.test/data.csv", content, changed, hashlib.sha256(content).hexdigest())
+
+
+def test_rerun_only_writes_new_hours(db, monkeypatch):
+    permits = [f"RUN-{uuid.uuid4().hex[:8]}" for _ in range(2)]
+
+    monkeypatch.setattr(main, "fetch_dataset", lambda: as_download(msss_file(permits, "2026-03-01 00:00", 3)))
+    first = main.run_ingestion()
+    assert (first.inserted, first.filtered) == (6, 0)
+
+    # The next file overlaps the stored hours and adds one new hour
+    monkeypatch.setattr(main, "fetch_dataset", lambda: as_download(msss_file(permits, "2026-03-01 00:00", 4)))
+    second = main.run_ingestion()
+    assert (second.inserted, second.filtered, second.skipped) == (2, 6, 0)
+
+    hospital_ids = [h.id for h in db.query(Hospital).filter(Hospital.permit_id.in_(permits))]
+    assert db.query(ERSnapshot).filter(ERSnapshot.hospital_id.in_(hospital_ids)).count() == 8
+
+
+def test_unchanged_source_skips_the_run(db, monkeypatch):
+    permits = [f"RUN-{uuid.uuid4().hex[:8]}"]
+    monkeypatch.setattr(
+        main, "fetch_dataset", lambda: as_download(msss_file(permits, "2026-03-01 00:00", 3), changed=False)
+    )
+
+    assert main.run_ingestion() is None
+    assert db.query(Hospital).filter(Hospital.permit_id.in_(permits)).count() == 0
+
+
+def test_failed_run_leaves_no_hospitals_behind(db, monkeypatch):
+    permits = [f"RUN-{uuid.uuid4().hex[:8]}"]
+    monkeypatch.setattr(main, "fetch_dataset", lambda: as_download(msss_file(permits, "2026-03-01 00:00", 3)))
+
+    def fail(db, df):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(main, "insert_snapshots", fail)
+    with pytest.raises(RuntimeError):
+        main.run_ingestion()
+    assert db.query(Hospital).filter(Hospital.permit_id.in_(permits)).count() == 0
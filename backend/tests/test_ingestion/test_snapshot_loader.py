@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from app.db.models import ERSnapshot
+from app.ingestion.snapshot_loader import (
+    filter_new_snapshots,
+    insert_snapshots,
+    load_snapshot_watermarks,
+    snapshot_records,
+)
+
+
+def cleaned_rows(hospital_id, hours, **overrides):
+    """Rows shaped like clean_dataframe output, one per hour."""
+    times = pd.date_range("2026-03-01 00:00", periods=hours, freq="h", tz="UTC")
+    counts = {
+        "Nombre_de_civieres_fonctionnelles": 20,
+        "Nombre_de_civieres_occupees": 15,
+        "Nombre_total_de_patients_presents_a_lurgence": 40,
+        "Nombre_total_de_patients_en_attente_de_PEC": 5,
+        "Nombre_de_patients_sur_civiere_plus_de_24_heures": 2,
+        "Nombre_de_patients_sur_civiere_plus_de_48_heures": 1,
+    }
+    df = pd.DataFrame({
+        "hospital_id": hospital_id,
+        **{column: pd.Series([value] * hours, dtype="Int64") for column, value in counts.items()},
+        "DMS_sur_civiere": 12.5,
+        "DMS_ambulatoire": float("nan"),
+        "snapshot_time": times,
+        "updated_at": times,
+    })
+    for column, value in overrides.items():
+        df[column] = value
+    return df
+
+
+def test_snapshot_records_use_python_types(sample_hospital):
+    records = snapshot_records(cleaned_rows(sample_hospital.id, 1)).to_dict("records")
+    row = records[0]
+    assert type(row["hospital_id"]) is int
+    assert type(row["functional_stretchers"]) is int
+    assert row["avg_stay_stretcher"] == 12.5
+    assert row["avg_stay_ambulatory"] is None
+
+
+def test_insert_snapshots_reports_inserted_and_skipped(db, sample_hospital):
+    df = cleaned_rows(sample_hospital.id, 5)
+
+    first = insert_snapshots(db, df, batch_size=2)
+    assert (first.inserted, first.skipped, first.invalid) == (5, 0, 0)
+
+    # Re-running the same file, plus a repeated row, inserts nothing
+    again = insert_snapshots(db, pd.concat([df, df.iloc[:1]]), batch_size=2)
+    assert (again.inserted, again.skipped, again.invalid) == (0, 6, 0)
+
+    stored = db.query(ERSnapshot).filter_by(hospital_id=sample_hospital.id).all()
+    assert len(stored) == 5
+    assert {s.occupied_stretchers for s in stored} == {15}
+
+
+def test_insert_snapshots_drops_rows_missing_required_counts(db, sample_hospital):
+    df = cleaned_rows(sample_hospital.id, 3)
+    df.loc[1, "Nombre_de_civieres_occupees"] = pd.NA
+
+    result = insert_snapshots(db, df)
+    assert (result.inserted, result.skipped, result.invalid) == (2, 0, 1)
+
+
+def test_insert_snapshots_handles_empty_frames(db, sample_hospital):
+    result = insert_snapshots(db, cleaned_rows(sample_hospital.id, 0))
+    assert (result.inserted, result.skipped, result.invalid) == (0, 0, 0)
+
+
+def test_watermarks_are_latest_snapshot_per_hospital(db, sample_hospital):
+    insert_snapshots(db, cleaned_rows(sample_hospital.id, 4))
+
+    watermarks = load_snapshot_watermarks(db)
+    assert pd.Timestamp(watermarks[sample_hospital.id]).tz_localize(None) == pd.Timestamp("2026-03-01 03:00")
+    # Hospitals with nothing since the window start have no watermark
+    assert sample_hospital.id not in load_snapshot_watermarks(db, since=datetime(2026, 3, 2, tzinfo=timezone.utc))
+
+
+def test_filter_new_snapshots_keeps_hours_past_the_watermark(sample_hospital):
+    df = pd.concat([cleaned_rows(sample_hospital.id, 5), cleaned_rows(sample_hospital.id + 1, 2)])
+    watermarks = {sample_hospital.id: datetime(2026, 3, 1, 2, 0)}  # naive, as SQLite returns it
+
+    new = filter_new_snapshots(df, watermarks)
+    assert new[new["hospital_id"] == sample_hospital.id]["snapshot_time"].dt.hour.tolist() == [3, 4]
+    assert (new["hospital_id"] == sample_hospital.id + 1).sum() == 2
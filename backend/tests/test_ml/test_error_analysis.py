@@ -0,0 +1,65 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.db.models import ForecastError
+from app.ml.error_analysis import get_error_stats, get_recent_bias, should_retrain
+
+# Far from the ids other fixtures create, so only the errors seeded here match
+HOSPITAL_IDS = (900001, 900002, 900003)
+
+
+@pytest.fixture
+def errors(db):
+    rng = random.Random(21)
+    now = datetime.now(timezone.utc)
+    recent = {}
+    for hospital_id in HOSPITAL_IDS:
+        for horizon in (1, 2, 4):
+            # hospital 900003 has too few errors to judge; 48h-old rows fall outside the window
+            n = 2 if hospital_id == 900003 else rng.randint(5, 12)
+            for age in [rng.uniform(0, 23) for _ in range(n)] + [48.0]:
+                observed = rng.uniform(0.2, 1.2)
+                predicted = observed + rng.uniform(-0.4, 0.4)
+                if age < 24:
+                    recent.setdefault((hospital_id, horizon), []).append((observed, predicted))
+                db.add(ForecastError(
+                    hospital_id=hospital_id,
+                    horizon_hours=horizon,
+                    observed_pressure=observed,
+                    predicted_pressure=predicted,
+                    absolute_error=abs(predicted - observed),
+                    squared_error=(predicted - observed) ** 2,
+                    forecast_time=now,
+                    evaluated_at=now - timedelta(hours=age),
+                ))
+    db.flush()
+    return recent
+
+
+def test_grouped_stats_match_per_pair_helpers(db, errors):
+    stats = get_error_stats(db)
+
+    for key, rows in errors.items():
+        s = stats[key]
+        assert s.count == len(rows)
+        assert s.mae == pytest.approx(sum(abs(p - o) for o, p in rows) / len(rows))
+        assert s.bias == pytest.approx(sum(p - o for o, p in rows) / len(rows))
+        assert get_recent_bias(db, *key) == pytest.approx(s.bias if s.count >= 3 else 0.0)
+        assert should_retrain(db, *key) == (s.count >= 5 and s.mae > 0.15)
+
+
+def test_stats_come_from_one_query(db, errors):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", listener)
+    try:
+        stats = get_error_stats(db)
+    finally:
+        event.remove(bind, "before_cursor_execute", listener)
+
+    assert len(statements) == 1
+    assert {k for k in stats if k[0] in HOSPITAL_IDS} == {(h, n) for h in HOSPITAL_IDS for n in (1, 2, 4)}
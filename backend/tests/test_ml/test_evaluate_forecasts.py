@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.db.models import ERSnapshot, Forecast, ForecastError
+from app.ml.evaluate_forecasts import evaluate_forecasts
+from app.ml.features.pressure import compute_pressure_score
+from tests.conftest import TestingSession
+
+COUNTS = {
+    "functional_stretchers": 20,
+    "occupied_stretchers": 17,
+    "patients_total": 45,
+    "patients_waiting_mc": 9,
+    "patients_over_24h": 4,
+}
+
+
+def test_errors_use_the_snapshot_at_each_forecast_time(db, sample_hospital):
+    base = datetime(2026, 1, 5, 10, tzinfo=timezone.utc)
+    for hour, occupied in ((0, 17), (1, 12)):
+        db.add(ERSnapshot(
+            hospital_id=sample_hospital.id,
+            snapshot_time=base + timedelta(hours=hour),
+            **{**COUNTS, "occupied_stretchers": occupied, "patients_over_48h": 0},
+        ))
+    # The third forecast targets an hour without a snapshot
+    for hour in (0, 1, 2):
+        db.add(Forecast(
+            hospital_id=sample_hospital.id,
+            horizon_hours=1,
+            predicted_pressure=0.5,
+            risk_level="MEDIUM",
+            forecast_time=base + timedelta(hours=hour),
+            evaluated=False,
+        ))
+    db.add(ERSnapshot(
+        hospital_id=sample_hospital.id,
+        snapshot_time=base + timedelta(hours=3),
+        **{**COUNTS, "patients_over_48h": 0},
+    ))
+    db.commit()
+
+    with patch("app.ml.evaluate_forecasts.SessionLocal", TestingSession):
+        evaluate_forecasts()
+
+    db.expire_all()
+    errors = (
+        db.query(ForecastError)
+        .filter(ForecastError.hospital_id == sample_hospital.id)
+        .order_by(ForecastError.forecast_time)
+        .all()
+    )
+    expected = [
+        compute_pressure_score(SimpleNamespace(**{**COUNTS, "occupied_stretchers": occupied}))
+        for occupied in (17, 12)
+    ]
+    assert [e.observed_pressure for e in errors] == expected
+    assert [e.absolute_error for e in errors] == [abs(p - 0.5) for p in expected]
+
+    evaluated = {
+        f.forecast_time.replace(tzinfo=timezone.utc): f.evaluated
+        for f in db.query(Forecast).filter(Forecast.hospital_id == sample_hospital.id)
+    }
+    assert evaluated == {base: True, base + timedelta(hours=1): True, base + timedelta(hours=2): False}
@@ -3,7 +3,10 @@ import pandas as pd
 from unittest.mock import patch
 from datetime import datetime, timezone, timedelta
 
-from app.services.forecast_service import train_and_forecast
+from app.ml.datasets.snapshot_dataset import add_forecast_targets
+from app.ml.model_fitting import ModelFitter
+from app.services import forecast_service
+from app.services.forecast_service import train_and_forecast, train_and_forecast_multi
 
 
 def make_mock_df(hospital_id: int = 1, n: int = 24) -> pd.DataFrame:
@@ -121,4 +124,47 @@ def test_empty_dataset_returns_empty_list(db):
     ])
     with patch("app.services.forecast_service.build_ml_dataset", return_value=empty_df):
         results = train_and_forecast(db, horizon_hours=1)
-    assert results == []
\ No newline at end of file
+    assert results == []
+
+
+# ── multi-horizon ─────────────────────────────────────────────────────────────
+
+def test_multi_horizon_builds_and_fits_once(db):
+    df = make_multi_hospital_df(n_hospitals=2, n=24)
+    forecast_service._model_cache.clear()
+    fitter = ModelFitter(workers=1)
+
+    with patch("app.services.forecast_service.build_ml_dataset", return_value=df) as mock_build, \
+         patch.object(fitter, "fit", wraps=fitter.fit) as mock_fit:
+        results = train_and_forecast_multi(db, [4, 1, 2], fitter=fitter)
+
+    mock_build.assert_called_once()
+    assert mock_build.call_args.kwargs["horizon_hours"] == [1, 2, 4]
+    mock_fit.assert_called_once()
+    assert list(mock_fit.call_args.args[0]) == [1, 2]
+
+    assert sorted(results) == [1, 2, 4]
+    for h, predictions in results.items():
+        assert [p["hospital_id"] for p in predictions] == [1, 2]
+        assert all(p["horizon_hours"] == h for p in predictions)
+
+
+def test_multi_horizon_matches_single_horizon_forecasts(db):
+    df = make_mock_df()
+    with patch("app.services.forecast_service.build_ml_dataset", return_value=df):
+        multi = train_and_forecast_multi(db, [1, 2, 4])
+        for h in (1, 2, 4):
+            (single,) = train_and_forecast(db, horizon_hours=h)
+            assert single["predicted_pressure"] == multi[h][0]["predicted_pressure"]
+            assert single["forecast_time"] == multi[h][0]["forecast_time"]
+
+
+def test_add_forecast_targets_covers_every_horizon():
+    df = pd.concat([make_mock_df(hospital_id=2, n=6), make_mock_df(hospital_id=1, n=6)], ignore_index=True)
+    out = add_forecast_targets(df, horizon_hours=[1, 4])
+
+    for hospital_id, group in out.groupby("hospital_id"):
+        pressure = group["pressure_score"].tolist()
+        assert group["target_pressure_t+1h"].tolist()[:5] == pressure[1:]
+        assert group["target_pressure_t+4h"].tolist()[:2] == pressure[4:]
+        assert group["target_pressure_t+4h"].isna().sum() == 4
@@ -0,0 +1,86 @@
+from unittest.mock import patch
+
+import numpy as np
+
+from app.ml import model_cache
+from app.ml.model_cache import ModelCache, approximate_size
+from app.services import forecast_service
+from app.services.forecast_service import train_and_forecast_multi
+from tests.test_ml.test_forecast_service import make_multi_hospital_df
+
+
+def sized_cache(**kwargs):
+    # Values are their own size in bytes
+    options = {"max_entries": 10, "max_bytes": 100, "ttl_seconds": 60, "sizeof": lambda v: v}
+    options.update(kwargs)
+    return ModelCache(**options)
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = sized_cache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 1)
+    assert cache.get("a") == 1
+    cache.put("c", 1)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_is_enforced_and_accounted():
+    cache = sized_cache()
+    cache.put("a", 40)
+    cache.put("b", 40)
+    cache.put("a", 30)  # replacing an entry releases its old size
+    assert cache.stats()["bytes"] == 70
+
+    cache.put("c", 50)
+    assert cache.get("b") is None
+    assert cache.stats()["bytes"] == 80
+
+    cache.put("huge", 101)
+    assert cache.get("huge") is None
+    assert cache.stats()["rejected"] == 1
+    assert len(cache) == 2
+
+    cache.invalidate("a")
+    assert cache.stats()["bytes"] == 50
+
+
+def test_entries_expire(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(model_cache.time, "monotonic", lambda: clock[0])
+    cache = sized_cache(ttl_seconds=10)
+    cache.put("a", 1)
+
+    clock[0] += 9
+    assert cache.get("a") == 1
+    clock[0] += 1
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expired"], stats["bytes"]) == (1, 1, 1, 0)
+
+
+def test_approximate_size_counts_contents():
+    params = [0.1] * 1000
+    assert approximate_size({"params": params}) > approximate_size({"params": []}) + 8 * 1000
+    array = np.zeros(1000)
+    assert approximate_size(array) >= array.nbytes
+    # Shared objects are counted once
+    assert approximate_size([params, params]) < 2 * approximate_size(params)
+
+
+def test_forecasting_reuses_cached_models(db):
+    df = make_multi_hospital_df(n_hospitals=2)
+    forecast_service._model_cache.clear()
+    with patch("app.services.forecast_service.build_ml_dataset", return_value=df):
+        train_and_forecast_multi(db, [1, 2, 4])
+        hits = forecast_service._model_cache.stats()["hits"]
+        with patch("app.ml.model_fitting.fit_arima", side_effect=AssertionError("refitted")):
+            train_and_forecast_multi(db, [1, 2, 4])
+
+    stats = forecast_service._model_cache.stats()
+    assert stats["hits"] == hits + 2
+    assert stats["entries"] == 2 and stats["bytes"] > 0
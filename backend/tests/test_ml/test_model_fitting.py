@@ -0,0 +1,45 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from app.ml.model_fitting import ModelFitter, fit_arima
+
+
+def pressure_series(seed: int, n: int = 48) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    return pd.Series(0.6 + np.cumsum(rng.normal(0, 0.02, n)))
+
+
+def test_pool_matches_in_process_fits_in_input_order():
+    series = {hospital_id: pressure_series(hospital_id) for hospital_id in (5, 1, 3)}
+
+    env_before = os.getenv("OPENBLAS_NUM_THREADS")
+    serial = ModelFitter(workers=1).fit(series)
+    with ModelFitter(workers=2) as fitter:
+        parallel = fitter.fit(series)
+        workers_env = fitter._pool.apply(os.getenv, ("OPENBLAS_NUM_THREADS",))
+
+    assert list(parallel) == [5, 1, 3]
+    for hospital_id in series:
+        np.testing.assert_array_equal(parallel[hospital_id].result.params, serial[hospital_id].result.params)
+        assert parallel[hospital_id].seconds > 0
+    # Workers run single-threaded BLAS without changing the job process's environment
+    assert workers_env == "1"
+    assert os.getenv("OPENBLAS_NUM_THREADS") == env_before
+
+
+def test_fits_past_the_timeout_are_reported_as_failed():
+    series = {hospital_id: pressure_series(hospital_id) for hospital_id in (1, 2)}
+    with ModelFitter(workers=2, timeout=1e-6) as fitter:
+        fitter._get_pool()
+        outcomes = fitter.fit(series)
+
+    assert all(o.result is None and "timed out" in o.error for o in outcomes.values())
+    assert fitter._pool is None
+
+
+def test_fit_errors_are_returned_not_raised():
+    outcome = fit_arima(pd.Series(["not", "numeric"] * 10))
+    assert outcome.result is None
+    assert outcome.error
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.ml.model_fitting import ModelFitter, fit_arima
+from app.ml.model_store import MODEL_SPEC, ModelArtifact, ModelStore
+from app.services import forecast_service
+from app.services.forecast_service import train_and_forecast_multi
+from tests.test_ml.test_forecast_service import make_mock_df, make_multi_hospital_df
+
+
+@pytest.fixture
+def artifact():
+    df = make_mock_df()
+    return ModelArtifact.from_result(fit_arima(df["pressure_score"]).result, df["snapshot_time"].iloc[-1])
+
+
+def test_round_trip_and_freshness(tmp_path, artifact):
+    store = ModelStore(tmp_path, max_age=timedelta(hours=1))
+    store.save(7, artifact)
+    assert (tmp_path / MODEL_SPEC / "hospital_7.json").exists()
+
+    assert store.load(7, artifact.watermark) == artifact
+    assert store.load(7, artifact.watermark + timedelta(hours=3)) == artifact
+    # Trained on data the current dataset does not reach
+    assert store.load(7, artifact.watermark - timedelta(hours=1)) is None
+    assert store.load(8, artifact.watermark) is None
+    assert ModelStore(tmp_path, max_age=timedelta(0)).load(7, artifact.watermark) is None
+
+
+def test_unreadable_artifact_is_ignored(tmp_path, artifact):
+    store = ModelStore(tmp_path)
+    store.save(7, artifact)
+    (tmp_path / MODEL_SPEC / "hospital_7.json").write_text("{not json")
+    assert store.load(7, artifact.watermark) is None
+
+
+def test_applied_parameters_reproduce_the_fit(artifact):
+    series = make_mock_df()["pressure_score"]
+    fitted = fit_arima(series).result
+    assert list(artifact.apply(series).forecast(steps=4)) == pytest.approx(list(fitted.forecast(steps=4)))
+
+
+def run(db, df, store):
+    fitter = ModelFitter(workers=1)
+    with patch("app.services.forecast_service.build_ml_dataset", return_value=df), \
+         patch.object(fitter, "fit", wraps=fitter.fit) as mock_fit:
+        predictions = train_and_forecast_multi(db, [1, 2, 4], fitter=fitter, store=store)
+    return predictions, list(mock_fit.call_args.args[0])
+
+
+def test_warm_run_reuses_stored_models(db, tmp_path):
+    df = make_multi_hospital_df(n_hospitals=2)
+    store = ModelStore(tmp_path)
+    forecast_service._model_cache.clear()
+    cold, fitted = run(db, df, store)
+    assert fitted == [1, 2]
+
+    # A new job process starts with an empty memory cache
+    forecast_service._model_cache.clear()
+    warm, fitted = run(db, df, store)
+    assert fitted == []
+    for h in (1, 2, 4):
+        assert [p["predicted_pressure"] for p in warm[h]] == pytest.approx(
+            [p["predicted_pressure"] for p in cold[h]]
+        )
+
+
+def test_drift_forces_a_refit(db, tmp_path):
+    df = make_multi_hospital_df(n_hospitals=2)
+    store = ModelStore(tmp_path)
+    run(db, df, store)
+
+    with patch("app.services.forecast_service.needs_retrain", side_effect=lambda stats: True):
+        _, fitted = run(db, df, store)
+    assert fitted == [1, 2]
@@ -1,4 +1,11 @@
+import math
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
 import pytest
+from app.ml.features.pressure import PRESSURE_COLUMNS, compute_pressure_score, compute_pressure_scores
 from app.ml.risk import pressure_to_risk
 
 
@@ -69,4 +76,46 @@ def test_always_returns_string():
 def test_always_returns_valid_level():
     valid = {"LOW", "MEDIUM", "HIGH"}
     for v in [0.0, 0.3, 0.4, 0.5, 0.7, 0.9, 1.5]:
-        assert pressure_to_risk(v) in valid
\ No newline at end of file
+        assert pressure_to_risk(v) in valid
+
+
+# ── Vectorized pressure score parity ──────────────────────────────────────────
+
+def assert_parity(rows):
+    df = pd.DataFrame(rows, columns=PRESSURE_COLUMNS)
+    vectorized = compute_pressure_scores(df)
+    for row, value in zip(rows, vectorized):
+        expected = compute_pressure_score(SimpleNamespace(**dict(zip(PRESSURE_COLUMNS, row))))
+        if math.isnan(expected):
+            assert math.isnan(value), row
+        else:
+            assert value == expected, row
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_matches_scalar_on_counts(seed):
+    rng = random.Random(seed)
+    # Includes zeros and negatives to exercise the max(..., 1) guards
+    assert_parity([tuple(rng.randint(-2, 120) for _ in PRESSURE_COLUMNS) for _ in range(20000)])
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_vectorized_matches_scalar_on_fractional_values(seed):
+    rng = random.Random(seed)
+    assert_parity([tuple(rng.uniform(0, 60) for _ in PRESSURE_COLUMNS) for _ in range(20000)])
+
+
+def test_vectorized_matches_scalar_on_rounding_midpoints():
+    # 0.5 * 1.0005 and friends land next to a third-decimal midpoint
+    rows = [(2000, o, 1, 0, 0) for o in range(0, 4001)]
+    rows += [(1, 0, 2000, w, 0) for w in range(0, 2001)]
+    assert_parity(rows)
+
+
+def test_missing_values_give_nan():
+    df = pd.DataFrame(
+        {c: pd.array([10, None], dtype="Int64") for c in PRESSURE_COLUMNS}
+    )
+    scores = compute_pressure_scores(df)
+    assert scores[0] == compute_pressure_score(SimpleNamespace(**{c: 10 for c in PRESSURE_COLUMNS}))
+    assert np.isnan(scores[1])
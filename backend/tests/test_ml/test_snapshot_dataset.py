@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+import pandas as pd
+
+from app.db.models import ERSnapshot
+from app.ml.datasets import snapshot_dataset
+from app.ml.datasets.snapshot_dataset import SNAPSHOT_DTYPES, build_ml_dataset, load_snapshots_df
+from app.utils.time import get_current_time
+
+
+def seed_snapshots(db, hospital, hours):
+    now = get_current_time().replace(minute=0, second=0, microsecond=0)
+    for age in hours:
+        db.add(ERSnapshot(
+            hospital_id=hospital.id,
+            snapshot_time=now - timedelta(hours=age),
+            functional_stretchers=20,
+            occupied_stretchers=age % 20,
+            patients_total=40,
+            patients_waiting_mc=5,
+            patients_over_24h=2,
+            patients_over_48h=1,
+        ))
+    db.commit()
+    return now
+
+
+def test_loads_the_window_in_compact_columns(db, sample_hospital, monkeypatch):
+    # Several chunks per load, with a partial last chunk
+    monkeypatch.setattr(snapshot_dataset, "STREAM_CHUNK_SIZE", 3)
+    now = seed_snapshots(db, sample_hospital, [0, 1, 2, 5, 10, 71, 73, 200])
+
+    df = load_snapshots_df(db, lookback_hours=72)
+    ours = df[df["hospital_id"] == sample_hospital.id]
+
+    assert list(df.columns) == [*SNAPSHOT_DTYPES, "snapshot_time"]
+    assert df.dtypes.drop("snapshot_time").astype(str).to_dict() == SNAPSHOT_DTYPES
+    assert str(df["snapshot_time"].dtype) == "datetime64[ns, UTC]"
+    assert ours["snapshot_time"].tolist() == [pd.Timestamp(now - timedelta(hours=h)) for h in (71, 10, 5, 2, 1, 0)]
+    assert ours["occupied_stretchers"].tolist() == [11, 10, 5, 2, 1, 0]
+    # Ordered by hospital, then time
+    assert df[["hospital_id", "snapshot_time"]].equals(
+        df.sort_values(["hospital_id", "snapshot_time"])[["hospital_id", "snapshot_time"]]
+    )
+
+
+def test_empty_window_gives_typed_empty_frame(db):
+    df = load_snapshots_df(db, lookback_hours=-24 * 365)
+    assert df.empty
+    assert list(df.columns) == [*SNAPSHOT_DTYPES, "snapshot_time"]
+    assert str(df["snapshot_time"].dtype) == "datetime64[ns, UTC]"
+
+
+def test_ml_dataset_keeps_rows_up_to_the_latest_snapshot(db, sample_hospital):
+    now = seed_snapshots(db, sample_hospital, range(12))
+
+    df = build_ml_dataset(db, horizon_hours=[1, 4])
+    ours = df[df["hospital_id"] == sample_hospital.id]
+
+    # The first three rows lack lag features; the rest are kept even without targets
+    assert len(ours) == 9
+    assert ours["true_latest_snapshot_time"].iloc[-1] == pd.Timestamp(now)
+    assert ours["target_pressure_t+4h"].isna().sum() == 4
+    assert ours["pressure_score"].notna().all()
@@ -8,20 +8,22 @@ def test_forecasting_calls_train_for_all_horizons():
     fake_predictions = [{"hospital_id": 1, "predicted_pressure": 0.75, "risk_level": "HIGH"}]
 
     with patch("app.ml.run_forecasting.SessionLocal") as mock_session, \
-         patch("app.ml.run_forecasting.train_and_forecast", return_value=fake_predictions) as mock_train, \
+         patch("app.ml.run_forecasting.train_and_forecast_multi",
+               return_value={1: fake_predictions, 2: fake_predictions, 4: fake_predictions}) as mock_train, \
          patch("app.ml.run_forecasting.save_forecasts") as mock_save:
 
         from app.ml.run_forecasting import run_forecasting
         run_forecasting()
 
-        # Should be called once per horizon (1, 2, 4)
-        assert mock_train.call_count == 3
+        # One pass covers every horizon; forecasts are saved once per horizon (1, 2, 4)
+        assert mock_train.call_count == 1
         assert mock_save.call_count == 3
+        assert [c.args[2] for c in mock_save.call_args_list] == [1, 2, 4]
 
 
 def test_forecasting_skips_save_when_no_predictions():
     with patch("app.ml.run_forecasting.SessionLocal"), \
-         patch("app.ml.run_forecasting.train_and_forecast", return_value=[]), \
+         patch("app.ml.run_forecasting.train_and_forecast_multi", return_value={1: [], 2: [], 4: []}), \
          patch("app.ml.run_forecasting.save_forecasts") as mock_save:
 
         from app.ml.run_forecasting import run_forecasting
@@ -34,7 +36,7 @@ def test_forecasting_closes_db_session():
     mock_db = MagicMock()
 
     with patch("app.ml.run_forecasting.SessionLocal", return_value=mock_db), \
-         patch("app.ml.run_forecasting.train_and_forecast", return_value=[]):
+         patch("app.ml.run_forecasting.train_and_forecast_multi", return_value={1: [], 2: [], 4: []}):
 
         from app.ml.run_forecasting import run_forecasting
         run_forecasting()
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+
+from app.db.models import ForecastErrorHourlyRollup, ForecastHourlyRollup
+from app.services.forecast_rollups import add_error_rollups, hour_bucket
+from app.services.forecast_storage import save_forecasts
+
+
+def test_hour_bucket_truncates_to_utc_hour():
+    dt = datetime(2026, 3, 1, 10, 47, 12, tzinfo=timezone(timedelta(hours=-5)))
+    assert hour_bucket(dt) == datetime(2026, 3, 1, 15, 0, tzinfo=timezone.utc)
+
+
+def test_save_forecasts_counts_each_forecast_once(db, sample_hospital):
+    t = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    predictions = [
+        {"hospital_id": sample_hospital.id, "predicted_pressure": 0.8, "forecast_time": t,
+         "horizon_hours": 1, "risk_level": "HIGH"},
+    ]
+    save_forecasts(db, predictions, horizon_hours=1)
+    save_forecasts(db, predictions, horizon_hours=1)  # duplicate is skipped
+
+    row = db.get(ForecastHourlyRollup, (t, sample_hospital.id, 1))
+    assert row.forecast_count == 1
+    assert row.predicted_sum == 0.8
+    assert (row.low_count, row.medium_count, row.high_count) == (0, 0, 1)
+
+
+def test_error_rollups_accumulate(db, sample_hospital):
+    t = datetime(2026, 3, 1, 15, 0, tzinfo=timezone.utc)
+
+    def error(observed, predicted):
+        return SimpleNamespace(
+            hospital_id=sample_hospital.id, horizon_hours=1, forecast_time=t,
+            observed_pressure=observed, absolute_error=abs(observed - predicted),
+            squared_error=(observed - predicted) ** 2,
+        )
+
+    add_error_rollups(db, [error(0.3, 0.5)])
+    add_error_rollups(db, [error(0.9, 0.5)])
+    db.commit()
+
+    row = db.get(ForecastErrorHourlyRollup, (t, sample_hospital.id, 1))
+    assert row.error_count == 2
+    assert round(row.observed_sum, 6) == 1.2
+    assert round(row.absolute_error_sum, 6) == 0.6
+    assert (row.low_count, row.medium_count, row.high_count) == (1, 0, 1)
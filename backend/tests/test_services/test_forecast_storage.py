@@ -0,0 +1,56 @@
+from datetime import datetime, timezone, timedelta
+
+from app.db.models import Forecast, LatestForecast
+from app.services.forecast_storage import save_forecasts
+
+
+def prediction(hospital_id, forecast_time, pressure, horizon_hours=1):
+    return {
+        "hospital_id": hospital_id,
+        "predicted_pressure": pressure,
+        "forecast_time": forecast_time,
+        "horizon_hours": horizon_hours,
+        "risk_level": "HIGH" if pressure >= 0.7 else "LOW",
+    }
+
+
+def latest_row(db, hospital_id, horizon_hours=1):
+    db.expire_all()
+    return db.get(LatestForecast, (hospital_id, horizon_hours))
+
+
+def test_save_forecasts_populates_latest_table(db, sample_hospital):
+    t = datetime.now(timezone.utc).replace(microsecond=0)
+    save_forecasts(db, [prediction(sample_hospital.id, t, 0.3)], horizon_hours=1)
+
+    row = latest_row(db, sample_hospital.id)
+    assert row is not None
+    assert row.predicted_pressure == 0.3
+    assert db.query(Forecast).filter_by(hospital_id=sample_hospital.id).count() == 1
+
+
+def test_newer_forecast_replaces_latest(db, sample_hospital):
+    t = datetime.now(timezone.utc).replace(microsecond=0)
+    save_forecasts(db, [prediction(sample_hospital.id, t, 0.3)], horizon_hours=1)
+    save_forecasts(db, [prediction(sample_hospital.id, t + timedelta(hours=1), 0.8)], horizon_hours=1)
+
+    assert latest_row(db, sample_hospital.id).predicted_pressure == 0.8
+
+
+def test_older_forecast_does_not_replace_latest(db, sample_hospital):
+    t = datetime.now(timezone.utc).replace(microsecond=0)
+    save_forecasts(db, [prediction(sample_hospital.id, t, 0.8)], horizon_hours=1)
+    save_forecasts(db, [prediction(sample_hospital.id, t - timedelta(hours=2), 0.3)], horizon_hours=1)
+
+    assert latest_row(db, sample_hospital.id).predicted_pressure == 0.8
+
+
+def test_latest_is_kept_per_horizon(db, sample_hospital):
+    t = datetime.now(timezone.utc).replace(microsecond=0)
+    save_forecasts(db, [
+        prediction(sample_hospital.id, t, 0.3, horizon_hours=1),
+        prediction(sample_hospital.id, t + timedelta(hours=1), 0.5, horizon_hours=2),
+    ], horizon_hours=2)
+
+    assert latest_row(db, sample_hospital.id, 1).predicted_pressure == 0.3
+    assert latest_row(db, sample_hospital.id, 2).predicted_pressure == 0.5
@@ -0,0 +1,162 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services import geocoding
+from app.services.geocoding import GeocodingUnavailable, UpstreamScheduler
+
+
+def nominatim_stub(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/search":
+        if request.url.params["q"] == "nowhere":
+            return httpx.Response(200, json=[])
+        return httpx.Response(200, json=[{"lat": "45.5", "lon": "-73.6", "display_name": "Montréal"}])
+    return httpx.Response(200, json={"display_name": "Rue Sainte-Catherine, Montréal"})
+
+
+@pytest.fixture(autouse=True)
+def fast_scheduler(monkeypatch):
+    monkeypatch.setattr(geocoding, "scheduler", UpstreamScheduler(rate=100, burst=10))
+
+
+@pytest.fixture
+def stub_client():
+    client = geocoding.open_client(
+        geocoding.create_client(transport=httpx.MockTransport(nominatim_stub))
+    )
+    yield client
+    asyncio.run(geocoding.close_client())
+
+
+def test_lookups_share_one_client(stub_client):
+    async def lookups():
+        first = await geocoding.forward_geocode("montreal")
+        address = await geocoding.reverse_geocode(45.5, -73.6)
+        return first, address, geocoding.get_client()
+
+    first, address, client = asyncio.run(lookups())
+    assert first == {"lat": 45.5, "lng": -73.6, "display_name": "Montréal"}
+    assert address == "Rue Sainte-Catherine, Montréal"
+    assert client is stub_client
+
+
+def test_forward_geocode_returns_none_without_results(stub_client):
+    assert asyncio.run(geocoding.forward_geocode("nowhere")) is None
+
+
+def test_client_is_recreated_after_close(stub_client):
+    asyncio.run(geocoding.close_client())
+    client = geocoding.get_client()
+    assert client is not stub_client
+    assert not client.is_closed
+    assert client.headers["User-Agent"] == geocoding.HEADERS["User-Agent"]
+
+
+class RateLimitedNominatim:
+    """Stub that answers 429 when two requests arrive less than ``min_interval`` apart."""
+
+    def __init__(self, min_interval: float, latency: float = 0.0):
+        self.min_interval = min_interval
+        self.latency = latency
+        self.arrivals = []
+        self.throttled = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        now = time.monotonic()
+        if self.arrivals and now - self.arrivals[-1] < self.min_interval:
+            self.throttled += 1
+            return httpx.Response(429, headers={"Retry-After": str(self.min_interval)})
+        self.arrivals.append(now)
+        await asyncio.sleep(self.latency)
+        q = request.url.params["q"]
+        return httpx.Response(200, json=[{"lat": "45.5", "lon": "-73.6", "display_name": q}])
+
+
+def use_stub(stub) -> None:
+    geocoding.open_client(geocoding.create_client(transport=httpx.MockTransport(stub)))
+
+
+def test_concurrent_identical_queries_share_one_request():
+    stub = RateLimitedNominatim(min_interval=1.0, latency=0.05)
+    use_stub(stub)
+
+    async def burst():
+        try:
+            return await asyncio.gather(*(geocoding.forward_geocode("montreal") for _ in range(10)))
+        finally:
+            await geocoding.close_client()
+
+    results = asyncio.run(burst())
+    assert len(stub.arrivals) == 1
+    assert stub.throttled == 0
+    assert all(r == results[0] for r in results)
+    assert geocoding._inflight == {}
+
+
+def test_distinct_queries_are_paced_under_the_upstream_limit(monkeypatch):
+    monkeypatch.setattr(geocoding, "scheduler", UpstreamScheduler(rate=20, burst=1))
+    stub = RateLimitedNominatim(min_interval=0.04)
+    use_stub(stub)
+
+    async def burst():
+        try:
+            return await asyncio.gather(*(geocoding.forward_geocode(f"street {i}") for i in range(6)))
+        finally:
+            await geocoding.close_client()
+
+    results = asyncio.run(burst())
+    assert [r["display_name"] for r in results] == [f"street {i}" for i in range(6)]
+    assert stub.throttled == 0
+    assert stub.arrivals[-1] - stub.arrivals[0] >= 5 * 0.04
+
+
+def test_throttled_requests_are_retried(monkeypatch):
+    # The scheduler allows a burst the stub rejects; 429s must be re-queued, not surfaced
+    monkeypatch.setattr(geocoding, "scheduler", UpstreamScheduler(rate=100, burst=3))
+    stub = RateLimitedNominatim(min_interval=0.05)
+    use_stub(stub)
+
+    async def burst():
+        try:
+            return await asyncio.gather(*(geocoding.forward_geocode(f"street {i}") for i in range(3)))
+        finally:
+            await geocoding.close_client()
+
+    results = asyncio.run(burst())
+    assert [r["display_name"] for r in results] == [f"street {i}" for i in range(3)]
+    assert stub.throttled > 0
+    assert len(stub.arrivals) == 3
+
+
+def test_scheduler_serves_higher_priority_first():
+    async def run():
+        scheduler = UpstreamScheduler(rate=50, burst=1)
+        await scheduler.acquire()  # empty the bucket
+        order = []
+
+        async def caller(name, priority):
+            await scheduler.acquire(priority, timeout=1)
+            order.append(name)
+
+        await asyncio.gather(
+            caller("low", 20), caller("normal", geocoding.PRIORITY_NORMAL), caller("high", geocoding.PRIORITY_HIGH)
+        )
+        return order
+
+    assert asyncio.run(run()) == ["high", "normal", "low"]
+
+
+def test_scheduler_times_out_without_consuming_a_token():
+    async def run():
+        scheduler = UpstreamScheduler(rate=10, burst=1)
+        await scheduler.acquire()
+        with pytest.raises(GeocodingUnavailable):
+            await scheduler.acquire(timeout=0.01)
+        # The abandoned slot goes to the next caller one interval after the first
+        start = time.monotonic()
+        await scheduler.acquire(timeout=1)
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) < 0.1
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from app.services.hospital_index import HospitalIndex, IndexedHospital
+from app.services.routing import haversine_distance
+
+
+def make_index(n: int = 200, seed: int = 42) -> HospitalIndex:
+    rng = random.Random(seed)
+    return HospitalIndex([
+        IndexedHospital(
+            id=i,
+            name=f"H{i}",
+            latitude=rng.uniform(45.0, 47.0),
+            longitude=rng.uniform(-75.0, -71.0),
+        )
+        for i in range(n)
+    ])
+
+
+def brute_force(index, lat, lon):
+    return sorted(
+        ((h, haversine_distance(lat, lon, h.latitude, h.longitude)) for h in index.hospitals),
+        key=lambda m: m[1],
+    )
+
+
+@pytest.mark.parametrize("radius_km", [0.5, 5, 25, 100])
+def test_within_matches_brute_force(radius_km):
+    index = make_index()
+    expected = [h.id for h, d in brute_force(index, 45.9, -73.1) if d <= radius_km]
+    assert [h.id for h, _ in index.within(45.9, -73.1, radius_km)] == expected
+
+
+def test_within_distances_are_sorted():
+    index = make_index()
+    distances = [d for _, d in index.within(46.0, -73.0, 80)]
+    assert distances == sorted(distances)
+
+
+@pytest.mark.parametrize("k", [1, 5, 50])
+def test_nearest_matches_brute_force(k):
+    index = make_index()
+    expected = [h.id for h, _ in brute_force(index, 46.5, -72.2)[:k]]
+    assert [h.id for h, _ in index.nearest(46.5, -72.2, k)] == expected
+
+
+def test_nearest_caps_k_at_index_size():
+    index = make_index(n=3)
+    assert len(index.nearest(46.0, -73.0, 10)) == 3
+
+
+def test_empty_index_returns_no_matches():
+    index = HospitalIndex([])
+    assert index.within(46.0, -73.0, 10) == []
+    assert index.nearest(46.0, -73.0, 3) == []
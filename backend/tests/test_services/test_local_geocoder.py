@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from app.services.local_geocoder import LocalGeocoder, build_index, normalize_key
+
+CSV = """name,latitude,longitude,display_name
+H3Z 2Y7,45.4860,-73.5800,"H3Z 2Y7, Montréal, QC"
+H3Z 2Y8,45.4880,-73.5820,
+H3Z 1A1,45.4900,-73.5900,
+G1R 4P5,46.8130,-71.2080,"G1R 4P5, Québec, QC"
+Saint-Jérôme,45.7800,-74.0000,"Saint-Jérôme, QC"
+Montréal,45.5017,-73.5673,"Montréal, QC"
+MONTREAL,0,0,duplicate key
+Nowhere,not-a-number,-70.0,
+"""
+
+
+@pytest.fixture
+def geocoder(tmp_path):
+    csv_path = tmp_path / "places.csv"
+    csv_path.write_text(CSV, encoding="utf-8")
+    assert build_index(csv_path, tmp_path / "index") == 6
+    return LocalGeocoder(tmp_path / "index")
+
+
+def test_normalize_key():
+    assert normalize_key("  Saint-Jérôme ") == "saint jerome"
+    assert normalize_key("h3z 2y7") == normalize_key("H3Z2Y7") == "h3z2y7"
+    assert normalize_key("H3Z 2") == "h3z2"
+
+
+def test_index_is_memory_mapped(geocoder):
+    assert isinstance(geocoder.keys, np.memmap)
+    assert isinstance(geocoder.coords, np.memmap)
+    assert list(geocoder.keys) == sorted(geocoder.keys)
+
+
+def test_exact_lookups(geocoder):
+    assert geocoder.lookup("h3z2y7") == {"lat": 45.486, "lng": -73.58, "display_name": "H3Z 2Y7, Montréal, QC"}
+    # Display name falls back to the name column
+    assert geocoder.lookup("H3Z 2Y8")["display_name"] == "H3Z 2Y8"
+    # First row wins on duplicate keys
+    assert geocoder.lookup("montreal")["display_name"] == "Montréal, QC"
+    assert geocoder.lookup("saint jerome")["lat"] == 45.78
+
+
+def test_misses(geocoder):
+    assert geocoder.lookup("Nowhere") is None
+    assert geocoder.lookup("H3Z") is None
+    assert geocoder.lookup("zzzz") is None
+    assert geocoder.lookup("   ") is None
+    assert geocoder.lookup("1234 a street name longer than every indexed key") is None
+    assert geocoder.forward("Montr") is None  # place-name prefixes are not guessed
+
+
+def test_prefix_completion(geocoder):
+    names = [r["display_name"] for r in geocoder.complete("h3z 2")]
+    assert names == ["H3Z 2Y7, Montréal, QC", "H3Z 2Y8"]
+    assert len(geocoder.complete("h3z", limit=2)) == 2
+    assert [r["display_name"] for r in geocoder.complete("mont")] == ["Montréal, QC"]
+    assert geocoder.complete("x") == []
+
+
+def test_partial_postal_code_resolves_to_centroid(geocoder):
+    result = geocoder.forward("H3Z 2")
+    assert result["display_name"] == "H3Z 2"
+    assert result["lat"] == pytest.approx(45.487)
+    assert result["lng"] == pytest.approx(-73.581)
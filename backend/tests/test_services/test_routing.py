@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from app.services.routing import CoordinateSet, haversine_distance, haversine_distances
+
+RNG = np.random.default_rng(7)
+LATS = RNG.uniform(45.0, 49.0, size=500)
+LONS = RNG.uniform(-79.0, -64.0, size=500)
+
+
+def scalar_loop(lat, lon):
+    return np.array([haversine_distance(lat, lon, a, b) for a, b in zip(LATS, LONS)])
+
+
+def test_single_origin_matches_scalar():
+    result = haversine_distances(45.5, -73.6, LATS, LONS)
+    assert result.shape == (500,)
+    np.testing.assert_allclose(result, scalar_loop(45.5, -73.6), rtol=1e-12, atol=1e-9)
+
+
+def test_many_origins_return_matrix():
+    origins_lat = [45.5, 46.8, 48.4]
+    origins_lon = [-73.6, -71.2, -68.5]
+    result = CoordinateSet(LATS, LONS).distances_from(origins_lat, origins_lon)
+    assert result.shape == (3, 500)
+    for row, lat, lon in zip(result, origins_lat, origins_lon):
+        np.testing.assert_allclose(row, scalar_loop(lat, lon), rtol=1e-12, atol=1e-9)
+
+
+def test_indices_restrict_to_subset():
+    coords = CoordinateSet(LATS, LONS)
+    indices = [3, 10, 499]
+    np.testing.assert_allclose(
+        coords.distances_from(45.5, -73.6, indices=indices),
+        coords.distances_from(45.5, -73.6)[indices],
+    )
+
+
+@pytest.mark.parametrize("lat, lon", [(0.0, 0.0), (89.9, 179.9), (-45.0, -180.0)])
+def test_same_point_is_zero(lat, lon):
+    assert haversine_distances(lat, lon, [lat], [lon])[0] == pytest.approx(0.0, abs=1e-9)